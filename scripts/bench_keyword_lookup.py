@@ -0,0 +1,66 @@
+"""
+Benchmarks keyword autocomplete lookups.
+
+Compares the original per-keystroke substring scan over the mapping dicts with
+the alias index, and the fuzzy index with a brute-force edit distance scan.
+
+Usage: python -m scripts.bench_keyword_lookup [path/to/card_data.json]
+"""
+
+import sys
+import timeit
+
+from src.db.alias_index import AliasIndex, keyword_aliases
+from src.db.card_repository import CardRepository
+from src.db.fuzzy_index import FuzzyIndex, edit_distance, max_distance_for
+from src.db.mappings import GROUP_MAP, REVERSE_CHAR_MAP, UNIT_MAP
+
+QUERIES = ["h", "hon", "honoka", "prin", "aqours", "kinako", "zzz"]
+TYPOS = ["honka", "chisto", "prntemps", "sakurakoji kinak", "zzzzzz"]
+
+
+def substring_scan(query: str) -> list[str]:
+    """The original keyword_autocomplete loop (without Choice construction)."""
+    query = query.lower()
+    matches = [jp for jp, en in REVERSE_CHAR_MAP.items() if query in en.lower()]
+    matches += [jp for en, jp in UNIT_MAP.items() if query in en.lower()]
+    matches += [jp for en, jp in GROUP_MAP.items() if query in en.lower()]
+    return list(dict.fromkeys(matches))[:25]
+
+
+def brute_force_fuzzy(terms: list[str], query: str) -> list[str]:
+    max_distance = max_distance_for(query)
+    return [term for term in terms if edit_distance(query.lower(), term, max_distance) <= max_distance]
+
+
+def _report(name: str, func, queries: list[str]) -> None:
+    number, seconds = timeit.Timer(lambda: [func(q) for q in queries]).autorange()
+    print(f"{name:<28} {seconds / (number * len(queries)) * 1e6:10.2f} us/lookup")
+
+
+def main() -> None:
+    units: list[str] = []
+    groups: list[str] = []
+    names: list[str] = []
+    if len(sys.argv) > 1:
+        repo = CardRepository(sys.argv[1], snapshot_path="")
+        repo.load_data()
+        units = sorted({unit for c in repo._cards if (unit := c.get("unit"))})
+        groups = sorted({group for c in repo._cards for group in c.get("group") or [] if group})
+        names = sorted({c["name"] for c in repo._cards if c.get("name")})
+
+    aliases = keyword_aliases(units, groups)
+    alias_index = AliasIndex(aliases)
+    fuzzy_terms = [alias for alias, _ in aliases] + names
+    fuzzy_index = FuzzyIndex((term, term) for term in fuzzy_terms)
+    lowered_terms = [term.lower() for term in fuzzy_terms]
+    print(f"{len(aliases)} aliases, {len(fuzzy_index)} fuzzy terms")
+
+    _report("substring scan (old)", substring_scan, QUERIES)
+    _report("alias index", alias_index.search, QUERIES)
+    _report("brute-force edit distance", lambda q: brute_force_fuzzy(lowered_terms, q), TYPOS)
+    _report("fuzzy index", fuzzy_index.lookup, TYPOS)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,13 +24,14 @@ if [ "$(docker ps -aq -f name=lltcg-bot)" ]; then
 fi
 
 # Run the new container
-# Note: We mount config.json, card_data.json, and the images folder
+# Note: We mount config.json and the whole data directory (card_data.json, its snapshot and the images folder).
+# The directory is mounted rather than card_data.json itself: git, scp and most editors replace the file by
+# renaming a new one over it, which a single-file mount never sees, so the hot reload would miss the update.
 docker run -d \
   --name lltcg-bot \
   --restart always \
   -v "$(pwd)/config.json:/app/config.json:ro" \
-  -v "$(pwd)/data/card_data.json:/app/data/card_data.json:ro" \
-  -v "$(pwd)/data/images:/app/data/images" \
+  -v "$(pwd)/data:/app/data" \
   lltcg-bot
 
 echo "🧹 Cleaning up old images..."
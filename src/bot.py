@@ -1,16 +1,25 @@
 import argparse
 import logging
 import sys
+from pathlib import Path
 
+import aiohttp
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from src import config
+from src.cogs.card_images import CardImages
 from src.cogs.card_lookup import CardLookup
 from src.cogs.card_search import CardSearch
+from src.cogs.data_reload import DataReload
+from src.cogs.deck_tools import DeckTools
+from src.cogs.image_prefetch import ImagePrefetch
 from src.db.card_repository import CardRepository
+from src.utils.disk_io import DiskIO
 from src.utils.errors import BotCommandError
+from src.utils.http import create_http_session
+from src.utils.image_cache import ImageCache
 
 _log = logging.getLogger(__name__)
 
@@ -20,17 +29,63 @@ class LLTCGBot(commands.Bot):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix="!", intents=intents)
+        # Shared by all image downloads; created in setup_hook, inside the event loop
+        self.http_session: aiohttp.ClientSession | None = None
+        self.disk_io: DiskIO | None = None
+        self.image_cache: ImageCache | None = None
 
     async def setup_hook(self):
         settings = config.get_config()
+        self.http_session = create_http_session(settings)
+        self.disk_io = DiskIO(
+            workers=settings.get("DISK_IO_WORKERS", 2),
+            max_pending=settings.get("DISK_IO_MAX_PENDING", 64),
+        )
+        self.image_cache = ImageCache(
+            Path(settings.get("IMAGE_CACHE_PATH", "data/images")),
+            self.disk_io,
+            max_bytes=settings.get("IMAGE_CACHE_MAX_MB", 1024) * 2**20,
+            save_delay=settings.get("IMAGE_CACHE_SAVE_DELAY", 30),
+        )
+        await self.image_cache.load()
+
+        # Periodic, since close() is not reached when the process is killed (0 disables)
+        metrics_interval = settings.get("DISK_IO_METRICS_INTERVAL", 600)
+        if metrics_interval > 0:
+            self.log_disk_io_metrics.change_interval(seconds=metrics_interval)
+            self.log_disk_io_metrics.start()
 
         # Initialize Repository
-        card_repo = CardRepository(settings["CARD_DATA_PATH"])
+        card_repo = CardRepository(
+            settings["CARD_DATA_PATH"],
+            search_cache_size=settings.get("SEARCH_CACHE_SIZE", 256),
+            snapshot_path=settings.get("CARD_SNAPSHOT_PATH"),
+        )
         card_repo.load_data()
 
         # Load Cogs
-        await self.add_cog(CardLookup(self, card_repo))
+        images = CardImages(self.http_session, self.image_cache)
+        await self.add_cog(CardLookup(self, card_repo, images))
         await self.add_cog(CardSearch(self, card_repo))
+        await self.add_cog(DeckTools(self, card_repo))
+
+        # Hot reload of card data (0 disables)
+        reload_interval = settings.get("CARD_DATA_RELOAD_INTERVAL", 60)
+        if reload_interval > 0:
+            await self.add_cog(DataReload(self, card_repo, reload_interval))
+
+        # Background warm-up of the image cache (off by default); starts once the bot is ready
+        if settings.get("IMAGE_PREFETCH", False):
+            await self.add_cog(
+                ImagePrefetch(
+                    self,
+                    card_repo,
+                    images,
+                    concurrency=settings.get("IMAGE_PREFETCH_CONCURRENCY", 2),
+                    rate=settings.get("IMAGE_PREFETCH_RATE", 2),
+                    interval_seconds=settings.get("IMAGE_PREFETCH_INTERVAL", 3600),
+                )
+            )
 
         _log.info("Initial data loaded and Cog added.")
 
@@ -43,6 +98,25 @@ class LLTCGBot(commands.Bot):
             await self.tree.sync(guild=guild)
         _log.info("Commands synced.")
 
+    @tasks.loop(seconds=600)
+    async def log_disk_io_metrics(self) -> None:
+        if self.disk_io:
+            _log.info(str(self.disk_io.metrics))
+
+    async def close(self):
+        self.log_disk_io_metrics.cancel()
+        await super().close()
+        if self.http_session:
+            await self.http_session.close()
+        if self.image_cache:
+            try:
+                await self.image_cache.close()
+            except OSError as e:
+                _log.error(f"Failed to save image cache index: {e}")
+        if self.disk_io:
+            _log.info(str(self.disk_io.metrics))
+            self.disk_io.shutdown()
+
 
 client = LLTCGBot()
 
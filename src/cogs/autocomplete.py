@@ -0,0 +1,44 @@
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+from discord import app_commands
+
+from src.db.card_repository import CardRepository
+from src.db.search_cache import SearchCache
+
+
+def _value_choice(value: str) -> app_commands.Choice[str]:
+    return app_commands.Choice(name=value, value=value)
+
+
+class ChoiceCache:
+    """
+    Memoizes autocomplete Choice lists per (field, typed input).
+
+    Autocomplete fires on every keystroke, and users retyping or deleting
+    characters revisit the same inputs, so the finished lists are kept in an
+    LRU tied to the repository's data generation (a reload clears it).
+    """
+
+    def __init__(self, card_repo: CardRepository, max_size: int = 1024):
+        self.card_repo = card_repo
+        self.cache = SearchCache(max_size)
+
+    def get(
+        self,
+        field: Hashable,
+        current: str,
+        lookup: Callable[[str], Sequence[Any]],
+        to_choice: Callable[[Any], app_commands.Choice[Any]] = _value_choice,
+    ) -> list[app_commands.Choice[Any]]:
+        """
+        Choices for `current`, from `lookup` on a miss. `field` must identify the
+        lookup, including any context it depends on; `to_choice` turns each match
+        into a Choice (by default one labeled and valued by the string itself).
+        """
+        key = (field, current)
+        choices = self.cache.get(key, self.card_repo.generation)
+        if choices is None:
+            choices = tuple(to_choice(match) for match in lookup(current))
+            self.cache.put(key, self.card_repo.generation, choices)
+        return list(choices)
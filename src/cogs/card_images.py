@@ -0,0 +1,76 @@
+import logging
+from urllib.parse import quote
+
+import aiohttp
+
+from src.utils.image_cache import ImageCache
+from src.utils.single_flight import SingleFlight
+
+_log = logging.getLogger(__name__)
+
+
+def image_filename(series: str, product: str, number: str, rarity: str) -> str:
+    """Cache filename of a card image ("PL!N-bp4-032-L+" -> "PLSPN-bp4-032-Lplus.png")."""
+    safe_series = series.replace("!", "SP")
+    safe_rarity = rarity.replace("+", "plus")
+    return f"{safe_series}-{product}-{number}-{safe_rarity}.png"
+
+
+class CardImages:
+    """
+    Card images served from the image cache, downloaded on a miss.
+
+    Shared by everything that fetches images (the lookup commands and the
+    background prefetch), so concurrent requests for the same file share one
+    download whoever makes them.
+    """
+
+    def __init__(self, http_session: aiohttp.ClientSession, image_cache: ImageCache):
+        # Shared, pooled session owned by the bot (see src/utils/http.py)
+        self.http_session = http_session
+        # Size-capped cache of downloaded images (IMAGE_CACHE_PATH), owned by the bot
+        self.image_cache = image_cache
+        # In-progress downloads by cache filename
+        self._downloads = SingleFlight()
+
+    async def _download(self, img_url: str, filename: str) -> bytes | None:
+        """Downloads `img_url` into the image cache as `filename` and returns its bytes (None on failure)."""
+        try:
+            # Encode URL
+            proto, rest = img_url.split("://", 1)
+            parts = rest.split("/", 1)
+            if len(parts) != 2:
+                return None
+            domain, path = parts
+            encoded_path = quote(path, safe="/:?=&!")
+            download_url = f"{proto}://{domain}/{encoded_path}"
+
+            async with self.http_session.get(download_url) as resp:
+                if resp.status != 200:
+                    _log.error(f"Download failed for {download_url}: {resp.status}")
+                    return None
+                data = await resp.read()
+        except Exception as e:
+            _log.error(f"Image download error: {e}")
+            return None
+
+        # The image is served from memory even if caching it fails
+        try:
+            # Written under a temporary name and renamed into place, so readers never see a partial PNG
+            await self.image_cache.store(filename, data)
+            _log.info(f"Cached image: {filename}")
+        except OSError as e:
+            _log.error(f"Image cache write error: {e}")
+        return data
+
+    async def download(self, filename: str, img_url: str) -> bytes | None:
+        """Downloads the image, joining a download of the same file already in progress."""
+        return await self._downloads.run(filename, lambda: self._download(img_url, filename))
+
+    async def get(self, filename: str, img_url: str) -> bytes | None:
+        """Bytes of the image cached as `filename`, downloading it from `img_url` if missing."""
+        # The cache manifest knows what is on disk; reads run on the disk I/O pool, off the event loop
+        data = await self.image_cache.read(filename)
+        if data is None:
+            data = await self.download(filename, img_url)
+        return data
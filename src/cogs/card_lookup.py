@@ -1,26 +1,32 @@
+import asyncio
+import io
 import logging
 import re
-from pathlib import Path
-from urllib.parse import quote
 
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from src import config
-from src.db.card_repository import CardData, CardRepository
+from src.cogs.autocomplete import ChoiceCache
+from src.cogs.card_images import CardImages, image_filename
+from src.db.card_repository import CardData, CardID, CardRepository
 
 _log = logging.getLogger(__name__)
 
+# Discord allows at most 10 embeds per message
+MAX_CARDS_PER_MESSAGE = 10
+
+# Separators between the IDs given to /cards
+_ID_SEPARATORS = re.compile(r"[\s,]+")
+
 
 class CardLookup(commands.Cog):
-    def __init__(self, bot: commands.Bot, card_repo: CardRepository):
+    def __init__(self, bot: commands.Bot, card_repo: CardRepository, images: CardImages):
         self.bot = bot
         self.card_repo = card_repo
-        # Retrieve image cache path from centralized config
-        settings = config.get_config()
-        self.img_cache_dir = Path(settings.get("IMAGE_CACHE_PATH", "data/images"))
+        self.choice_cache = ChoiceCache(card_repo)
+        # Cached image downloads, shared with the background prefetch
+        self.images = images
 
         # heart types -> emoji names mapping
         self.emoji_map = {
@@ -56,54 +62,35 @@ class CardLookup(commands.Cog):
         }
 
     async def _get_or_download_image(
-        self, series: str, product: str, number_str: str, rarity: str, img_url: str | None
+        self,
+        series: str,
+        product: str,
+        number_str: str,
+        rarity: str,
+        img_url: str | None,
+        attachment_name: str = "image.png",
     ) -> discord.File | None:
         """Checks local cache for image, downloads if missing, and returns discord.File."""
         if not img_url:
             return None
 
-        # Build local path
-        safe_series = series.replace("!", "SP")
-        safe_rarity = rarity.replace("+", "plus")
-        filename = f"{safe_series}-{product}-{number_str}-{safe_rarity}.png"
-        local_path = self.img_cache_dir / filename
-
-        # Download if missing
-        if not local_path.exists():
-            try:
-                # Ensure directory exists
-                self.img_cache_dir.mkdir(parents=True, exist_ok=True)
-
-                # Encode URL
-                proto, rest = img_url.split("://", 1)
-                parts = rest.split("/", 1)
-                if len(parts) == 2:
-                    domain, path = parts
-                    encoded_path = quote(path, safe="/:?=&!")
-                    download_url = f"{proto}://{domain}/{encoded_path}"
-
-                    headers = {
-                        "User-Agent": (
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/91.0.4472.124 Safari/537.36"
-                        )
-                    }
-                    async with aiohttp.ClientSession() as session, session.get(download_url, headers=headers) as resp:
-                        if resp.status == 200:
-                            data = await resp.read()
-                            with open(local_path, "wb") as f:
-                                f.write(data)
-                            _log.info(f"Cached image: {local_path.name}")
-                        else:
-                            _log.error(f"Download failed for {download_url}: {resp.status}")
-            except Exception as e:
-                _log.error(f"Image download error: {e}")
-
-        # Return file if exists
-        if local_path.exists():
-            return discord.File(local_path, filename="image.png")
-        return None
+        data = await self.images.get(image_filename(series, product, number_str, rarity), img_url)
+        if data is None:
+            return None
+        return discord.File(io.BytesIO(data), filename=attachment_name)
+
+    async def _get_card_image(self, card_data: CardData, attachment_name: str) -> discord.File | None:
+        parsed_id = CardID.parse(card_data["card_number"])
+        if not parsed_id:
+            return None
+        return await self._get_or_download_image(
+            parsed_id.series,
+            parsed_id.product,
+            parsed_id.number,
+            parsed_id.rarity,
+            card_data.get("img_url"),
+            attachment_name,
+        )
 
     def _format_hearts(self, hearts_data: dict[str, str]) -> str:
         """Formats a heart dictionary into an emoji string."""
@@ -200,26 +187,60 @@ class CardLookup(commands.Cog):
         embed.set_footer(text=f"ID: {card_data['card_number']}")
         return embed
 
+    @staticmethod
+    def _id_context(interaction: discord.Interaction) -> tuple[str | None, str | None, str | None]:
+        """Series, product and number already filled in for the /card command (None if not yet)."""
+        namespace = interaction.namespace
+        number = namespace.number
+        return (
+            namespace.series or None,
+            namespace.product or None,
+            f"{number:03d}" if isinstance(number, int) else None,
+        )
+
     async def series_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        matches = self.card_repo.search_series(current)
-        return [app_commands.Choice(name=val, value=val) for val in matches]
+        return self.choice_cache.get("series", current, self.card_repo.search_series)
 
     async def product_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        matches = self.card_repo.search_product(current)
-        return [app_commands.Choice(name=val, value=val) for val in matches]
+        series, _, _ = self._id_context(interaction)
+        return self.choice_cache.get(
+            ("product", series), current, lambda query: self.card_repo.search_product(query, series)
+        )
+
+    async def number_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[int]]:
+        series, product, _ = self._id_context(interaction)
+
+        def lookup(query: str) -> list[str]:
+            # Only numeric card numbers can be entered in the integer option
+            return [val for val in self.card_repo.search_number(query, series, product) if val.isdigit()]
+
+        return self.choice_cache.get(
+            ("number", series, product),
+            str(current),
+            lookup,
+            to_choice=lambda val: app_commands.Choice(name=val, value=int(val)),
+        )
 
     async def rarity_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        matches = self.card_repo.search_rarity(current)
-        return [app_commands.Choice(name=val, value=val) for val in matches]
+        series, product, number = self._id_context(interaction)
+        return self.choice_cache.get(
+            ("rarity", series, product, number),
+            current,
+            lambda query: self.card_repo.search_rarity(query, series, product, number),
+        )
 
     @app_commands.command(name="card", description="Look up a Love Live! OCG card")
     @app_commands.autocomplete(series=series_autocomplete, product=product_autocomplete, rarity=rarity_autocomplete)
+    # Separate decorator since the number choices are ints
+    @app_commands.autocomplete(number=number_autocomplete)
     @app_commands.describe(
         series="Card Series (e.g. PL!N)",
         product="Product Code (e.g. bp4)",
@@ -251,3 +272,52 @@ class CardLookup(commands.Cog):
         await interaction.followup.send(embed=embed, file=file) if file else await interaction.followup.send(
             embed=embed
         )
+
+    @app_commands.command(name="cards", description="Look up several Love Live! OCG cards at once")
+    @app_commands.describe(ids="Card IDs separated by spaces or commas (e.g. PL!N-bp4-032-L+ PL!-bp1-001-R)")
+    async def cards(self, interaction: discord.Interaction, ids: str):
+        await interaction.response.defer()
+
+        # Identical strings are resolved once
+        card_ids = list(dict.fromkeys(card_id for card_id in _ID_SEPARATORS.split(ids) if card_id))
+        if not card_ids:
+            await interaction.followup.send("No card IDs given.", ephemeral=True)
+            return
+
+        # Differently written IDs of one card ("PL!N-bp1-1-R", fullwidth, ...) are shown once
+        cards_by_number: dict[str, CardData] = {}
+        missing: list[str] = []
+        for card_id, card_data in zip(card_ids, self.card_repo.get_cards(card_ids), strict=True):
+            if card_data:
+                cards_by_number.setdefault(card_data["card_number"], card_data)
+            else:
+                missing.append(card_id)
+        found = list(cards_by_number.values())
+
+        notes = []
+        if len(found) > MAX_CARDS_PER_MESSAGE:
+            notes.append(f"Showing the first {MAX_CARDS_PER_MESSAGE} of {len(found)} cards.")
+            found = found[:MAX_CARDS_PER_MESSAGE]
+        if missing:
+            notes.append("Cards not found: " + ", ".join(f"`{card_id}`" for card_id in missing))
+
+        if not found:
+            await interaction.followup.send("\n".join(notes), ephemeral=True)
+            return
+
+        # Each embed points at its own attachment; all images are fetched concurrently
+        attachment_names = [f"image{i}.png" for i in range(len(found))]
+        images = await asyncio.gather(
+            *(self._get_card_image(card_data, name) for card_data, name in zip(found, attachment_names, strict=True))
+        )
+
+        embeds = []
+        files = []
+        for card_data, name, file in zip(found, attachment_names, images, strict=True):
+            embed = self._build_card_embed(card_data)
+            if file:
+                embed.set_image(url=f"attachment://{name}")
+                files.append(file)
+            embeds.append(embed)
+
+        await interaction.followup.send(content="\n".join(notes) or discord.utils.MISSING, embeds=embeds, files=files)
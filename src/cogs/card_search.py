@@ -7,10 +7,11 @@ from discord import app_commands
 from discord.ext import commands
 
 from src.db.card_repository import CardData, CardRepository
-from src.db.mappings import GROUP_MAP, REVERSE_CHAR_MAP, UNIT_MAP
+from src.db.search_result import SearchResult
 from src.utils.errors import InvalidLookupArgsError
 from src.utils.parsing import parse_range_string
 
+from .autocomplete import ChoiceCache
 from .views.pagination_view import PaginationView
 from .views.start_search_view import StartSearchView
 from .views.state import FilterState
@@ -31,17 +32,22 @@ class CardSearch(commands.Cog):
     def __init__(self, bot: commands.Bot, card_repo: CardRepository):
         self.bot = bot
         self.card_repo = card_repo
+        self.choice_cache = ChoiceCache(card_repo)
 
     async def _display_results(
         self,
         interaction: discord.Interaction,
-        results: list[CardData],
+        results: SearchResult | list[CardData],
         filters_desc: str,
         back_callback: Callable | None = None,
     ):
-        """Helper to display search results using PaginationView."""
+        """Helper to display search results using PaginationView (pages are materialized lazily)."""
         count = len(results)
         title = f"Search Results: {count} found"
+        # The keyword matched nothing and was replaced by the closest known name/alias
+        corrected = getattr(results, "corrected_keyword", None)
+        if corrected:
+            filters_desc = f"Showing results for `{corrected}`\n{filters_desc}"
 
         # Determine color based on results
         color = discord.Color.red() if count == 0 else discord.Color.green()
@@ -61,7 +67,7 @@ class CardSearch(commands.Cog):
     async def handle_advanced_search(self, interaction: discord.Interaction, filters: FilterState):
         """Callback for the Advanced Search Dashboard."""
         filter_dict = filters.to_dict()
-        results = self.card_repo.search_cards(filters=filter_dict)
+        results = self.card_repo.search(filters=filter_dict)
 
         async def back_to_search_callback(intr: discord.Interaction):
             view = StartSearchView(callback=self.handle_advanced_search, initial_state=filters)
@@ -82,45 +88,19 @@ class CardSearch(commands.Cog):
         """
         Autocomplete for 'keyword' argument.
         Matches English input against Characters, Units, and Groups.
-        Returns Japanese values.
+        Returns Japanese values, exact and prefix matches first.
         """
-        current_lower = current.lower()
-        matches = []
-
-        # 1. Characters (REVERSE_CHAR_MAP: Japanese -> English)
-        for jp_val, en_name in REVERSE_CHAR_MAP.items():
-            if current_lower in en_name.lower():
-                matches.append(app_commands.Choice(name=f"Char: {en_name} ({jp_val})", value=jp_val))
-
-        # 2. Units (UNIT_MAP: English -> Japanese)
-        for en_name, jp_val in UNIT_MAP.items():
-            if current_lower in en_name.lower():
-                # Use the DB value (jp_val) for display as it is properly capitalized (e.g. "Printemps")
-                matches.append(app_commands.Choice(name=f"Unit: {jp_val}", value=jp_val))
-
-        # 3. Groups (GROUP_MAP: English -> Japanese)
-        for en_name, jp_val in GROUP_MAP.items():
-            if current_lower in en_name.lower():
-                # Capitalize key for display since value is Japanese
-                matches.append(app_commands.Choice(name=f"Group: {en_name.title()}", value=jp_val))
-
-        # Deduplicate matches by value
-        seen = set()
-        unique_matches = []
-        for m in matches:
-            if m.value not in seen:
-                unique_matches.append(m)
-                seen.add(m.value)
-
-        # Sort matches (Exact matches first could be nice, currently alphabetical by name label)
-        # Verify limit
-        return unique_matches[:25]
+        return self.choice_cache.get(
+            "keyword",
+            current,
+            self.card_repo.search_keyword_aliases,
+            to_choice=lambda entry: app_commands.Choice(name=entry.label, value=entry.value),
+        )
 
     async def rarity_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list[app_commands.Choice[str]]:
-        matches = self.card_repo.search_rarity(current)
-        return [app_commands.Choice(name=val, value=val) for val in matches]
+        return self.choice_cache.get("rarity", current, self.card_repo.search_rarity)
 
     # --- Commands ---
 
@@ -238,7 +218,7 @@ class CardSearch(commands.Cog):
         # ... logic above already populates filters dict ...
 
         # filters variable is already accurate from above logic
-        results = self.card_repo.search_cards(filters=filters)
+        results = self.card_repo.search(filters=filters)
 
         # Describe filters for display
         desc_parts = []
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import logging
+
+from discord.ext import commands, tasks
+
+from src.db.card_repository import CardRepository
+
+_log = logging.getLogger(__name__)
+
+
+class DataReload(commands.Cog):
+    """Watches CARD_DATA_PATH and hot-swaps updated card data without a restart."""
+
+    def __init__(self, bot: commands.Bot, card_repo: CardRepository, interval_seconds: float = 60):
+        self.bot = bot
+        self.card_repo = card_repo
+        self.watch_card_data.change_interval(seconds=interval_seconds)
+
+    async def cog_load(self) -> None:
+        self.watch_card_data.start()
+
+    async def cog_unload(self) -> None:
+        self.watch_card_data.cancel()
+
+    async def reload_if_changed(self) -> bool:
+        """Reloads the card data if the file changed. Returns True if new data was swapped in."""
+        # Stat, parse and reindex off the event loop; only the final swap runs on it
+        if not await asyncio.to_thread(self.card_repo.source_changed):
+            return False
+
+        try:
+            prepared = await asyncio.to_thread(self.card_repo.prepare_reload)
+        except (OSError, json.JSONDecodeError) as e:
+            # Likely caught mid-write; keep serving the current data and retry next tick
+            _log.warning(f"Card data reload skipped: {e}")
+            return False
+
+        diff = self.card_repo.apply_reload(prepared)
+        return not diff.is_empty
+
+    @tasks.loop(seconds=60)
+    async def watch_card_data(self) -> None:
+        try:
+            await self.reload_if_changed()
+        except Exception:
+            _log.exception("Unexpected error while reloading card data")
@@ -0,0 +1,115 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from src.cogs.views.deck_list_modal import DeckListModal
+from src.cogs.views.pagination_view import PaginationView
+from src.cogs.views.state import COLOR_MAP
+from src.db.card_repository import CardRepository
+from src.db.deck import Deck
+from src.db.deck_stats import DeckStats
+
+# Longest bar of the cost curve
+BAR_WIDTH = 15
+
+# Discord embed field value limit
+FIELD_LIMIT = 1024
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= FIELD_LIMIT else text[: FIELD_LIMIT - 3] + "..."
+
+
+def _curve(histogram: dict[int, int]) -> str:
+    peak = max(histogram.values())
+    return "\n".join(
+        f"`{value:>2}` {'█' * max(1, round(copies / peak * BAR_WIDTH))} {copies}" for value, copies in histogram.items()
+    )
+
+
+def _heart_line(totals: dict[str, int]) -> str:
+    return "   ".join(f"{COLOR_MAP.get(color, color)} {total}" for color, total in totals.items() if total)
+
+
+class DeckTools(commands.Cog):
+    def __init__(self, bot: commands.Bot, card_repo: CardRepository):
+        self.bot = bot
+        self.card_repo = card_repo
+
+    @staticmethod
+    def _deck_problems(deck: Deck) -> str:
+        lines = [f"Unknown: `{card_id}` x{quantity}" for card_id, quantity in deck.unknown.items()]
+        lines.extend(f"Not understood: `{line}`" for line in deck.invalid)
+        return _truncate("\n".join(lines))
+
+    def _build_stats_embed(self, deck: Deck, stats: DeckStats) -> discord.Embed:
+        embed = discord.Embed(
+            title="Deck Statistics",
+            description=f"**Cards**: {stats.total_cards} (Members {stats.members}, Lives {stats.lives})",
+            color=discord.Color.green(),
+        )
+        if stats.cost_curve:
+            embed.add_field(name="Cost Curve", value=_curve(stats.cost_curve), inline=False)
+        if stats.blade_curve:
+            embed.add_field(name=f"Blades (total {stats.total_blades})", value=_curve(stats.blade_curve), inline=False)
+        if any(stats.hearts.values()):
+            embed.add_field(name="Member Hearts", value=_heart_line(stats.hearts), inline=False)
+        if any(stats.required_hearts.values()):
+            embed.add_field(name="Live Required Hearts", value=_heart_line(stats.required_hearts), inline=False)
+        embed.add_field(
+            name="Blade Heart Triggers",
+            value="   ".join(f"{trigger} {copies}" for trigger, copies in stats.triggers.items()),
+            inline=False,
+        )
+        if not deck.is_valid:
+            embed.add_field(name="Problems", value=self._deck_problems(deck), inline=False)
+        return embed
+
+    async def _resolve_or_report(self, interaction: discord.Interaction, text: str) -> Deck | None:
+        """The resolved deck, or None after telling the user that no known card was given."""
+        deck = self.card_repo.resolve_deck(text)
+        if deck.entries:
+            return deck
+        message = "No known cards found in the deck list."
+        if not deck.is_valid:
+            message += "\n" + self._deck_problems(deck)
+        await interaction.response.send_message(message, ephemeral=True)
+        return None
+
+    async def _send_deck_stats(self, interaction: discord.Interaction, text: str):
+        deck = await self._resolve_or_report(interaction, text)
+        if deck is None:
+            return
+
+        stats = self.card_repo.deck_stats(deck)
+        await interaction.response.send_message(embed=self._build_stats_embed(deck, stats))
+
+    @app_commands.command(name="deckstats", description="Cost curve, hearts and blade stats of a deck list")
+    async def deckstats(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(DeckListModal(self._send_deck_stats))
+
+    async def _send_playable_lives(self, interaction: discord.Interaction, text: str):
+        deck = await self._resolve_or_report(interaction, text)
+        if deck is None:
+            return
+
+        hearts, lives = self.card_repo.playable_lives(deck)
+        if not any(hearts.values()):
+            await interaction.response.send_message("None of the listed cards are members with hearts.", ephemeral=True)
+            return
+
+        desc = f"Member hearts: {_heart_line(hearts)}"
+        if not deck.is_valid:
+            desc += "\n" + self._deck_problems(deck)
+        count = len(lives)
+        view = PaginationView(
+            results=lives,
+            title=f"Playable Lives: {count} found",
+            filters_desc=desc,
+            color=discord.Color.red() if count == 0 else discord.Color.green(),
+        )
+        await interaction.response.send_message(embed=view.get_embed(), view=view)
+
+    @app_commands.command(name="lives", description="Live cards whose required hearts the listed members can meet")
+    async def lives(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(DeckListModal(self._send_playable_lives))
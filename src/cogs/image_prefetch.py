@@ -0,0 +1,264 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from discord.ext import commands, tasks
+
+from src.cogs.card_images import CardImages, image_filename
+from src.db.card_repository import CardData, CardID, CardRepository
+from src.utils.disk_io import write_atomic
+
+_log = logging.getLogger(__name__)
+
+# Failed downloads kept across restarts, in the cache directory (dotfiles are ignored by its scan)
+STATE_NAME = ".prefetch.json"
+STATE_VERSION = 1
+
+# Images that failed to download are not retried before this many seconds
+RETRY_FAILED_SECONDS = 24 * 3600
+
+# Prefetching stops once the cache is this full, so it never evicts images users looked up
+MAX_CACHE_FILL = 0.9
+
+# Progress is logged every this many downloads
+LOG_EVERY = 100
+
+_PRODUCT = re.compile(r"([a-z]+)(\d+)", re.IGNORECASE)
+
+
+def product_rank(product: str) -> tuple[int, int]:
+    """
+    Sort key putting recent products first: booster packs ("bp") newest first,
+    then the other numbered products newest first, then everything else.
+    """
+    match = _PRODUCT.fullmatch(product)
+    if not match:
+        return (2, 0)
+    prefix, number = match.groups()
+    return (0 if prefix.lower() == "bp" else 1, -int(number))
+
+
+def plan_prefetch(cards: list[CardData]) -> list[tuple[str, str]]:
+    """(cache filename, image URL) of every card with an image, most recent products first."""
+    ranked = []
+    for card in cards:
+        img_url = card.get("img_url")
+        parsed_id = CardID.parse(card["card_number"])
+        if not img_url or not parsed_id:
+            continue
+        filename = image_filename(parsed_id.series, parsed_id.product, parsed_id.number, parsed_id.rarity)
+        ranked.append((product_rank(parsed_id.product), filename, img_url))
+    # Stable, so cards keep the data file's order within a product
+    ranked.sort(key=lambda item: item[0])
+    # Cards repeated in the data file share a filename; the first one wins
+    plan: dict[str, str] = {}
+    for _, filename, img_url in ranked:
+        plan.setdefault(filename, img_url)
+    return list(plan.items())
+
+
+@dataclass
+class PrefetchMetrics:
+    # Cards with an image
+    total: int = 0
+    # Already cached when the pass started
+    cached: int = 0
+    # Failed recently, not retried in this pass
+    skipped: int = 0
+    downloaded: int = 0
+    failed: int = 0
+    bytes: int = 0
+    started: float = 0.0
+    finished: float | None = None
+
+    @property
+    def done(self) -> int:
+        return self.cached + self.skipped + self.downloaded + self.failed
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.done
+
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def images_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.downloaded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Image prefetch: {self.done}/{self.total} (cached={self.cached} downloaded={self.downloaded} "
+            f"failed={self.failed} skipped={self.skipped}), {self.bytes / 2**20:.1f} MiB in "
+            f"{self.elapsed_seconds:.1f} s ({self.images_per_second:.2f} images/s, "
+            f"{self.bytes_per_second / 2**10:.0f} KiB/s)"
+        )
+
+
+class RateLimiter:
+    """Spaces calls to `wait` at least 1 / `rate` seconds apart, across all callers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ImagePrefetch(commands.Cog):
+    """
+    Warms the image cache in the background by downloading every card image
+    that is not cached yet, most recent products first.
+
+    Runs once the bot is ready and then every `interval_seconds` (picking up
+    cards added by a reload). The cache itself is the checkpoint: a pass only
+    requests what the cache manifest lacks, so a restart resumes where the
+    last pass stopped. Downloads go through `CardImages`, so they are shared
+    with concurrent lookups of the same card, and are limited to `concurrency`
+    at once and `rate` per second.
+    """
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        card_repo: CardRepository,
+        images: CardImages,
+        concurrency: int = 2,
+        rate: float = 2.0,
+        interval_seconds: float = 3600,
+    ):
+        self.bot = bot
+        self.card_repo = card_repo
+        self.images = images
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(rate)
+        # Metrics of the current (or last) pass
+        self.metrics = PrefetchMetrics()
+        # Cache filename -> time of the last failed download
+        self._failed: dict[str, float] = {}
+        self._state_loaded = False
+        self.prefetch_images.change_interval(seconds=interval_seconds)
+
+    @property
+    def state_path(self) -> Path:
+        return self.images.image_cache.directory / STATE_NAME
+
+    async def cog_load(self) -> None:
+        self.prefetch_images.start()
+
+    async def cog_unload(self) -> None:
+        self.prefetch_images.cancel()
+
+    def _read_state(self) -> dict[str, float]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] != STATE_VERSION:
+                return {}
+            return {name: float(failed_at) for name, failed_at in data["failed"].items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            _log.warning(f"Ignoring unreadable image prefetch state {self.state_path}: {e}")
+            return {}
+
+    def _write_state(self, data: bytes) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.state_path, data)
+
+    async def _load_state(self) -> None:
+        if not self._state_loaded:
+            self._failed = await self.images.image_cache.disk_io.run("prefetch_state_read", self._read_state)
+            self._state_loaded = True
+
+    async def _save_state(self) -> None:
+        data = json.dumps({"version": STATE_VERSION, "failed": self._failed}).encode()
+        try:
+            await self.images.image_cache.disk_io.run("prefetch_state_write", self._write_state, data)
+        except OSError as e:
+            _log.error(f"Failed to save image prefetch state: {e}")
+
+    def _cache_full(self) -> bool:
+        cache = self.images.image_cache
+        return cache.total_bytes >= cache.max_bytes * MAX_CACHE_FILL
+
+    async def prefetch(self) -> PrefetchMetrics:
+        """Downloads the missing card images. Returns the pass's metrics (also kept in `metrics`)."""
+        await self._load_state()
+        cache = self.images.image_cache
+        now = time.time()
+        self._failed = {name: at for name, at in self._failed.items() if now - at < RETRY_FAILED_SECONDS}
+
+        plan = plan_prefetch(self.card_repo.cards)
+        metrics = self.metrics = PrefetchMetrics(total=len(plan), started=time.perf_counter())
+        pending = []
+        for filename, img_url in plan:
+            if filename in cache:
+                metrics.cached += 1
+            elif filename in self._failed:
+                metrics.skipped += 1
+            else:
+                pending.append((filename, img_url))
+
+        # One iterator shared by the workers; each takes the next image when it is free
+        queue = iter(pending)
+
+        async def worker() -> None:
+            for filename, img_url in queue:
+                if self._cache_full():
+                    return
+                # Fetched by a lookup meanwhile
+                if filename in cache:
+                    metrics.cached += 1
+                    continue
+                await self.rate_limiter.wait()
+                data = await self.images.download(filename, img_url)
+                if data is None:
+                    metrics.failed += 1
+                    self._failed[filename] = time.time()
+                else:
+                    metrics.downloaded += 1
+                    metrics.bytes += len(data)
+                    if metrics.downloaded % LOG_EVERY == 0:
+                        _log.info(str(metrics))
+
+        if pending:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            await self._save_state()
+        metrics.finished = time.perf_counter()
+        if metrics.remaining:
+            _log.warning(f"Image cache nearly full, prefetch stopped with {metrics.remaining} images left")
+        if pending:
+            _log.info(str(metrics))
+        return metrics
+
+    @tasks.loop(seconds=3600)
+    async def prefetch_images(self) -> None:
+        try:
+            await self.prefetch()
+        except Exception:
+            _log.exception("Unexpected error while prefetching card images")
+
+    @prefetch_images.before_loop
+    async def before_prefetch_images(self) -> None:
+        # Only start once setup_hook has finished and the bot is connected
+        await self.bot.wait_until_ready()
@@ -0,0 +1,21 @@
+from collections.abc import Callable
+
+import discord
+from discord.ui import Modal, TextInput
+
+
+class DeckListModal(Modal, title="Deck List"):
+    # Slash command options are single-line, so deck lists are pasted here
+    deck_list: TextInput = TextInput(
+        label="Deck list (one card per line)",
+        style=discord.TextStyle.paragraph,
+        placeholder="PL!N-bp4-032-L+ x4\nPL!N-bp4-001-R x2",
+        max_length=4000,
+    )
+
+    def __init__(self, callback: Callable):
+        super().__init__()
+        self.callback = callback
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await self.callback(interaction, self.deck_list.value)
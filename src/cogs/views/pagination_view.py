@@ -4,12 +4,13 @@ import discord
 from discord.ui import Button, View
 
 from src.db.card_repository import CardData
+from src.db.search_result import SearchResult
 
 
 class PaginationView(View):
     def __init__(
         self,
-        results: list[dict] | list[CardData],
+        results: SearchResult | list[dict] | list[CardData],
         title: str,
         filters_desc: str,
         color: discord.Color,
@@ -42,6 +43,7 @@ class PaginationView(View):
     def get_embed(self) -> discord.Embed:
         start = self.current_page * self.items_per_page
         end = start + self.items_per_page
+        # SearchResult materializes only this slice
         page_items = self.results[start:end]
 
         desc = self.filters_desc + "\n"
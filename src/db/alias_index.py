@@ -0,0 +1,95 @@
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.db.autocomplete_index import MAX_CHOICES, PREFIX_END
+from src.db.bitset import iter_positions
+from src.db.mappings import CHARACTER_MAP, GROUP_MAP, REVERSE_CHAR_MAP, UNIT_MAP
+from src.db.ngram_index import NgramIndex
+from src.utils.text import normalize_text
+
+
+@dataclass(frozen=True)
+class AliasEntry:
+    label: str  # Shown to the user, e.g. "Char: Honoka (高坂穂乃果)"
+    value: str  # Database value searched for
+
+
+def keyword_aliases(units: Iterable[str] = (), groups: Iterable[str] = ()) -> list[tuple[str, AliasEntry]]:
+    """(alias, entry) pairs from src/db/mappings.py plus the unit and group values present in the card data."""
+    aliases: list[tuple[str, AliasEntry]] = []
+
+    # 1. Characters: every English/Romaji alias and the Japanese name itself
+    for alias, jp_val in CHARACTER_MAP.items():
+        entry = AliasEntry(f"Char: {REVERSE_CHAR_MAP[jp_val]} ({jp_val})", jp_val)
+        aliases.append((alias, entry))
+    for jp_val, en_name in REVERSE_CHAR_MAP.items():
+        aliases.append((jp_val, AliasEntry(f"Char: {en_name} ({jp_val})", jp_val)))
+
+    # 2. Units: the DB value is shown as it is properly capitalized (e.g. "Printemps")
+    for alias, jp_val in UNIT_MAP.items():
+        aliases.append((alias, AliasEntry(f"Unit: {jp_val}", jp_val)))
+    for unit in units:
+        aliases.append((unit, AliasEntry(f"Unit: {unit}", unit)))
+
+    # 3. Groups: the English key is shown (title-cased) since the value is Japanese
+    group_labels: dict[str, str] = {}
+    for alias, jp_val in GROUP_MAP.items():
+        group_labels.setdefault(jp_val, f"Group: {alias.title()}")
+        aliases.append((alias, AliasEntry(f"Group: {alias.title()}", jp_val)))
+    for group in groups:
+        aliases.append((group, AliasEntry(group_labels.get(group, f"Group: {group}"), group)))
+
+    return aliases
+
+
+class AliasIndex:
+    """
+    Keyword autocomplete over every known way to refer to a character, unit or group.
+
+    Aliases are stored normalized and sorted, so exact and prefix hits come from a
+    bisected run; substring hits, looked up through an n-gram index, are only
+    added when those do not fill the result. Each database value is returned
+    once, at its best rank.
+    """
+
+    def __init__(self, aliases: Iterable[tuple[str, AliasEntry]] = ()):
+        # Equal aliases keep the insertion order (characters, then units, then groups)
+        pairs = sorted(((normalize_text(alias), entry) for alias, entry in aliases), key=lambda pair: pair[0])
+        self._keys = [alias for alias, _ in pairs]
+        self._entries = [entry for _, entry in pairs]
+        # Narrows substring lookups to the aliases sharing the query's n-grams
+        self._ngrams = NgramIndex.build(self._keys)
+
+    @classmethod
+    def build(cls, units: Iterable[str] = (), groups: Iterable[str] = ()) -> "AliasIndex":
+        return cls(keyword_aliases(units, groups))
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list[AliasEntry]:
+        """
+        Entries whose aliases contain `query`: exact matches first, then prefix,
+        then substring matches (each group in alias order).
+        """
+        query = normalize_text(query)
+        keys = self._keys
+        start = bisect_left(keys, query)
+        end = bisect_left(keys, query + PREFIX_END, start)
+
+        # Entries are visited best rank first, so the first hit per value is its best
+        results: dict[str, AliasEntry] = {}
+        # The exact hits lead the prefix run, since query sorts before its extensions
+        for i in range(start, end):
+            results.setdefault(self._entries[i].value, self._entries[i])
+            if len(results) == limit:
+                return list(results.values())
+
+        if query:
+            for i in iter_positions(self._ngrams.candidates(query)):
+                if not start <= i < end and query in keys[i]:
+                    results.setdefault(self._entries[i].value, self._entries[i])
+                    if len(results) == limit:
+                        break
+        return list(results.values())
+
+    def __len__(self) -> int:
+        return len(self._keys)
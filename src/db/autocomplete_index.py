@@ -0,0 +1,43 @@
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from src.utils.text import normalize_text
+
+# Discord limit is 25 choices
+MAX_CHOICES = 25
+
+# Sorts after every character, so [query, query + PREFIX_END) spans all keys starting with query
+PREFIX_END = "\U0010ffff"
+
+
+class AutocompleteIndex:
+    """
+    Autocomplete over a fixed set of values, ignoring case, width, kana and spacing.
+
+    Values are kept sorted by their normalized form, so the values starting with
+    the query form one contiguous run found by bisection. Substring matches
+    are only scanned for when the prefix run does not fill the result.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        pairs = sorted((normalize_text(value), value) for value in set(values))
+        self._keys = [key for key, _ in pairs]
+        self.values = [value for _, value in pairs]
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list[str]:
+        """Values containing `query`, those starting with it first, each group in sorted order."""
+        query = normalize_text(query)
+        start = bisect_left(self._keys, query)
+        end = bisect_left(self._keys, query + PREFIX_END, start)
+        matches = self.values[start : min(end, start + limit)]
+        if len(matches) < limit and query:
+            # Prefix hits are exactly keys[start:end]; only the rest can be substring hits
+            for i, key in enumerate(self._keys):
+                if query in key and not start <= i < end:
+                    matches.append(self.values[i])
+                    if len(matches) == limit:
+                        break
+        return matches
+
+    def __len__(self) -> int:
+        return len(self.values)
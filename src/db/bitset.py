@@ -0,0 +1,87 @@
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import Any
+
+
+def from_positions(positions: Iterable[int], size: int) -> int:
+    """Builds a bitset (a plain int) with the given bit positions set."""
+    buf = bytearray((size + 7) // 8)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_positions(mask: int) -> Iterator[int]:
+    """Yields the set bit positions of a bitset in ascending order."""
+    if not mask:
+        return
+    # Reversed binary string puts bit 0 first; str.find skips zero runs at C speed.
+    bits = bin(mask)[:1:-1]
+    pos = bits.find("1")
+    while pos != -1:
+        yield pos
+        pos = bits.find("1", pos + 1)
+
+
+def update_postings(
+    postings: Mapping[Any, int],
+    removed: Mapping[Any, Iterable[int]],
+    added: Mapping[Any, Iterable[int]],
+) -> dict[Any, int]:
+    """
+    Copy-on-write update of a key -> bitset mapping.
+    Clears the `removed` positions and sets the `added` ones; keys left empty are dropped.
+    """
+    updated = dict(postings)
+    for key, pos_list in removed.items():
+        mask = updated.get(key, 0)
+        for pos in pos_list:
+            mask &= ~(1 << pos)
+        if mask:
+            updated[key] = mask
+        else:
+            updated.pop(key, None)
+    for key, pos_list in added.items():
+        mask = updated.get(key, 0)
+        for pos in pos_list:
+            mask |= 1 << pos
+        updated[key] = mask
+    return updated
+
+
+class BitsetIndex:
+    """
+    Posting-list index mapping a key to the set of card positions holding it.
+    Each posting list is stored as a bitset so filters combine with `&` / `|`.
+    """
+
+    def __init__(self, postings: dict[Any, int] | None = None):
+        self._postings: dict[Any, int] = postings or {}
+
+    @classmethod
+    def build(cls, positions: Mapping[Any, Iterable[int]], size: int) -> "BitsetIndex":
+        return cls({key: from_positions(pos_list, size) for key, pos_list in positions.items()})
+
+    def updated(self, removed: Mapping[Any, Iterable[int]], added: Mapping[Any, Iterable[int]]) -> "BitsetIndex":
+        """New index with the given positions moved; this one is left untouched."""
+        return BitsetIndex(update_postings(self._postings, removed, added))
+
+    def get(self, key: Hashable) -> int:
+        return self._postings.get(key, 0)
+
+    def union(self, keys: Iterable[Hashable]) -> int:
+        mask = 0
+        for key in keys:
+            mask |= self._postings.get(key, 0)
+        return mask
+
+    def keys(self) -> list[Hashable]:
+        return list(self._postings)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._postings)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._postings
+
+    def __len__(self) -> int:
+        return len(self._postings)
@@ -0,0 +1,311 @@
+import logging
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+from src.db.alias_index import AliasEntry, AliasIndex, keyword_aliases
+from src.db.autocomplete_index import AutocompleteIndex
+from src.db.bitset import BitsetIndex, iter_positions
+from src.db.card_record import FIELD_SEP, CardRecord
+from src.db.columns import CardColumns
+from src.db.fuzzy_index import FuzzyIndex
+from src.db.models import CardData, CardID
+from src.db.ngram_index import NgramIndex
+from src.db.query_planner import QueryPlanner
+from src.db.value_table import CODED_FIELDS, ValueTables, copy_tables, new_tables
+
+_log = logging.getLogger(__name__)
+
+# Exact-match filters backed by posting lists, keyed by value code
+POSTING_FIELDS = CODED_FIELDS
+
+# series -> product -> number -> rarities
+IdTree = dict[str, dict[str, dict[str, set[str]]]]
+
+# Above this share of dead positions an incremental update falls back to a full rebuild
+MAX_TOMBSTONE_RATIO = 0.25
+
+
+def _posting_keys(record: CardRecord) -> dict[str, Iterable[int | None]]:
+    return {
+        "rarity": (record.rarity_code,),
+        "card_type": (record.card_type_code,),
+        "unit": (record.unit_code,),
+        "group": set(record.group_codes),
+        "blade_hearts": set(record.blade_heart_codes),
+    }
+
+
+def _collect_postings(entries: Iterable[tuple[int, CardRecord]]) -> dict[str, dict[int, array]]:
+    """Posting field -> value code -> positions for (position, record) pairs."""
+    positions: dict[str, dict[int, array]] = {name: {} for name in POSTING_FIELDS}
+    for pos, record in entries:
+        for name, codes in _posting_keys(record).items():
+            for code in codes:
+                if code is not None:
+                    positions[name].setdefault(code, array("i")).append(pos)
+    return positions
+
+
+def _search_text(record: CardRecord) -> str:
+    return f"{record.name_norm}{FIELD_SEP}{record.info_text_norm}"
+
+
+def normalized_id(card: CardData, warn: bool = True) -> str | None:
+    """Lookup key "series-product-number-rarity" (ASCII +), or None for missing/malformed numbers."""
+    card_number = card.get("card_number", "")
+    if not card_number:
+        return None
+
+    parsed_id = CardID.parse(card_number)
+    if not parsed_id:
+        if warn:
+            _log.warning(f"Skipping malformed card number: {card_number}")
+        return None
+
+    # Reconstruct ID from the width-normalized parts (e.g. ASCII +) for consistent lookup keys
+    return f"{parsed_id.series}-{parsed_id.product}-{parsed_id.number}-{parsed_id.rarity}"
+
+
+def _unique_numbers(cards: Sequence[CardData]) -> dict[str, int] | None:
+    """card_number -> position, or None if any card lacks a number or shares one."""
+    positions: dict[str, int] = {}
+    for pos, card in enumerate(cards):
+        card_number = card.get("card_number")
+        if not card_number or card_number in positions:
+            return None
+        positions[card_number] = pos
+    return positions
+
+
+@dataclass
+class ReloadDiff:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    full_rebuild: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.full_rebuild)
+
+
+class CardIndex:
+    """
+    All lookup and search structures derived from one version of the card data.
+
+    An index is never mutated after it is built: `updated` returns a new index
+    sharing the untouched parts, so the repository can swap versions with a
+    single assignment while searches and open result views keep using the old one.
+    Bit N of every bitset refers to `cards[N]`; positions outside `alive_mask`
+    are tombstones left behind by incremental updates.
+    """
+
+    def __init__(self) -> None:
+        self.cards: list[CardData] = []
+        # Precompiled search records, parallel to self.cards
+        self.records: list[CardRecord] = []
+        self.alive_mask = 0
+        # card_number -> position, None when numbers are missing/duplicated (no incremental updates)
+        self.positions: dict[str, int] | None = {}
+
+        # Main lookup map: "series-product-number-rarity" (normalized) -> CardData
+        self.id_map: dict[str, CardData] = {}
+        # Distinct values of the coded fields; records and postings refer to them by code
+        self.tables: ValueTables = new_tables()
+
+        # ID components as a series -> product -> number -> rarities tree, for autocomplete
+        self.id_tree: IdTree = {}
+        # Keyword autocomplete over the mapped aliases and the units/groups in the data
+        self.keyword_aliases = AliasIndex()
+        # Typo-tolerant lookup over the same aliases plus card names
+        self.keyword_fuzzy = FuzzyIndex()
+        # Memoized autocomplete indices per completion context (see `completions`)
+        self._completions: dict[tuple[str | None, ...], AutocompleteIndex] = {}
+
+        # Posting-list indices for exact-match search filters
+        self.postings: dict[str, BitsetIndex] = {name: BitsetIndex() for name in POSTING_FIELDS}
+        # Numeric columns for cost/blades/score and heart totals
+        self.columns = CardColumns()
+        # N-gram index over name + ability text for text_query
+        self.text_ngrams = NgramIndex()
+        # Compiles filters into cached, selectivity-ordered plans over the indices above
+        self.planner = QueryPlanner([], self.postings, self.columns, self.text_ngrams, self.tables)
+
+    @classmethod
+    def build(cls, cards: Iterable[CardData]) -> "CardIndex":
+        """Builds an index over `cards`, which may be a stream consumed one card at a time."""
+        index = cls()
+        for card in cards:
+            index.cards.append(card)
+            index.records.append(CardRecord(card, index.tables))
+        size = len(index.records)
+        index.alive_mask = (1 << size) - 1
+        index.positions = _unique_numbers(index.cards)
+
+        # Search postings cover every card, including ones with malformed IDs
+        positions = _collect_postings(enumerate(index.records))
+        index.postings = {name: BitsetIndex.build(positions[name], size) for name in POSTING_FIELDS}
+        index.columns = CardColumns.build(index.records)
+        index.text_ngrams = NgramIndex.build([_search_text(record) for record in index.records])
+
+        for card in index.cards:
+            key = normalized_id(card)
+            if key:
+                index.id_map[key] = card
+
+        index._finish()
+        return index
+
+    def updated(self, new_cards: Sequence[CardData]) -> tuple["CardIndex", ReloadDiff]:
+        """
+        Diffs `new_cards` against this index by card_number and returns an index
+        for the new data, reindexing only the added, changed and removed cards.
+        Changed cards keep their position; added cards are appended.
+        """
+        new_positions = _unique_numbers(new_cards)
+        if self.positions is None or new_positions is None:
+            return CardIndex.build(new_cards), ReloadDiff(full_rebuild=True)
+
+        removed = [pos for card_number, pos in self.positions.items() if card_number not in new_positions]
+        changed: list[tuple[int, CardData]] = []
+        added: list[CardData] = []
+        for card in new_cards:
+            pos = self.positions.get(card["card_number"])
+            if pos is None:
+                added.append(card)
+            elif self.cards[pos] != card:
+                changed.append((pos, card))
+
+        diff = ReloadDiff(added=len(added), changed=len(changed), removed=len(removed))
+        if diff.is_empty:
+            return self, diff
+
+        dead = len(self.cards) - self.alive_mask.bit_count() + len(removed)
+        if dead > MAX_TOMBSTONE_RATIO * (len(self.cards) + len(added)):
+            diff.full_rebuild = True
+            return CardIndex.build(new_cards), diff
+
+        index = CardIndex()
+        index.cards = list(self.cards)
+        index.records = list(self.records)
+        index.positions = dict(self.positions)
+        index.id_map = dict(self.id_map)
+        # Extended on a copy; existing codes stay valid, so unchanged records are shared
+        index.tables = copy_tables(self.tables)
+
+        new_entries = [(pos, CardRecord(card, index.tables)) for pos, card in changed]
+        for card in added:
+            new_entries.append((len(index.cards), CardRecord(card, index.tables)))
+            index.cards.append(card)
+            index.records.append(new_entries[-1][1])
+        old_entries = [(pos, self.records[pos]) for pos in removed] + [(pos, self.records[pos]) for pos, _ in changed]
+        size = len(index.cards)
+
+        for _pos, record in old_entries:
+            key = normalized_id(record.card, warn=False)
+            if key and index.id_map.get(key) is record.card:
+                del index.id_map[key]
+        for pos in removed:
+            del index.positions[self.cards[pos]["card_number"]]
+        for pos, record in new_entries:
+            index.cards[pos] = record.card
+            index.records[pos] = record
+            index.positions[record.card["card_number"]] = pos
+            key = normalized_id(record.card)
+            if key:
+                index.id_map[key] = record.card
+
+        removed_mask = 0
+        for pos in removed:
+            removed_mask |= 1 << pos
+        index.alive_mask = (self.alive_mask & ~removed_mask) | (((1 << size) - 1) ^ ((1 << len(self.cards)) - 1))
+
+        old_postings = _collect_postings(old_entries)
+        new_postings = _collect_postings(new_entries)
+        index.postings = {
+            name: self.postings[name].updated(old_postings[name], new_postings[name]) for name in POSTING_FIELDS
+        }
+        column_changes: list[tuple[int, CardRecord | None]] = [(pos, None) for pos in removed]
+        column_changes.extend(new_entries)
+        index.columns = self.columns.updated(column_changes, size)
+        index.text_ngrams = self.text_ngrams.updated(
+            [(pos, _search_text(record)) for pos, record in old_entries],
+            [(pos, _search_text(record)) for pos, record in new_entries],
+            size,
+        )
+
+        index._finish()
+        return index, diff
+
+    def _finish(self) -> None:
+        """Derives the ID tree, keyword indices and query planner from the built structures."""
+        self.id_tree = {}
+        for key in self.id_map:
+            series, product, number, rarity = key.split("-")
+            self.id_tree.setdefault(series, {}).setdefault(product, {}).setdefault(number, set()).add(rarity)
+
+        live_cards = [self.cards[pos] for pos in iter_positions(self.alive_mask)]
+        units = {card.get("unit") for card in live_cards}
+        groups = {group for card in live_cards for group in card.get("group") or []}
+        aliases = keyword_aliases(
+            units=sorted(unit for unit in units if unit),
+            groups=sorted(group for group in groups if group),
+        )
+        self.keyword_aliases = AliasIndex(aliases)
+        names = {card.get("name") for card in live_cards}
+        self.keyword_fuzzy = FuzzyIndex(
+            aliases + [(name, AliasEntry(f"Card: {name}", name)) for name in sorted(names) if name]
+        )
+
+        self._build_planner()
+
+    def completions(self, context: tuple[str | None, ...] = ()) -> AutocompleteIndex:
+        """
+        Autocomplete index for the ID component following `context`, the values
+        of the components before it (series, then product, then number; None
+        where not given). E.g. `("PL!N", None)` completes the numbers of all
+        PL!N products. Only values of existing cards under the context are offered.
+        """
+        index = self._completions.get(context)
+        if index is not None:
+            return index
+
+        nodes: list[Mapping | set] = [self.id_tree]
+        for value in context:
+            children: list[Mapping | set] = []
+            for node in nodes:
+                if not isinstance(node, Mapping):
+                    continue
+                if value is None:
+                    children.extend(node.values())
+                elif value in node:
+                    children.append(node[value])
+            nodes = children
+
+        index = AutocompleteIndex(value for node in nodes for value in node)
+        # Contexts naming unknown values come from free-form user input; don't let them grow the memo
+        if nodes:
+            self._completions[context] = index
+        return index
+
+    def _build_planner(self) -> None:
+        self.planner = QueryPlanner(
+            self.records, self.postings, self.columns, self.text_ngrams, self.tables, self.alive_mask
+        )
+
+    def __getstate__(self) -> dict:
+        # The planner and completions only hold caches over the other fields; they are rebuilt when unpickled
+        state = self.__dict__.copy()
+        del state["planner"]
+        del state["_completions"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._completions = {}
+        self._build_planner()
+
+    def __len__(self) -> int:
+        """Number of live cards."""
+        return self.alive_mask.bit_count()
@@ -0,0 +1,93 @@
+from src.db.models import CardData
+from src.db.value_table import ValueTables, new_tables, table_key
+from src.utils.text import normalize_text
+
+# Fixed slot order for heart vectors (heart0 is Gray)
+HEART_COLORS = ("heart01", "heart02", "heart03", "heart04", "heart05", "heart06", "heart0")
+HEART_INDEX = {color_key: i for i, color_key in enumerate(HEART_COLORS)}
+
+# Separator for joined search text; cannot appear in user queries, so matches never span fields
+FIELD_SEP = "\x00"
+
+
+def _code(tables: ValueTables, field: str, value: str | None) -> int | None:
+    return tables[field].code(table_key(field, value)) if value else None
+
+
+def _to_int(val: str | None) -> int | None:
+    if not val:
+        return None
+    try:
+        return int(val)
+    except ValueError:
+        return None
+
+
+class CardRecord:
+    """
+    Search-ready form of a card, precomputed once at load time.
+    The raw `card` dict is kept only for embed rendering and results.
+    Repeated categorical values are stored as integer codes into the index's
+    shared value tables (see src/db/value_table.py).
+    """
+
+    __slots__ = (
+        "card",
+        "name_norm",
+        "keyword_norm",
+        "card_number_norm",
+        "info_text_norm",
+        "cost",
+        "blades",
+        "score",
+        "heart_totals",
+        "rarity_code",
+        "card_type_code",
+        "unit_code",
+        "group_codes",
+        "blade_heart_codes",
+    )
+
+    def __init__(self, card: CardData, tables: ValueTables | None = None):
+        self.card = card
+        if tables is None:
+            tables = new_tables()
+
+        name = card.get("name", "")
+        unit = card.get("unit") or ""
+        groups = card.get("group") or []
+
+        # Text fields in normalized form (see normalize_text), matched against normalized queries
+        self.name_norm: str = normalize_text(name)
+        # Name, unit and groups joined for the combined keyword search
+        self.keyword_norm: str = FIELD_SEP.join(normalize_text(part) for part in [name, unit, *groups])
+        self.card_number_norm: str = normalize_text(card.get("card_number", ""))
+        self.info_text_norm: str = FIELD_SEP.join(normalize_text(line) for line in card.get("info_text") or [])
+
+        self.cost: int | None = _to_int(card.get("cost"))
+        self.blades: int | None = _to_int(card.get("blades"))
+        self.score: int | None = _to_int(card.get("score"))
+        self.heart_totals: tuple[int, ...] = self._build_heart_totals(card)
+
+        # Codes of the exact-match filter values (None when the card has no value)
+        self.rarity_code: int | None = _code(tables, "rarity", card.get("rarity"))
+        self.card_type_code: int | None = _code(tables, "card_type", card.get("card_type"))
+        self.unit_code: int | None = _code(tables, "unit", unit)
+        self.group_codes: tuple[int, ...] = tuple(tables["group"].code(table_key("group", g)) for g in groups if g)
+        self.blade_heart_codes: tuple[int, ...] = tuple(
+            tables["blade_hearts"].code(key) for key in card.get("blade_hearts") or {}
+        )
+
+    @staticmethod
+    def _build_heart_totals(card: CardData) -> tuple[int, ...]:
+        """Per-color totals of `hearts` + `required_hearts`, in HEART_COLORS order."""
+        card_hearts = card.get("hearts") or {}
+        card_req_hearts = card.get("required_hearts") or {}
+        totals = []
+        for color_key in HEART_COLORS:
+            try:
+                total = int(card_hearts.get(color_key, "0")) + int(card_req_hearts.get(color_key, "0"))
+            except ValueError:
+                total = 0
+            totals.append(total)
+        return tuple(totals)
@@ -1,84 +1,147 @@
 import json
 import logging
+import os
+import time
+import unicodedata
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from typing import Optional, TypedDict
 
-from src.utils.parsing import parse_range_string
+from src.db import snapshot
+from src.db.alias_index import AliasEntry
+from src.db.autocomplete_index import MAX_CHOICES
+from src.db.card_index import CardIndex, ReloadDiff
+from src.db.deck import Deck, build_deck
+from src.db.deck_stats import DeckStats, compute_deck_stats, member_heart_totals
+from src.db.json_stream import iter_root_list_items
+from src.db.live_matcher import playable_lives
+from src.db.models import CardData, CardID
+from src.db.query_planner import QueryExplanation, filter_signature
+from src.db.search_cache import SearchCache
+from src.db.search_result import SearchResult
+from src.db.value_table import intern_card
+from src.utils.text import normalize_text
+
+__all__ = ["CardData", "CardID", "CardRepository", "LoadMetrics"]
 
 _log = logging.getLogger(__name__)
 
 
-class CardData(TypedDict):
-    card_number: str
-    img_url: str
-    name: str
-    set: str
-    card_type: str
-    group: list[str]
-    unit: str | None
-    rarity: str
-    # Optional fields depending on card type
-    score: str | None
-    cost: str | None
-    blades: str | None
-    hearts: dict[str, str] | None
-    required_hearts: dict[str, str] | None
-    blade_hearts: dict[str, str] | None
-    special_hearts: str | None
-    info_text: list[str] | None
-
-
 @dataclass
-class CardID:
-    series: str
-    product: str
-    number: str
-    rarity: str
-
-    @classmethod
-    def parse(cls, card_number: str) -> Optional["CardID"]:
-        # Normalize: convert fullwidth + to ascii +
-        normalized_number = card_number.replace("＋", "+")
-
-        parts = normalized_number.split("-")
-        if len(parts) != 4:
-            return None
+class LoadMetrics:
+    """Boot-time breakdown of the last `load_data` call."""
 
-        return cls(series=parts[0], product=parts[1], number=parts[2], rarity=parts[3])
+    source: str  # "snapshot" or "json"
+    cards: int
+    read_seconds: float  # Reading and hashing the source file
+    build_seconds: float  # Snapshot load, or JSON parse + index build
+    snapshot_write_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.read_seconds + self.build_seconds + self.snapshot_write_seconds
 
 
 class CardRepository:
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, search_cache_size: int = 256, snapshot_path: str | None = None):
         self.data_path = data_path
+        # Binary snapshot of the parsed cards + built index, reused while the source is unchanged
+        self.snapshot_path = snapshot_path if snapshot_path is not None else f"{data_path}.snapshot"
+        self.load_metrics: LoadMetrics | None = None
+        # Bumped every time a new index is swapped in (i.e. on each load or reload)
+        self.generation = 0
+        # Card data as last read from data_path
         self._cards: list[CardData] = []
 
-        # Indices for efficient lookup and autocomplete (stored as sorted lists)
-        self._series_index: list[str] = []
-        self._product_index: list[str] = []
-        self._number_index: list[str] = []
-        self._rarity_index: list[str] = []
+        # All lookup/search structures. Replaced wholesale (never mutated), so every
+        # reader sees one consistent version even while a reload is being prepared.
+        self._index = CardIndex()
+
+        # mtime of data_path when it was last read, for change detection
+        self._source_mtime_ns: int | None = None
 
-        # Main lookup map: "series-product-number-rarity" (normalized) -> CardData
-        self._id_map: dict[str, CardData] = {}
+        # LRU of search results keyed by canonical filters, invalidated per generation
+        self.search_cache = SearchCache(search_cache_size)
 
     def load_data(self) -> None:
+        """
+        Loads the card data, from the snapshot if it was built from the current
+        source file, otherwise by parsing the JSON and building the indices
+        (and then writing a fresh snapshot).
+        """
+        start = time.perf_counter()
+        self._source_mtime_ns = self._stat_source()
+        digest = self._source_digest()
+        read_done = time.perf_counter()
+
+        loaded = snapshot.read_snapshot(self.snapshot_path, digest) if self.snapshot_path else None
+        if loaded:
+            self._cards, index = loaded
+            self._swap_index(index)
+            build_done = time.perf_counter()
+            metrics = LoadMetrics("snapshot", len(self._cards), read_done - start, build_done - read_done)
+        else:
+            # Cards go straight from the parser into the index; no full JSON tree is held
+            index = CardIndex.build(self._iter_cards())
+            self._cards = index.cards
+            self._swap_index(index)
+            build_done = time.perf_counter()
+            self._write_snapshot(digest)
+            metrics = LoadMetrics(
+                "json",
+                len(self._cards),
+                read_done - start,
+                build_done - read_done,
+                time.perf_counter() - build_done,
+            )
+
+        self.load_metrics = metrics
+        _log.info(
+            f"Loaded {metrics.cards} cards from {self.data_path} via {metrics.source} "
+            f"in {metrics.total_seconds * 1000:.1f} ms (read {metrics.read_seconds * 1000:.1f} ms, "
+            f"build {metrics.build_seconds * 1000:.1f} ms, "
+            f"snapshot write {metrics.snapshot_write_seconds * 1000:.1f} ms)"
+        )
+
+    def _write_snapshot(self, digest: bytes) -> None:
+        if not self.snapshot_path:
+            return
         try:
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
+            size = snapshot.write_snapshot(self.snapshot_path, digest, self._cards, self._index)
+        except OSError as e:
+            # A read-only data directory only costs the fast path on the next boot
+            _log.warning(f"Could not write snapshot {self.snapshot_path}: {e}")
+            return
+        _log.info(f"Wrote {size} byte snapshot to {self.snapshot_path}")
+
+    def _stat_source(self) -> int | None:
+        try:
+            return os.stat(self.data_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
-            # The JSON structure has a root key, typically "PBN" or similar lists.
-            # Based on the user's file content, it looks like {"PBN": [...]}.
-            # We should flatten all lists found in the root object.
+    def _source_digest(self) -> bytes:
+        try:
+            return snapshot.source_digest(self.data_path)
+        except FileNotFoundError:
+            _log.error(f"Card data file not found at {self.data_path}")
+            raise
 
-            all_cards = []
-            for key, card_list in raw_data.items():
-                if isinstance(card_list, list):
-                    all_cards.extend(card_list)
+    def _read_cards(self) -> list[CardData]:
+        return list(self._iter_cards())
 
-            self._cards = all_cards
-            self._build_indices()
-            _log.info(f"Loaded {len(self._cards)} cards from {self.data_path}")
+    def _iter_cards(self) -> Iterator[CardData]:
+        """
+        Streams the cards from data_path one at a time.
 
+        The JSON structure has a root key, typically "PBN" or similar lists
+        (e.g. {"PBN": [...]}); the items of all lists in the root object are yielded.
+        Repeated short values (rarity, set, heart counts, ...) are interned, so
+        all cards share one copy of each.
+        """
+        try:
+            with open(self.data_path, "r", encoding="utf-8") as f:
+                for card in iter_root_list_items(f):
+                    yield intern_card(card)
         except FileNotFoundError:
             _log.error(f"Card data file not found at {self.data_path}")
             raise
@@ -87,72 +150,134 @@ class CardRepository:
             raise
 
     def _build_indices(self) -> None:
-        # Temporary sets to collect unique values
-        series_set: set[str] = set()
-        product_set: set[str] = set()
-        number_set: set[str] = set()
-        rarity_set: set[str] = set()
-
-        self._id_map.clear()
-
-        for card in self._cards:
-            card_number = card.get("card_number", "")
-            if not card_number:
-                continue
+        self._swap_index(CardIndex.build(self._cards))
 
-            parsed_id = CardID.parse(card_number)
-            if not parsed_id:
-                _log.warning(f"Skipping malformed card number: {card_number}")
-                continue
+    def _swap_index(self, index: CardIndex) -> None:
+        self._index = index
+        self.generation += 1
 
-            # Store unique parts for autocomplete
-            series_set.add(parsed_id.series)
-            product_set.add(parsed_id.product)
-            number_set.add(parsed_id.number)
-            rarity_set.add(parsed_id.rarity)
+    # --- Hot reload ---
 
-            # Map normalized ID string to card data
-            # Reconstruct ID with ASCII + for consistent lookup key
-            normalized_key = f"{parsed_id.series}-{parsed_id.product}-{parsed_id.number}-{parsed_id.rarity}"
-            self._id_map[normalized_key] = card
+    def source_changed(self) -> bool:
+        """True if data_path was modified since it was last read (a stat call; run off the event loop)."""
+        return self._stat_source() != self._source_mtime_ns
 
-        # Convert sets to sorted lists for efficient autocomplete
-        self._series_index = sorted(list(series_set))
-        self._product_index = sorted(list(product_set))
-        self._number_index = sorted(list(number_set))
-        self._rarity_index = sorted(list(rarity_set))
+    def prepare_reload(self) -> tuple[list[CardData], CardIndex, ReloadDiff, int | None]:
+        """
+        Reads data_path and builds the next index incrementally from the current one.
+        Does not modify the repository, so it is safe to run in a worker thread.
+        """
+        mtime_ns = self._stat_source()
+        cards = self._read_cards()
+        index, diff = self._index.updated(cards)
+        return cards, index, diff, mtime_ns
+
+    def apply_reload(self, prepared: tuple[list[CardData], CardIndex, ReloadDiff, int | None]) -> ReloadDiff:
+        """Swaps in a prepared index. Must run on the event loop thread."""
+        cards, index, diff, mtime_ns = prepared
+        self._cards = cards
+        self._source_mtime_ns = mtime_ns
+        if index is not self._index:
+            self._swap_index(index)
+            _log.info(
+                f"Reloaded {len(index)} cards from {self.data_path}: +{diff.added} ~{diff.changed} -{diff.removed}"
+                f"{' (full rebuild)' if diff.full_rebuild else ''}"
+            )
+        return diff
+
+    @property
+    def cards(self) -> list[CardData]:
+        """Card data as last (re)loaded."""
+        return self._cards
 
     def get_card(self, series: str, product: str, number: str, rarity: str) -> CardData | None:
         """
         Retrieves a card by its components.
         Inputs are expected to be potentially user-typed (checking normalization).
         """
-        # Ensure input rarity is normalized
-        rarity = rarity.replace("＋", "+")
-        key = f"{series}-{product}-{number}-{rarity}"
-        return self._id_map.get(key)
+        # Normalize width like the stored keys (e.g. fullwidth "＋" in rarities)
+        key = unicodedata.normalize("NFKC", f"{series}-{product}-{number}-{rarity}")
+        return self._index.id_map.get(key)
+
+    def get_cards(self, card_ids: Iterable[str]) -> list[CardData | None]:
+        """
+        Bulk lookup of full card IDs (e.g. "PL!N-bp4-032-L+"), in input order.
+        IDs are width-normalized like `get_card`, and numeric card numbers are
+        zero-padded ("PL!N-bp4-32-L+" finds 032). Malformed or unknown IDs give None.
+        """
+        # One index version for the whole batch, even if a reload swaps it meanwhile
+        id_map = self._index.id_map
+        cards: list[CardData | None] = []
+        for card_id in card_ids:
+            parsed_id = CardID.parse(card_id.strip())
+            if parsed_id is None:
+                cards.append(None)
+                continue
+            number = parsed_id.number.zfill(3) if parsed_id.number.isdigit() else parsed_id.number
+            cards.append(id_map.get(f"{parsed_id.series}-{parsed_id.product}-{number}-{parsed_id.rarity}"))
+        return cards
+
+    def resolve_deck(self, lines: str | Iterable[str]) -> Deck:
+        """Parses a deck list ("PL!N-bp4-032-L+ x4" per line) and resolves its cards (see build_deck)."""
+        return build_deck(lines, self.get_cards)
+
+    def deck_stats(self, deck: Deck) -> DeckStats:
+        """Cost curve, heart, blade and trigger totals of a resolved deck (see compute_deck_stats)."""
+        return compute_deck_stats(self._index, deck)
+
+    def playable_lives(self, deck: Deck) -> tuple[dict[str, int], SearchResult]:
+        """Hearts of the deck's members and the Live cards they can clear (see live_matcher)."""
+        index = self._index
+        hearts = member_heart_totals(index, deck)
+        return hearts, playable_lives(index, hearts)
+
+    # --- Autocomplete ---
+    # Each component is completed within the components already chosen (None = any),
+    # so only values leading to an existing card are suggested.
 
     def search_series(self, query: str) -> list[str]:
-        return self._search_index(self._series_index, query)
+        return self._index.completions(()).search(query)
 
-    def search_product(self, query: str) -> list[str]:
-        return self._search_index(self._product_index, query)
+    def search_product(self, query: str, series: str | None = None) -> list[str]:
+        return self._index.completions((series,)).search(query)
 
-    def search_number(self, query: str) -> list[str]:
-        return self._search_index(self._number_index, query)
+    def search_number(self, query: str, series: str | None = None, product: str | None = None) -> list[str]:
+        return self._index.completions((series, product)).search(query)
 
-    def search_rarity(self, query: str) -> list[str]:
-        return self._search_index(self._rarity_index, query)
+    def search_rarity(
+        self, query: str, series: str | None = None, product: str | None = None, number: str | None = None
+    ) -> list[str]:
+        return self._index.completions((series, product, number)).search(query)
 
-    def _search_index(self, index: list[str], query: str) -> list[str]:
-        """Case-insensitive partial match for autocomplete using pre-sorted list."""
-        query = query.lower()
-        # Since 'index' is already sorted, we don't need to sort again.
-        # We just filter the list.
-        matches = [val for val in index if query in val.lower()]
-        return matches[:25]  # Discord limit is 25 choices
+    def search_keyword_aliases(self, query: str) -> list[AliasEntry]:
+        """
+        Characters, units and groups matching `query` for keyword autocomplete.
+        If nothing contains `query`, close spellings (including card names) are suggested instead.
+        """
+        entries = self._index.keyword_aliases.search(query)
+        return entries or self.suggest_keywords(query)
+
+    def suggest_keywords(self, query: str, limit: int = MAX_CHOICES) -> list[AliasEntry]:
+        """Aliases and card names within a few typos of `query`, closest first (one entry per value)."""
+        suggestions: dict[str, AliasEntry] = {}
+        for _, entry in self._index.keyword_fuzzy.lookup(query):
+            suggestions.setdefault(entry.value, entry)
+            if len(suggestions) == limit:
+                break
+        return list(suggestions.values())
 
-    def search_cards(
+    def _corrected_keyword(self, keyword: str) -> str | None:
+        """Best fuzzy correction of a keyword that matched nothing, or None."""
+        for entry in self.suggest_keywords(keyword):
+            if normalize_text(entry.value) != normalize_text(keyword):
+                return entry.value
+        return None
+
+    def explain(self, filters: dict) -> QueryExplanation:
+        """Shows the plan chosen for `filters` with per-stage row counts (for tuning)."""
+        return self._index.planner.explain(filters)
+
+    def search(
         self,
         query: str | None = None,
         # Legacy arguments for backward compatibility (mapped to filters internally if needed)
@@ -162,10 +287,9 @@ class CardRepository:
         rarity: str | None = None,
         # New advanced filters
         filters: dict | None = None,
-        limit: int = 25,
-    ) -> list[CardData]:
+    ) -> SearchResult:
         """
-        Searches for cards based on various filters.
+        Searches for cards based on various filters and returns a lazy result handle.
         Supports both legacy individual arguments and a comprehensive `filters` dict.
 
         filters dict keys:
@@ -176,6 +300,8 @@ class CardRepository:
             - card_type: str (Member, Live, etc.)
             - hearts: dict { color_key: operator_val } (e.g. {'heart01': '>=2'})
             - blade_hearts: list[str] (OR logic: requires at least one)
+
+        `len(result)` is the exact number of matches; slicing materializes only that page.
         """
         # Normalize inputs
         filters = filters or {}
@@ -192,171 +318,42 @@ class CardRepository:
         if query:
             filters.setdefault("query", query)  # Maps to legacy "query" logic (Name search)
 
-        # Extraction for cleaner loop
-        f_char = filters.get("character")
-        f_unit = filters.get("unit")
-        f_group = filters.get("group")
-        f_rarity = filters.get("rarity")
-        f_query = filters.get("query")  # Legacy Name-only search
-
-        f_text_query = filters.get("text_query")  # Advanced Text search (Name + Info)
-        f_keyword = filters.get("keyword")  # General Keyword search (Name/Unit/Group)
-
         _log.info(f"Searching cards with filters: {filters}")
-        f_card_number = filters.get("card_number")
-        f_card_type = filters.get("card_type")
-
-        f_cost_min = filters.get("cost_min")
-        f_cost_max = filters.get("cost_max")
-        f_blades_min = filters.get("blades_min")
-        f_blades_max = filters.get("blades_max")
-
-        f_hearts = filters.get("hearts")  # Dict { 'heart01': '>=1' }
-        f_blade_hearts = filters.get("blade_hearts")  # List ['b_heart01', ...]
-
-        # Normalize rarity
-        if f_rarity:
-            f_rarity = f_rarity.replace("＋", "+")
-
-        results = []
-        for card in self._cards:
-            # --- 1. Basic String Filters ---
-            if f_rarity and card.get("rarity") != f_rarity:
-                continue
-
-            # Keyword Search (Name OR Unit OR Group)
-            if f_keyword:
-                kw = f_keyword.lower()
-                c_name = card.get("name", "").lower()
-                c_unit = (card.get("unit") or "").lower()
-                c_group = [g.lower() for g in card.get("group", [])]
-
-                # Check if keyword is in any valid field
-                matched_keyword = kw in c_name or kw in c_unit or any(kw in g for g in c_group)
-                if not matched_keyword:
-                    continue
-
-            # Character (Name segment) - Normalized
-            if f_char:
-                norm_char = f_char.replace(" ", "")
-                norm_card_name = card.get("name", "").replace(" ", "")
-                if norm_char not in norm_card_name:
-                    continue
-
-            # Unit (Precise)
-            if f_unit and card.get("unit") != f_unit:
-                continue
-
-            # Group (List containment)
-            if f_group and f_group not in card.get("group", []):
-                continue
-
-            # Legacy Query (Name only)
-            if f_query and f_query.lower() not in card.get("name", "").lower():
-                continue
 
-            # --- 2. Advanced Filters ---
+        signature = filter_signature(filters)
+        result = self.search_cache.get(signature, self.generation)
+        if result is None:
+            planner = self._index.planner
+            result = planner.execute(planner.compile(filters))
+
+            # Fall back to the closest known name/alias when a (likely mistyped) keyword matches nothing.
+            # Only the keyword on its own decides: an empty result caused by the other filters is kept.
+            keyword = filters.get("keyword")
+            if keyword and not result and not planner.execute(planner.compile({"keyword": keyword})):
+                corrected = self._corrected_keyword(keyword)
+                if corrected:
+                    _log.info(f"Keyword '{keyword}' matched nothing; retrying as '{corrected}'")
+                    result = planner.execute(planner.compile({**filters, "keyword": corrected}))
+                    result.corrected_keyword = corrected
+
+            self.search_cache.put(signature, self.generation, result)
+        return result
 
-            # Card Number (Partial)
-            if f_card_number and f_card_number.lower() not in card.get("card_number", "").lower():
-                continue
-
-            # Card Type (Exact)
-            if f_card_type and f_card_type != card.get("card_type"):
-                continue
-
-            # Text Query (Name OR Info Text)
-            if f_text_query:
-                q_lower = f_text_query.lower()
-                in_name = q_lower in card.get("name", "").lower()
-                in_info = False
-                info_text = card.get("info_text")
-                if info_text:
-                    # info_text is list of strings
-                    in_info = any(q_lower in line.lower() for line in info_text)
-
-                if not (in_name or in_info):
-                    continue
-
-            # Numeric Ranges (Helper)
-            def check_range(val_str: str | None, min_v: int | None, max_v: int | None) -> bool:
-                if not val_str:
-                    return False
-                try:
-                    val = int(val_str)
-                    if min_v is not None and val < min_v:
-                        return False
-                    return not (max_v is not None and val > max_v)
-                except ValueError:
-                    return False  # Treat non-int as mismatch
-
-            if (f_cost_min is not None or f_cost_max is not None) and not check_range(
-                card.get("cost"), f_cost_min, f_cost_max
-            ):
-                continue
-
-            if (f_blades_min is not None or f_blades_max is not None) and not check_range(
-                card.get("blades"), f_blades_min, f_blades_max
-            ):
-                continue
-
-            # Hearts Logic
-            # "hearts" field in DB for Members (Base Hearts). "required_hearts" for Lives.
-            # "hearts" mechanism checks if card has the required amount of hearts of a specific color.
-            if f_hearts:
-                card_hearts = card.get("hearts") or {}
-                card_req_hearts = card.get("required_hearts") or {}
-
-                match_failed = False
-                for color_key, val_expr in f_hearts.items():
-                    # val_expr can be int (legacy) or str range (e.g. "2+")
-                    min_v, max_v = None, None
-
-                    if isinstance(val_expr, int):
-                        min_v = val_expr
-                    else:
-                        min_v, max_v = parse_range_string(str(val_expr))
-
-                    # Calculate total hearts on card for this color
-                    try:
-                        val_c = int(card_hearts.get(color_key, "0"))
-                        val_r = int(card_req_hearts.get(color_key, "0"))
-                    except ValueError:
-                        val_c, val_r = 0, 0
-
-                    total_card_val = val_c + val_r
-
-                    if min_v is not None and total_card_val < min_v:
-                        match_failed = True
-                        break
-                    if max_v is not None and total_card_val > max_v:
-                        match_failed = True
-                        break
-
-                if match_failed:
-                    continue
-
-            # Blade Hearts Logic (OR Logic)
-            # f_blade_hearts = ['b_heart01', 'ALL1']
-            if f_blade_hearts:
-                card_b_hearts = card.get("blade_hearts") or {}
-                # Check if card has ANY of the requested keys
-                # card_b_hearts keys: "b_heart01", "ALL1"
-
-                has_any = False
-                for req_k in f_blade_hearts:
-                    if req_k in card_b_hearts:
-                        has_any = True
-                        break
-
-                if not has_any:
-                    continue
-
-            results.append(card)
-            if len(results) >= limit:
-                break
+    def search_cards(
+        self,
+        query: str | None = None,
+        character: str | None = None,
+        unit: str | None = None,
+        group: str | None = None,
+        rarity: str | None = None,
+        filters: dict | None = None,
+        limit: int = 25,
+    ) -> list[CardData]:
+        """Searches for cards (see `search`) and returns the first `limit` matches as a list."""
+        result = self.search(query=query, character=character, unit=unit, group=group, rarity=rarity, filters=filters)
+        results = result[:limit]
 
         _log.info(
             f"Standard Search Results: Found {len(results)} cards. IDs: {[c.get('card_number') for c in results[:20]]}"
         )
-        return results[:limit]
+        return results
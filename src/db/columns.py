@@ -0,0 +1,100 @@
+from array import array
+from collections.abc import Iterable, Sequence
+
+from src.db.bitset import from_positions, update_postings
+from src.db.card_record import HEART_COLORS, HEART_INDEX, CardRecord
+
+# Stored in place of missing / non-int values; real card stats are never negative
+MISSING = -1
+
+NUMERIC_COLUMNS = ("cost", "blades", "score")
+# Sum of all heart columns of a card
+HEARTS_TOTAL = "hearts_total"
+COLUMN_NAMES = NUMERIC_COLUMNS + HEART_COLORS + (HEARTS_TOTAL,)
+
+
+def _column_value(record: CardRecord, name: str) -> int:
+    if name in HEART_INDEX:
+        return record.heart_totals[HEART_INDEX[name]]
+    if name == HEARTS_TOTAL:
+        return sum(record.heart_totals)
+    value = getattr(record, name)
+    return MISSING if value is None else value
+
+
+class CardColumns:
+    """
+    Columnar store of the numeric card stats, built once at load time.
+
+    Each column is an int16 array parallel to the card list, and the heart
+    columns (one per entry of HEART_COLORS) form an N x 7 heart matrix,
+    with their row sums in the HEARTS_TOTAL column.
+    For every distinct value of a column a bitset of the cards holding it is
+    kept, so a range predicate is answered for the whole corpus at once by
+    OR-ing the value bitsets inside the range.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._columns: dict[str, array] = {}
+        self._value_masks: dict[str, dict[int, int]] = {}
+
+    @classmethod
+    def build(cls, records: Sequence[CardRecord]) -> "CardColumns":
+        columns = cls()
+        columns.size = len(records)
+
+        for name in COLUMN_NAMES:
+            columns._add_column(name, array("h", (_column_value(record, name) for record in records)))
+        return columns
+
+    def updated(self, changes: Iterable[tuple[int, CardRecord | None]], size: int) -> "CardColumns":
+        """
+        New columns with the records at the given positions replaced.
+        A `None` record removes the position; positions past the current end are appended.
+        """
+        changes = list(changes)
+        columns = CardColumns()
+        columns.size = size
+        for name in COLUMN_NAMES:
+            values = array("h", self._columns[name])
+            values.extend([MISSING] * (size - len(values)))
+            removed: dict[int, list[int]] = {}
+            added: dict[int, list[int]] = {}
+            for pos, record in changes:
+                old_value = values[pos]
+                new_value = MISSING if record is None else _column_value(record, name)
+                if old_value == new_value:
+                    continue
+                if old_value != MISSING:
+                    removed.setdefault(old_value, []).append(pos)
+                if new_value != MISSING:
+                    added.setdefault(new_value, []).append(pos)
+                values[pos] = new_value
+            columns._columns[name] = values
+            columns._value_masks[name] = update_postings(self._value_masks[name], removed, added)
+        return columns
+
+    def _add_column(self, name: str, values: array) -> None:
+        self._columns[name] = values
+        positions: dict[int, array] = {}
+        for pos, value in enumerate(values):
+            if value != MISSING:
+                positions.setdefault(value, array("i")).append(pos)
+        self._value_masks[name] = {value: from_positions(pos_list, self.size) for value, pos_list in positions.items()}
+
+    def column(self, name: str) -> array:
+        """Raw int16 column (MISSING where the card has no value)."""
+        return self._columns[name]
+
+    def value_masks(self, name: str) -> dict[int, int]:
+        """Distinct value of `name` -> bitset of the cards holding it (missing values excluded)."""
+        return self._value_masks.get(name, {})
+
+    def range_mask(self, name: str, min_v: int | None, max_v: int | None) -> int:
+        """Bitset of cards whose `name` value lies in [min_v, max_v]; missing values never match."""
+        mask = 0
+        for value, bits in self._value_masks.get(name, {}).items():
+            if (min_v is None or value >= min_v) and (max_v is None or value <= max_v):
+                mask |= bits
+        return mask
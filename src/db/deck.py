@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+from src.db.models import CardData
+
+# One entry per line: an ID with four dash-separated parts ("PL!N-bp4-032-L+", see CardID.parse)
+# and an optional quantity before or after it ("4", "x4", "4x", "×4", "*4")
+_QUANTITY = r"[x×*]?(\d+)[x×*]?"
+_ENTRY = re.compile(rf"(?:{_QUANTITY}\s+)?([^\s-]+-[^\s-]+-[^\s-]+-[^\s-]+)(?:\s+{_QUANTITY})?", re.IGNORECASE)
+
+# Lines starting with these are comments (e.g. section headers such as "# Lives")
+_COMMENT_PREFIXES = ("#", "//")
+
+
+@dataclass
+class DeckEntry:
+    card: CardData
+    quantity: int
+
+
+@dataclass
+class Deck:
+    # Resolved cards in the order they first appear in the list
+    entries: list[DeckEntry] = field(default_factory=list)
+    # IDs as written that match no card -> quantity
+    unknown: dict[str, int] = field(default_factory=dict)
+    # Lines that are neither entries, comments nor blank
+    invalid: list[str] = field(default_factory=list)
+
+    @property
+    def total_cards(self) -> int:
+        return sum(entry.quantity for entry in self.entries)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.unknown and not self.invalid
+
+
+def parse_deck_line(line: str) -> tuple[str, int] | None:
+    """
+    (card ID, quantity) of one deck list line such as "PL!N-bp4-032-L+ x4",
+    "4 PL!N-bp4-032-L+" or a bare ID (quantity 1). None if the line is not an entry.
+    """
+    # Width-normalized, so fullwidth IDs and "ｘ４" parse too
+    return _parse_normalized(unicodedata.normalize("NFKC", line).strip())
+
+
+def _parse_normalized(line: str) -> tuple[str, int] | None:
+    match = _ENTRY.fullmatch(line)
+    if not match:
+        return None
+    before, card_id, after = match.groups()
+    if before is not None and after is not None:
+        return None
+    quantity = int(before or after or 1)
+    return (card_id, quantity) if quantity else None
+
+
+def build_deck(lines: str | Iterable[str], get_cards: Callable[[Sequence[str]], Sequence[CardData | None]]) -> Deck:
+    """
+    Parses a pasted deck list line by line and resolves it with one bulk
+    `get_cards` call (see CardRepository.get_cards). Quantities of repeated
+    entries, including differently written IDs of the same card, are added up.
+    """
+    if isinstance(lines, str):
+        # Normalizing the whole paste at once is much cheaper than line by line
+        lines = unicodedata.normalize("NFKC", lines).splitlines()
+    else:
+        lines = (unicodedata.normalize("NFKC", line) for line in lines)
+
+    deck = Deck()
+    quantities: dict[str, int] = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith(_COMMENT_PREFIXES):
+            continue
+        parsed = _parse_normalized(stripped)
+        if parsed is None:
+            deck.invalid.append(stripped)
+            continue
+        card_id, quantity = parsed
+        quantities[card_id] = quantities.get(card_id, 0) + quantity
+
+    entries: dict[str, DeckEntry] = {}
+    for (card_id, quantity), card in zip(quantities.items(), get_cards(list(quantities)), strict=True):
+        if card is None:
+            deck.unknown[card_id] = quantity
+        elif card["card_number"] in entries:
+            entries[card["card_number"]].quantity += quantity
+        else:
+            entries[card["card_number"]] = DeckEntry(card, quantity)
+    deck.entries = list(entries.values())
+    return deck
@@ -0,0 +1,110 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from src.db.card_index import CardIndex
+from src.db.card_record import HEART_COLORS
+from src.db.columns import CardColumns
+from src.db.deck import Deck
+
+# Blade heart trigger -> blade_hearts keys counted for it
+TRIGGER_KEYS = {
+    "Draw": ("ドロー",),
+    "Score": ("スコア",),
+    "ALL": ("ALL1", "ALL2"),
+}
+
+# quantity -> bitset of the deck's cards held in that many copies
+QuantityMasks = dict[int, int]
+
+
+@dataclass
+class DeckStats:
+    total_cards: int = 0
+    members: int = 0
+    lives: int = 0
+    # Value -> copies, for members
+    cost_curve: dict[int, int] = field(default_factory=dict)
+    blade_curve: dict[int, int] = field(default_factory=dict)
+    total_blades: int = 0
+    # Color -> total over all copies, in HEART_COLORS order
+    hearts: dict[str, int] = field(default_factory=dict)
+    required_hearts: dict[str, int] = field(default_factory=dict)
+    # Trigger (see TRIGGER_KEYS) -> copies carrying it
+    triggers: dict[str, int] = field(default_factory=dict)
+
+
+def _quantity_masks(index: CardIndex, deck: Deck) -> QuantityMasks:
+    positions = index.positions
+    if positions is None:
+        # Numbers are not unique; like the ID map, the last card with a number wins
+        positions = {card["card_number"]: pos for pos, card in enumerate(index.cards) if card.get("card_number")}
+    masks: QuantityMasks = {}
+    for entry in deck.entries:
+        pos = positions.get(entry.card["card_number"])
+        # Cards removed by a reload since the deck was resolved are not counted
+        if pos is not None and index.alive_mask >> pos & 1:
+            masks[entry.quantity] = masks.get(entry.quantity, 0) | 1 << pos
+    return masks
+
+
+def _copies(quantities: QuantityMasks, mask: int) -> int:
+    """Copies of the deck's cards within `mask`: one popcount per distinct quantity."""
+    return sum(quantity * (bits & mask).bit_count() for quantity, bits in quantities.items())
+
+
+def _histogram(value_masks: Mapping[int, int], quantities: QuantityMasks) -> dict[int, int]:
+    histogram = {value: _copies(quantities, bits) for value, bits in sorted(value_masks.items())}
+    return {value: copies for value, copies in histogram.items() if copies}
+
+
+def _total(histogram: Mapping[int, int]) -> int:
+    return sum(value * copies for value, copies in histogram.items())
+
+
+def _heart_totals(columns: CardColumns, quantities: QuantityMasks) -> dict[str, int]:
+    return {color: _total(_histogram(columns.value_masks(color), quantities)) for color in HEART_COLORS}
+
+
+def _within(quantities: QuantityMasks, mask: int) -> QuantityMasks:
+    return {quantity: bits & mask for quantity, bits in quantities.items()}
+
+
+def member_heart_totals(index: CardIndex, deck: Deck) -> dict[str, int]:
+    """Color -> hearts over all copies of the deck's members (cards with a cost)."""
+    columns = index.columns
+    return _heart_totals(columns, _within(_quantity_masks(index, deck), columns.range_mask("cost", None, None)))
+
+
+def compute_deck_stats(index: CardIndex, deck: Deck) -> DeckStats:
+    """
+    Aggregates a resolved deck over the index's numeric columns.
+
+    The deck becomes one bitset per distinct quantity, and every aggregate is
+    a sum of popcounts of those bitsets AND-ed with the column value bitsets,
+    so the work depends on the number of distinct values, not on the deck size.
+    Members are the cards with a cost, Lives the cards with a score; the heart
+    columns hold `hearts` for the former and `required_hearts` for the latter.
+    """
+    quantities = _quantity_masks(index, deck)
+    columns = index.columns
+    member_mask = columns.range_mask("cost", None, None)
+    live_mask = columns.range_mask("score", None, None)
+    members = _within(quantities, member_mask)
+    lives = _within(quantities, live_mask)
+
+    stats = DeckStats(
+        total_cards=_copies(quantities, index.alive_mask),
+        members=_copies(quantities, member_mask),
+        lives=_copies(quantities, live_mask),
+        cost_curve=_histogram(columns.value_masks("cost"), members),
+        blade_curve=_histogram(columns.value_masks("blades"), members),
+    )
+    stats.total_blades = _total(stats.blade_curve)
+    stats.hearts = _heart_totals(columns, members)
+    stats.required_hearts = _heart_totals(columns, lives)
+
+    table = index.tables["blade_hearts"]
+    for trigger, keys in TRIGGER_KEYS.items():
+        codes = [code for code in map(table.lookup, keys) if code is not None]
+        stats.triggers[trigger] = _copies(quantities, index.postings["blade_hearts"].union(codes))
+    return stats
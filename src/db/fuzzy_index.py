@@ -0,0 +1,105 @@
+from collections.abc import Iterable
+from typing import Any
+
+from src.utils.text import normalize_text
+
+# Only the first PREFIX_LENGTH characters of a term are expanded into deletes (as in
+# SymSpell); candidates are then verified against the full term.
+PREFIX_LENGTH = 7
+
+# Queries shorter than this are too ambiguous to correct
+MIN_QUERY_LENGTH = 3
+
+
+def max_distance_for(query: str) -> int:
+    """Allowed typos: one for short words, two otherwise."""
+    return 1 if len(query) <= 5 else 2
+
+
+def _deletes(term: str, max_distance: int) -> set[str]:
+    """`term` and every string obtained from it by deleting up to `max_distance` characters."""
+    results = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1 :] for word in frontier for i in range(len(word))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+    between `a` and `b`, or `max_distance + 1` as soon as it is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev_prev: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            current[j] = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], prev_prev[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, current
+    return prev[-1]
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant lookup of terms (SymSpell-style symmetric delete dictionary).
+
+    Every term's prefix is expanded at build time into the strings reachable by
+    up to `max_distance` deletions. A query generates its own deletions, and any
+    term sharing one is a candidate, so only a handful of exact distance checks
+    run per lookup regardless of how many terms there are.
+    """
+
+    def __init__(self, terms: Iterable[tuple[str, Any]] = (), max_distance: int = 2):
+        self.max_distance = max_distance
+        # term -> items, in insertion order
+        self._items: dict[str, list[Any]] = {}
+        self._order: dict[str, int] = {}
+        # delete -> terms it was derived from
+        self._deletes: dict[str, list[str]] = {}
+
+        for term, item in terms:
+            term = normalize_text(term)
+            if term not in self._items:
+                self._items[term] = []
+                self._order[term] = len(self._order)
+                for delete in _deletes(term[:PREFIX_LENGTH], max_distance):
+                    self._deletes.setdefault(delete, []).append(term)
+            self._items[term].append(item)
+
+    def lookup(self, query: str, max_distance: int | None = None) -> list[tuple[int, Any]]:
+        """
+        (distance, item) pairs for the terms within `max_distance` edits of `query`
+        (default: `max_distance_for(query)`), closest first. Exact matches have distance 0.
+        """
+        query = normalize_text(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+        if max_distance is None:
+            max_distance = max_distance_for(query)
+        max_distance = min(max_distance, self.max_distance)
+
+        distances: dict[str, int] = {}
+        for delete in _deletes(query[:PREFIX_LENGTH], max_distance):
+            for term in self._deletes.get(delete, ()):
+                if term not in distances:
+                    distances[term] = edit_distance(query, term, max_distance)
+
+        # Ties keep the terms' insertion order
+        hits = sorted(
+            (term for term, distance in distances.items() if distance <= max_distance),
+            key=lambda term: (distances[term], self._order[term]),
+        )
+        return [(distances[term], item) for term in hits for item in self._items[term]]
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,119 @@
+import json
+import sys
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _object_with_shared_keys(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    # json.load shares repeated keys within one document; per-item decoding would not
+    return {sys.intern(key): value for key, value in pairs}
+
+
+_decoder = json.JSONDecoder(object_pairs_hook=_object_with_shared_keys)
+_WHITESPACE = " \t\n\r"
+# Characters that can follow a complete value; a number without one after it may continue
+_DELIMITERS = frozenset(",]}" + _WHITESPACE)
+
+
+class _Reader:
+    """Chunked view over a text stream with just enough lookahead for `raw_decode`."""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed input so the buffer holds at most about one value plus a chunk
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input), without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos : self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues in the next chunk
+                if self._fill():
+                    continue
+                raise
+            # A value ending exactly at the buffer end may be a truncated number/literal, and a
+            # number cut right after "." or "e" decodes as its prefix ("1." + "5" -> 1)
+            if not self._may_continue(obj, end) or not self._fill():
+                self.pos = end
+                return obj
+
+    def _may_continue(self, obj: Any, end: int) -> bool:
+        if end == len(self.buf):
+            return True
+        if isinstance(obj, (int, float)) and not isinstance(obj, bool):
+            return not any(char in _DELIMITERS for char in self.buf[end:])
+        return False
+
+
+def iter_root_list_items(f: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Streams the items of every list found under the root object of
+    `{"<key>": [...], ...}`, in file order, decoding one item at a time.
+    Non-list root values are parsed and skipped.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", reader.buf, reader.pos)
+        reader.expect(":")
+
+        if reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                        break
+                    reader.expect(",")
+        else:
+            reader.value()
+
+        if reader.peek() == "}":
+            reader.expect("}")
+            break
+        reader.expect(",")
+
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", reader.buf, reader.pos)
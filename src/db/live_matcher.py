@@ -0,0 +1,30 @@
+from collections.abc import Mapping
+
+from src.db.card_index import CardIndex
+from src.db.card_record import HEART_COLORS
+from src.db.columns import HEARTS_TOTAL
+from src.db.search_result import SearchResult
+
+# Gray required hearts can be paid with hearts of any color
+WILDCARD_HEART = "heart0"
+
+
+def playable_lives(index: CardIndex, hearts: Mapping[str, int]) -> SearchResult:
+    """
+    Live cards (cards with a score) whose required hearts can be paid with `hearts`
+    (color -> count, as in HEART_COLORS).
+
+    Each colored requirement must be met by hearts of that color; the gray
+    requirement takes whatever is left, so it is met exactly when the live's
+    total requirement does not exceed the total of `hearts`. Every condition
+    is a range over a heart column, so all lives are checked at once by
+    AND-ing column bitsets.
+    """
+    columns = index.columns
+    mask = index.alive_mask & columns.range_mask("score", None, None)
+    for color in HEART_COLORS:
+        if color != WILDCARD_HEART and mask:
+            mask &= columns.range_mask(color, None, hearts.get(color, 0))
+    if mask:
+        mask &= columns.range_mask(HEARTS_TOTAL, None, sum(hearts.values()))
+    return SearchResult(index.records, mask)
@@ -0,0 +1,42 @@
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional, TypedDict
+
+
+class CardData(TypedDict):
+    card_number: str
+    img_url: str
+    name: str
+    set: str
+    card_type: str
+    group: list[str]
+    unit: str | None
+    rarity: str
+    # Optional fields depending on card type
+    score: str | None
+    cost: str | None
+    blades: str | None
+    hearts: dict[str, str] | None
+    required_hearts: dict[str, str] | None
+    blade_hearts: dict[str, str] | None
+    special_hearts: str | None
+    info_text: list[str] | None
+
+
+@dataclass
+class CardID:
+    series: str
+    product: str
+    number: str
+    rarity: str
+
+    @classmethod
+    def parse(cls, card_number: str) -> Optional["CardID"]:
+        # Normalize width: e.g. fullwidth + to ascii +
+        normalized_number = unicodedata.normalize("NFKC", card_number)
+
+        parts = normalized_number.split("-")
+        if len(parts) != 4:
+            return None
+
+        return cls(series=parts[0], product=parts[1], number=parts[2], rarity=parts[3])
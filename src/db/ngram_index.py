@@ -0,0 +1,136 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+
+from src.db.bitset import from_positions
+from src.db.card_record import FIELD_SEP
+
+# A list this many times longer than the running intersection is probed by binary search instead of scanned
+_PROBE_RATIO = 16
+
+
+def _grams(text: str, n: int) -> set[str]:
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+def _collect_grams(entries: Iterable[tuple[int, str]]) -> dict[str, array]:
+    """Gram -> positions for (position, text) pairs, in input order."""
+    # Compact int arrays rather than lists keep the build-time peak low
+    positions: dict[str, array] = {}
+    for pos, text in entries:
+        grams: set[str] = set()
+        # Grams never span field separators, since queries cannot contain them
+        for part in text.split(FIELD_SEP):
+            grams |= _grams(part, 1)
+            grams |= _grams(part, 2)
+        for gram in grams:
+            positions.setdefault(gram, array("I")).append(pos)
+    return positions
+
+
+# Positions of a gram: a single position as a plain int (most grams occur in one card), otherwise
+# an ascending array
+Postings = int | array
+
+
+def _pack(positions: Sequence[int]) -> Postings:
+    if len(positions) == 1:
+        return positions[0]
+    return positions if isinstance(positions, array) else array("I", positions)
+
+
+def _unpack(postings: Postings) -> Sequence[int]:
+    return (postings,) if isinstance(postings, int) else postings
+
+
+def _contains(postings: Sequence[int], pos: int) -> bool:
+    i = bisect_left(postings, pos)
+    return i < len(postings) and postings[i] == pos
+
+
+def _intersect(result: Sequence[int], postings: Sequence[int]) -> Sequence[int]:
+    """Ascending positions in both (`result` being the shorter)."""
+    if len(result) * _PROBE_RATIO < len(postings):
+        return [pos for pos in result if _contains(postings, pos)]
+    keep = set(result)
+    return [pos for pos in postings if pos in keep]
+
+
+class NgramIndex:
+    """
+    Character n-gram index over pre-lowered card text.
+
+    Unigrams and bigrams are indexed as sorted position lists, so the index
+    grows with the total number of gram occurrences rather than with
+    distinct grams x cards as dense bitsets would. Bigrams suit Japanese text
+    (no word boundaries) and keep the index small; a query is narrowed to the
+    cards containing all of its bigrams (or its single character), intersected
+    rarest first, and only the final candidates become a bitset. Callers run
+    the exact substring check on those candidates.
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._postings: dict[str, Postings] = {}
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "NgramIndex":
+        index = cls()
+        index.size = len(texts)
+        # Positions are collected in ascending order already; moved over one by one to keep the build peak low
+        collected = _collect_grams(enumerate(texts))
+        while collected:
+            gram, positions = collected.popitem()
+            index._postings[gram] = _pack(positions)
+        return index
+
+    def updated(
+        self,
+        removed: Iterable[tuple[int, str]],
+        added: Iterable[tuple[int, str]],
+        size: int,
+    ) -> "NgramIndex":
+        """New index with the (position, text) entries in `removed` replaced by those in `added`."""
+        index = NgramIndex()
+        index.size = size
+        # Copy-on-write: untouched grams share their arrays with this index
+        postings = dict(self._postings)
+        removed_grams = _collect_grams(removed)
+        added_grams = _collect_grams(added)
+        for gram in removed_grams.keys() | added_grams.keys():
+            old = postings.get(gram)
+            positions = set(_unpack(old)) if old is not None else set()
+            positions.difference_update(removed_grams.get(gram, ()))
+            positions.update(added_grams.get(gram, ()))
+            if positions:
+                postings[gram] = _pack(sorted(positions))
+            else:
+                postings.pop(gram, None)
+        index._postings = postings
+        return index
+
+    def candidates(self, query: str) -> int:
+        """Bitset of cards whose text may contain `query` (a superset of the true matches)."""
+        if not query:
+            return (1 << self.size) - 1
+        if len(query) == 1:
+            postings = self._postings.get(query)
+            return from_positions(_unpack(postings), self.size) if postings is not None else 0
+
+        lists = []
+        for gram in _grams(query, 2):
+            postings = self._postings.get(gram)
+            if postings is None:
+                return 0
+            lists.append(_unpack(postings))
+        # Rarest grams first, so the running intersection stays small and an empty one is found quickly
+        lists.sort(key=len)
+        result: Sequence[int] = lists[0]
+        for positions in lists[1:]:
+            result = _intersect(result, positions)
+            if not result:
+                return 0
+        return from_positions(result, self.size)
+
+    def __len__(self) -> int:
+        return len(self._postings)
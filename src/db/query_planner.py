@@ -0,0 +1,269 @@
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.db.bitset import BitsetIndex, iter_positions
+from src.db.card_record import HEART_INDEX, CardRecord
+from src.db.columns import CardColumns
+from src.db.ngram_index import NgramIndex
+from src.db.search_result import SearchResult
+from src.db.value_table import ValueTables
+from src.utils.parsing import parse_range_string
+from src.utils.text import normalize_text
+
+_log = logging.getLogger(__name__)
+
+# Filters answered by a posting list lookup: filter key -> posting index name
+POSTING_FILTERS = ("rarity", "unit", "group", "card_type")
+
+# Substring filters checked per candidate: filter key -> record fields searched
+PREDICATE_FIELDS: dict[str, tuple[str, ...]] = {
+    "keyword": ("keyword_norm",),  # Name OR Unit OR Group
+    "character": ("name_norm",),  # Name segment
+    "query": ("name_norm",),  # Legacy Name-only search
+    "card_number": ("card_number_norm",),
+    "text_query": ("name_norm", "info_text_norm"),  # Name OR Info Text
+}
+
+# Records sampled at load time to estimate predicate selectivity
+SAMPLE_SIZE = 256
+
+FilterSignature = tuple[tuple[str, Hashable], ...]
+
+
+def filter_signature(filters: dict[str, Any]) -> FilterSignature:
+    """
+    Canonical, hashable form of a filters dict.
+    Empty values are dropped, text values are normalized (see normalize_text)
+    and dict/list values are ordered, so equivalent filters produce the same
+    signature regardless of construction order or spelling variants.
+    """
+    items: list[tuple[str, Hashable]] = []
+    for key, val in filters.items():
+        if val is None or val == "" or val == [] or val == {}:
+            continue
+        if key in POSTING_FILTERS or key in PREDICATE_FIELDS:
+            val = normalize_text(val)
+        elif key == "hearts":
+            # Keep value types: int means minimum only, str is a range expression
+            val = tuple(sorted(val.items()))
+        elif key == "blade_hearts":
+            val = tuple(sorted(set(val)))
+        items.append((key, val))
+    return tuple(sorted(items))
+
+
+def _contains(needle: str, fields: tuple[str, ...]) -> Callable[[CardRecord], bool]:
+    if len(fields) == 1:
+        attr = fields[0]
+        return lambda record: needle in getattr(record, attr)
+    return lambda record: any(needle in getattr(record, attr) for attr in fields)
+
+
+@dataclass
+class IndexStage:
+    name: str
+    mask: int
+
+    @property
+    def rows(self) -> int:
+        return self.mask.bit_count()
+
+
+@dataclass
+class PredicateStage:
+    name: str
+    check: Callable[[CardRecord], bool]
+    cost: float  # Relative cost per record (average searched text length)
+    selectivity: float  # Estimated fraction of records passing
+
+    @property
+    def rank(self) -> float:
+        # Cheap predicates that reject most records run first
+        return self.cost / max(1.0 - self.selectivity, 1e-6)
+
+
+@dataclass
+class StageReport:
+    name: str
+    kind: str
+    estimate: float
+    rows: int
+
+
+@dataclass
+class QueryExplanation:
+    signature: FilterSignature
+    stages: list[StageReport] = field(default_factory=list)
+    total: int = 0
+
+    def __str__(self) -> str:
+        lines = [f"Plan for {dict(self.signature)}"]
+        for i, stage in enumerate(self.stages, 1):
+            lines.append(f"  {i}. [{stage.kind}] {stage.name}: est={stage.estimate:g} rows={stage.rows}")
+        lines.append(f"  => {self.total} rows")
+        return "\n".join(lines)
+
+
+@dataclass
+class QueryPlan:
+    signature: FilterSignature
+    index_stages: list[IndexStage]
+    predicate_stages: list[PredicateStage]
+    candidates: int
+
+
+class QueryPlanner:
+    """
+    Compiles filter dicts into query plans over the repository indices.
+
+    Index-backed filters (posting lists, numeric columns, n-grams) are
+    intersected smallest-first, and the remaining substring predicates are
+    ordered by estimated cost and selectivity from statistics gathered when
+    the planner is built. Compiled plans are cached by filter signature.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[CardRecord],
+        postings: dict[str, BitsetIndex],
+        columns: CardColumns,
+        text_ngrams: NgramIndex,
+        tables: ValueTables,
+        all_mask: int | None = None,
+        cache_size: int = 128,
+    ):
+        self.records = records
+        self.postings = postings
+        self.columns = columns
+        self.text_ngrams = text_ngrams
+        # Posting lists are keyed by value code; filter values are translated through these
+        self.tables = tables
+        # Positions of live cards (excludes tombstones left by incremental updates)
+        self.all_mask = (1 << len(records)) - 1 if all_mask is None else all_mask
+        self.cache_size = cache_size
+        self._plan_cache: OrderedDict[FilterSignature, QueryPlan] = OrderedDict()
+
+        # Load-time statistics: evenly spaced sample and average field lengths
+        step = max(1, len(records) // SAMPLE_SIZE)
+        self._sample = list(records[::step])
+        self._field_cost: dict[str, float] = {}
+        for fields in PREDICATE_FIELDS.values():
+            for attr in fields:
+                if attr not in self._field_cost:
+                    total_len = sum(len(getattr(record, attr)) for record in self._sample)
+                    self._field_cost[attr] = 1.0 + total_len / max(1, len(self._sample))
+
+    def compile(self, filters: dict[str, Any]) -> QueryPlan:
+        signature = filter_signature(filters)
+        plan = self._plan_cache.get(signature)
+        if plan is not None:
+            self._plan_cache.move_to_end(signature)
+            return plan
+
+        plan = self._compile(signature)
+        self._plan_cache[signature] = plan
+        if len(self._plan_cache) > self.cache_size:
+            self._plan_cache.popitem(last=False)
+        return plan
+
+    def _compile(self, signature: FilterSignature) -> QueryPlan:
+        spec: dict[str, Any] = dict(signature)
+        index_stages = self._index_stages(spec)
+        predicate_stages = self._predicate_stages(spec)
+
+        # Most selective index first; stop as soon as nothing survives
+        index_stages.sort(key=lambda stage: stage.rows)
+        candidates = self.all_mask
+        for stage in index_stages:
+            candidates &= stage.mask
+            if not candidates:
+                break
+
+        predicate_stages.sort(key=lambda stage: stage.rank)
+        return QueryPlan(signature, index_stages, predicate_stages, candidates)
+
+    def _index_stages(self, spec: dict[str, Any]) -> list[IndexStage]:
+        stages = []
+        for key in POSTING_FILTERS:
+            if key in spec:
+                # Values no card has get no code and match nothing
+                code = self.tables[key].lookup(spec[key])
+                mask = self.postings[key].get(code) if code is not None else 0
+                stages.append(IndexStage(f"{key}={spec[key]}", mask))
+
+        if "blade_hearts" in spec:
+            # OR logic: card needs at least one of the requested keys
+            table = self.tables["blade_hearts"]
+            codes = [table.lookup(key) for key in spec["blade_hearts"]]
+            mask = self.postings["blade_hearts"].union(code for code in codes if code is not None)
+            stages.append(IndexStage("blade_hearts", mask))
+
+        for column in ("cost", "blades"):
+            min_v, max_v = spec.get(f"{column}_min"), spec.get(f"{column}_max")
+            if min_v is not None or max_v is not None:
+                stages.append(IndexStage(f"{column}[{min_v}..{max_v}]", self.columns.range_mask(column, min_v, max_v)))
+
+        # "hearts" field in DB for Members (Base Hearts). "required_hearts" for Lives.
+        # Heart columns hold the per-color total of both.
+        for color_key, val_expr in spec.get("hearts", ()):
+            # val_expr can be int (legacy) or str range (e.g. "2+")
+            min_h: int | None
+            max_h: int | None
+            if isinstance(val_expr, int):
+                min_h, max_h = val_expr, None
+            else:
+                min_h, max_h = parse_range_string(str(val_expr))
+            if min_h is None and max_h is None:
+                continue
+            if color_key in HEART_INDEX:
+                mask = self.columns.range_mask(color_key, min_h, max_h)
+            else:
+                # Unknown colors always total 0
+                zero_ok = (min_h is None or min_h <= 0) and (max_h is None or max_h >= 0)
+                mask = self.all_mask if zero_ok else 0
+            stages.append(IndexStage(f"{color_key}[{min_h}..{max_h}]", mask))
+
+        if "text_query" in spec:
+            # N-gram candidates; the exact substring check runs as a predicate
+            stages.append(IndexStage("text_query~ngram", self.text_ngrams.candidates(spec["text_query"])))
+
+        return stages
+
+    def _predicate_stages(self, spec: dict[str, Any]) -> list[PredicateStage]:
+        stages = []
+        for key, fields in PREDICATE_FIELDS.items():
+            if key not in spec:
+                continue
+            check = _contains(spec[key], fields)
+            passed = sum(1 for record in self._sample if check(record))
+            selectivity = passed / len(self._sample) if self._sample else 1.0
+            cost = sum(self._field_cost[attr] for attr in fields)
+            stages.append(PredicateStage(f"{key}~'{spec[key]}'", check, cost, selectivity))
+        return stages
+
+    def explain(self, filters: dict[str, Any]) -> QueryExplanation:
+        """Runs the plan for `filters` and reports each stage's estimate and surviving row count."""
+        plan = self.compile(filters)
+        explanation = QueryExplanation(plan.signature)
+
+        candidates = self.all_mask
+        for index_stage in plan.index_stages:
+            candidates &= index_stage.mask
+            explanation.stages.append(StageReport(index_stage.name, "index", index_stage.rows, candidates.bit_count()))
+
+        survivors = [self.records[pos] for pos in iter_positions(candidates)]
+        for predicate_stage in plan.predicate_stages:
+            survivors = [record for record in survivors if predicate_stage.check(record)]
+            explanation.stages.append(
+                StageReport(predicate_stage.name, "predicate", round(predicate_stage.selectivity, 3), len(survivors))
+            )
+
+        explanation.total = len(survivors)
+        return explanation
+
+    def execute(self, plan: QueryPlan) -> SearchResult:
+        """Lazy result handle for a compiled plan."""
+        return SearchResult(self.records, plan.candidates, [stage.check for stage in plan.predicate_stages])
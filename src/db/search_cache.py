@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SearchCache:
+    """
+    Bounded LRU cache for search results.
+
+    Entries belong to a repository data generation; a lookup with a newer
+    generation drops every entry, so results never outlive a data reload.
+    A `max_size` of 0 disables caching.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._generation: int | None = None
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def _check_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            if self._entries:
+                self.stats.invalidations += 1
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: int) -> Any | None:
+        self._check_generation(generation)
+        value = self._entries.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: Hashable, generation: int, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._check_generation(generation)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
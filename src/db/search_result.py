@@ -0,0 +1,96 @@
+from collections.abc import Callable, Iterator, Sequence
+from itertools import islice
+from typing import overload
+
+from src.db.bitset import from_positions, iter_positions
+from src.db.card_record import CardRecord
+from src.db.models import CardData
+
+
+class SearchResult:
+    """
+    Lazy handle over the matches of a search.
+
+    Holds the candidate bitset and the remaining predicates instead of a list
+    of cards. The exact total is computed once on first use of `len()` (free
+    when no predicates remain), and slicing materializes only the requested
+    cards. The handle keeps its own reference to the records it was built
+    from, so it stays valid if the repository reloads its data.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[CardRecord],
+        candidates: int,
+        checks: Sequence[Callable[[CardRecord], bool]] = (),
+    ):
+        self._records = records
+        self._candidates = candidates
+        self._checks = tuple(checks)
+        # Bitset of confirmed matches; known upfront when every filter was index-backed
+        self._matches: int | None = None if self._checks else candidates
+        self._total: int | None = None
+        # Keyword actually searched when the requested one matched no card (see CardRepository.search)
+        self.corrected_keyword: str | None = None
+
+    def _is_match(self, pos: int) -> bool:
+        record = self._records[pos]
+        return all(check(record) for check in self._checks)
+
+    @property
+    def matches(self) -> int:
+        """Bitset of all matching card positions (runs the predicates on first access)."""
+        if self._matches is None:
+            matched = [pos for pos in iter_positions(self._candidates) if self._is_match(pos)]
+            self._matches = from_positions(matched, len(self._records))
+        return self._matches
+
+    @property
+    def total(self) -> int:
+        if self._total is None:
+            self._total = self.matches.bit_count()
+        return self._total
+
+    def _positions(self) -> Iterator[int]:
+        if self._matches is not None:
+            return iter_positions(self._matches)
+        # Not counted yet: filter lazily so a first page stops early
+        return (pos for pos in iter_positions(self._candidates) if self._is_match(pos))
+
+    def page(self, start: int, stop: int) -> list[CardData]:
+        """Materializes matches [start, stop) in corpus order."""
+        return [self._records[pos].card for pos in islice(self._positions(), max(start, 0), max(stop, 0))]
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __bool__(self) -> bool:
+        # Stops at the first match instead of counting them all
+        if self._total is not None:
+            return self._total > 0
+        return next(self._positions(), None) is not None
+
+    def __iter__(self) -> Iterator[CardData]:
+        return (self._records[pos].card for pos in self._positions())
+
+    @overload
+    def __getitem__(self, index: int) -> CardData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CardData]: ...
+
+    def __getitem__(self, index: int | slice) -> CardData | list[CardData]:
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("SearchResult slices do not support a step")
+            start, stop = index.start or 0, index.stop
+            if start < 0 or (stop is not None and stop < 0):
+                start, stop, _ = index.indices(self.total)
+            return self.page(start, self.total if stop is None else stop)
+
+        if index < 0:
+            index += self.total
+        cards = self.page(index, index + 1)
+        if not cards:
+            raise IndexError("SearchResult index out of range")
+        return cards[0]
@@ -0,0 +1,137 @@
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from src.db.card_index import CardIndex
+from src.db.models import CardData
+
+_log = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"LLTCGSNP"
+# Bump whenever CardIndex or any structure it holds changes shape
+SNAPSHOT_VERSION = 11
+
+# Modules whose code decides what the index holds (aliases, normalized text, columns, ...);
+# a snapshot built by a different version of any of them is rebuilt
+_DERIVING_MODULES = (
+    "src.db.alias_index",
+    "src.db.autocomplete_index",
+    "src.db.bitset",
+    "src.db.card_index",
+    "src.db.card_record",
+    "src.db.columns",
+    "src.db.fuzzy_index",
+    "src.db.mappings",
+    "src.db.models",
+    "src.db.ngram_index",
+    "src.db.value_table",
+    "src.utils.text",
+)
+
+# magic, version, sha256 of the source JSON, code fingerprint, sha256 of the payload, payload length
+_HEADER = struct.Struct("<8sH32s32s32sQ")
+
+# Attributes every index has; a snapshot missing any of them is not used
+_INDEX_FIELDS = frozenset(vars(CardIndex()))
+
+
+def source_digest(path: str) -> bytes:
+    """SHA-256 of the source file, read in chunks."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+@functools.cache
+def code_fingerprint() -> bytes:
+    """SHA-256 over the source of the modules that build the index (see _DERIVING_MODULES)."""
+    digest = hashlib.sha256()
+    for name in _DERIVING_MODULES:
+        path = sys.modules[name].__file__
+        assert path is not None
+        with open(path, "rb") as f:
+            digest.update(name.encode())
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.digest()
+
+
+def write_snapshot(path: str, digest: bytes, cards: list[CardData], index: CardIndex) -> int:
+    """
+    Writes the parsed cards and built index to `path` (atomically, via a temp file).
+    Returns the snapshot size in bytes.
+    """
+    payload = pickle.dumps((cards, index), protocol=pickle.HIGHEST_PROTOCOL)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, digest, code_fingerprint(), hashlib.sha256(payload).digest(), len(payload)
+        )
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return _HEADER.size + len(payload)
+
+
+def read_snapshot(path: str, digest: bytes) -> tuple[list[CardData], CardIndex] | None:
+    """
+    Loads a snapshot written by `write_snapshot` if it exists, has the current
+    format version and was built from a source with the given digest by the
+    current index code (see `code_fingerprint`); otherwise None.
+
+    The file is memory-mapped and unpickled straight from the mapping, without
+    an intermediate copy. Snapshots are trusted local files written by the bot itself.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                return None
+            magic, version, snapshot_digest, fingerprint, payload_digest, length = _HEADER.unpack_from(mm)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                _log.info(f"Ignoring snapshot {path}: unsupported format version")
+                return None
+            if snapshot_digest != digest:
+                _log.info(f"Ignoring snapshot {path}: card data has changed")
+                return None
+            if fingerprint != code_fingerprint():
+                _log.info(f"Ignoring snapshot {path}: index code has changed")
+                return None
+            if len(mm) != _HEADER.size + length:
+                _log.warning(f"Ignoring snapshot {path}: truncated")
+                return None
+            with memoryview(mm)[_HEADER.size :] as payload:
+                # Checked before unpickling: a corrupted pickle can fail in arbitrary ways
+                if hashlib.sha256(payload).digest() != payload_digest:
+                    _log.warning(f"Ignoring snapshot {path}: checksum mismatch")
+                    return None
+                try:
+                    contents = pickle.loads(payload)
+                except Exception as e:
+                    _log.warning(f"Ignoring unreadable snapshot {path}: {e!r}")
+                    return None
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        _log.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+    if not _is_valid(contents):
+        _log.warning(f"Ignoring snapshot {path}: unexpected contents")
+        return None
+    return contents
+
+
+def _is_valid(contents: object) -> bool:
+    if not isinstance(contents, tuple) or len(contents) != 2:
+        return False
+    cards, index = contents
+    return (
+        isinstance(cards, list)
+        and isinstance(index, CardIndex)
+        and vars(index).keys() >= _INDEX_FIELDS
+        and len(index.cards) == len(index.records)
+    )
@@ -0,0 +1,90 @@
+import sys
+from typing import Any
+
+from src.db.models import CardData
+from src.utils.text import normalize_text
+
+# Card fields with a small set of repeated values, stored as integer codes in CardRecord
+# and used as the posting-list keys of the matching filters
+CODED_FIELDS = ("rarity", "card_type", "unit", "group", "blade_hearts")
+
+# Coded fields keyed by their normalized text; blade heart codes ("b_heart01") are identifiers
+TEXT_CODED_FIELDS = ("rarity", "card_type", "unit", "group")
+
+# Short, repeated string fields shared between cards by the loader
+_INTERNED_FIELDS = ("set", "card_type", "rarity", "unit", "cost", "blades", "score", "special_hearts")
+_INTERNED_DICT_FIELDS = ("hearts", "required_hearts", "blade_hearts")
+
+
+class ValueTable:
+    """
+    Shared table of the distinct values of one field, each with a small integer code.
+    Codes are assigned in first-seen order and never change, so tables can be
+    extended (on a copy) without invalidating codes already handed out.
+    """
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self._values: list[str] = []
+
+    def code(self, value: str) -> int:
+        """Code of `value`, assigning the next free code if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        """Code of `value`, or None if no card has it."""
+        return self._codes.get(value)
+
+    def value(self, code: int) -> str:
+        return self._values[code]
+
+    def copy(self) -> "ValueTable":
+        table = ValueTable()
+        table._codes = dict(self._codes)
+        table._values = list(self._values)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+ValueTables = dict[str, ValueTable]
+
+
+def new_tables() -> ValueTables:
+    return {name: ValueTable() for name in CODED_FIELDS}
+
+
+def copy_tables(tables: ValueTables) -> ValueTables:
+    return {name: table.copy() for name, table in tables.items()}
+
+
+def table_key(field: str, value: str) -> str:
+    """Form of `value` stored in the table for `field` (what filters are matched against)."""
+    return normalize_text(value) if field in TEXT_CODED_FIELDS else value
+
+
+def intern_card(card: CardData) -> CardData:
+    """
+    Replaces the card's repeated short strings (set, rarity, unit, groups, heart
+    counts, ...) in place with a single shared copy each. Returns the card.
+    """
+    data: dict[str, Any] = card  # type: ignore[assignment]
+    for field in _INTERNED_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            data[field] = sys.intern(value)
+    groups = data.get("group")
+    if isinstance(groups, list):
+        data["group"] = [sys.intern(group) if isinstance(group, str) else group for group in groups]
+    for field in _INTERNED_DICT_FIELDS:
+        mapping = data.get(field)
+        if isinstance(mapping, dict):
+            data[field] = {
+                sys.intern(key): sys.intern(val) if isinstance(val, str) else val for key, val in mapping.items()
+            }
+    return card
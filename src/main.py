@@ -1,4 +1,36 @@
-from .bot import main
+import asyncio
+import logging
+import signal
+
+from .bot import client, main
+
+_log = logging.getLogger(__name__)
+
+# Keeps the shutdown task referenced until it finishes
+_shutdown_tasks: set[asyncio.Task] = set()
+
+
+async def _shutdown() -> None:
+    _log.info("SIGTERM received, shutting down.")
+    await client.close()
+
+
+def _handle_sigterm(signum, frame) -> None:
+    # client.run only handles KeyboardInterrupt, but `docker stop` sends SIGTERM to PID 1;
+    # closing the bot also saves the image cache index and shuts down the disk I/O pool
+    loop = client.loop
+    if not isinstance(loop, asyncio.AbstractEventLoop) or loop.is_closed():
+        # Not started (or already stopped): nothing to clean up
+        raise SystemExit(128 + signum)
+
+    def start_shutdown() -> None:
+        task = loop.create_task(_shutdown())
+        _shutdown_tasks.add(task)
+        task.add_done_callback(_shutdown_tasks.discard)
+
+    loop.call_soon_threadsafe(start_shutdown)
+
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     main()
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    errors: int = 0
+    # Time spent in the worker thread, excluding the wait for a free worker
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+@dataclass
+class DiskIOMetrics:
+    # Submitted to the pool but not yet picked up by a worker
+    queued: int = 0
+    # Running in a worker thread
+    running: int = 0
+    peak_queued: int = 0
+    # Callers that found every queue slot taken and had to wait for one
+    throttled: int = 0
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        lines = [
+            f"Disk I/O: queued={self.queued} running={self.running} peak_queued={self.peak_queued} "
+            f"throttled={self.throttled}"
+        ]
+        for name, stats in sorted(self.operations.items()):
+            lines.append(
+                f"  {name}: n={stats.count} errors={stats.errors} "
+                f"mean={stats.mean_seconds * 1000:.2f} ms max={stats.max_seconds * 1000:.2f} ms"
+            )
+        return "\n".join(lines)
+
+
+# States of a submitted job
+_QUEUED = "queued"
+_RUNNING = "running"
+_DONE = "done"
+_ABANDONED = "abandoned"
+
+
+@dataclass
+class _Job:
+    state: str = _QUEUED
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Writes `data` under a temporary name and renames it into place, so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class DiskIO:
+    """
+    Runs blocking filesystem calls on a small dedicated thread pool, keeping
+    them off the event loop.
+
+    At most `max_pending` calls are queued or running at once; further
+    callers wait for a slot, so a burst of requests on a slow disk applies
+    backpressure instead of piling up work. Per-operation timings and the
+    queue depth are kept in `metrics`.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 64):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="disk-io")
+        self._slots = asyncio.Semaphore(max_pending)
+        # Guards the metrics, which are updated from the worker threads as jobs start and finish
+        self._lock = threading.Lock()
+        self.metrics = DiskIOMetrics()
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs `func(*args)` in the pool; `operation` names it in the metrics."""
+        if self._slots.locked():
+            self.metrics.throttled += 1
+        async with self._slots:
+            metrics = self.metrics
+            lock = self._lock
+            # Shared by the worker and the caller below, which may see it in either order
+            job = _Job()
+            with lock:
+                stats = metrics.operations.setdefault(operation, OperationStats())
+                metrics.queued += 1
+                metrics.peak_queued = max(metrics.peak_queued, metrics.queued)
+
+            def timed() -> Any:
+                with lock:
+                    if job.state == _QUEUED:
+                        metrics.queued -= 1
+                    job.state = _RUNNING
+                    metrics.running += 1
+                start = time.perf_counter()
+                failed = False
+                try:
+                    return func(*args)
+                except Exception:
+                    failed = True
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        job.state = _DONE
+                        metrics.running -= 1
+                        stats.count += 1
+                        if failed:
+                            stats.errors += 1
+                        stats.total_seconds += elapsed
+                        stats.max_seconds = max(stats.max_seconds, elapsed)
+
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+            finally:
+                with lock:
+                    if job.state == _QUEUED:
+                        # Cancelled before a worker picked it up; if one still does, it is not counted as queued
+                        metrics.queued -= 1
+                        job.state = _ABANDONED
+
+    async def read_bytes(self, path: Path) -> bytes:
+        return await self.run("read", path.read_bytes)
+
+    async def write_atomic(self, path: Path, data: bytes) -> None:
+        await self.run("write", write_atomic, path, data)
+
+    async def mkdir(self, path: Path) -> None:
+        await self.run("mkdir", lambda: path.mkdir(parents=True, exist_ok=True))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
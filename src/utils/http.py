@@ -0,0 +1,35 @@
+from typing import Any
+
+import aiohttp
+
+# Some image hosts reject requests without a browser User-Agent
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Idle connections are kept open this long for reuse (seconds)
+KEEPALIVE_TIMEOUT = 30
+# Resolved addresses are reused this long (seconds)
+DNS_CACHE_TTL = 300
+
+
+def create_http_session(settings: dict[str, Any]) -> aiohttp.ClientSession:
+    """
+    The bot's shared HTTP session. Its pooled connector keeps connections (and
+    TLS sessions) to the image hosts alive between downloads, caps the
+    connections per host and caches DNS lookups. Must be created inside the
+    running event loop and closed on shutdown.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=settings.get("HTTP_MAX_CONNECTIONS", 32),
+        limit_per_host=settings.get("HTTP_MAX_CONNECTIONS_PER_HOST", 8),
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.get("HTTP_TIMEOUT", 30),
+        connect=settings.get("HTTP_CONNECT_TIMEOUT", 10),
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT})
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.utils.disk_io import DiskIO, write_atomic
+
+_log = logging.getLogger(__name__)
+
+# Index of the cached files, kept in the cache directory itself
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Seconds after a change before the manifest is written, so bursts of changes share one write
+SAVE_DELAY_SECONDS = 30.0
+
+# Suffix of in-progress writes (see write_atomic); leftovers from a crash are removed by a scan
+TMP_SUFFIX = ".tmp"
+
+
+def _unlink(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+@dataclass
+class CacheEntry:
+    size: int
+    last_access: float
+
+
+class ImageCache:
+    """
+    Size-capped LRU cache of image files in one directory.
+
+    An in-memory manifest of the cached files (size, last access) answers
+    "is it cached?" without touching the disk and decides which files to
+    evict once the total size exceeds `max_bytes`. The manifest is written
+    to an index file `save_delay` seconds after it changes and on `close`,
+    and loaded from it on the next start, where a walk of the directory adds
+    the files it does not list and drops the ones that are gone (without a
+    readable index the walk alone rebuilds it). Entries whose file goes
+    missing while running are dropped when read. All disk access runs
+    through `disk_io`.
+    """
+
+    def __init__(self, directory: Path, disk_io: DiskIO, max_bytes: int, save_delay: float = SAVE_DELAY_SECONDS):
+        self.directory = directory
+        self.disk_io = disk_io
+        self.max_bytes = max_bytes
+        self.save_delay = save_delay
+        # Least recently used first
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.total_bytes = 0
+        self._directory_ready = False
+        # Changed since the index was last written
+        self._dirty = False
+        self._save_task: asyncio.Task | None = None
+        # Orders concurrent writes of the index, so an older manifest never replaces a newer one
+        self._save_lock = asyncio.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    async def load(self) -> None:
+        """
+        Loads the manifest from the index file and reconciles it with a walk of
+        the directory (or rebuilds it from the walk alone without a readable index).
+        """
+        start = time.perf_counter()
+        indexed = await self.disk_io.run("manifest_read", self._read_manifest)
+        # Always walked: files the index does not list (written after its last save, or
+        # copied in) would otherwise never be counted against the cap or evicted
+        entries = await self.disk_io.run("scan", self._scan)
+        source = "scan"
+        changed = True
+        if indexed is not None:
+            source = "index"
+            changed = indexed.keys() != entries.keys()
+            for name, entry in entries.items():
+                # The index knows the last access; the walk knows what is actually on disk
+                if name in indexed:
+                    changed = changed or indexed[name].size != entry.size
+                    entry.last_access = indexed[name].last_access
+
+        self._entries = OrderedDict(sorted(entries.items(), key=lambda item: item[1].last_access))
+        self.total_bytes = sum(entry.size for entry in self._entries.values())
+        # The cap may have been lowered since the files were cached
+        await self._evict()
+        if changed:
+            # Written soon, so the index matches the directory again
+            self._changed()
+        _log.info(
+            f"Image cache: {len(self._entries)} files, {self.total_bytes / 2**20:.1f} MiB "
+            f"(from {source} in {(time.perf_counter() - start) * 1000:.1f} ms)"
+        )
+
+    def _read_manifest(self) -> dict[str, CacheEntry] | None:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _log.warning(f"Ignoring unreadable image cache index {self.manifest_path}: {e}")
+            return None
+        try:
+            if data["version"] != MANIFEST_VERSION:
+                return None
+            return {name: CacheEntry(int(size), float(last_access)) for name, size, last_access in data["entries"]}
+        except (KeyError, TypeError, ValueError):
+            _log.warning(f"Ignoring malformed image cache index {self.manifest_path}")
+            return None
+
+    def _scan(self) -> dict[str, CacheEntry]:
+        entries: dict[str, CacheEntry] = {}
+        try:
+            # Streams the directory instead of listing it up front
+            with os.scandir(self.directory) as it:
+                for dir_entry in it:
+                    if dir_entry.name.startswith(".") or not dir_entry.is_file():
+                        continue
+                    if dir_entry.name.endswith(TMP_SUFFIX):
+                        Path(dir_entry.path).unlink(missing_ok=True)
+                        continue
+                    stat = dir_entry.stat()
+                    entries[dir_entry.name] = CacheEntry(stat.st_size, stat.st_mtime)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _write_manifest(self, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.manifest_path, data)
+
+    async def save(self) -> None:
+        """Persists the manifest for the next start (atomically replacing the index file)."""
+        async with self._save_lock:
+            # Cleared first: changes made while the write runs schedule another one
+            self._dirty = False
+            data = {
+                "version": MANIFEST_VERSION,
+                "entries": [[name, entry.size, entry.last_access] for name, entry in self._entries.items()],
+            }
+            try:
+                await self.disk_io.run("manifest_write", self._write_manifest, json.dumps(data).encode())
+            except BaseException:
+                self._dirty = True
+                raise
+
+    def _changed(self) -> None:
+        """Marks the manifest as changed, scheduling a write of the index if none is pending."""
+        self._dirty = True
+        if self._save_task is None:
+            self._save_task = asyncio.get_running_loop().create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        await asyncio.sleep(self.save_delay)
+        self._save_task = None
+        try:
+            await self.save()
+        except OSError as e:
+            _log.error(f"Failed to save image cache index: {e}")
+
+    async def close(self) -> None:
+        """Cancels the pending delayed write and saves the manifest if it changed since the last one."""
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+        if self._dirty:
+            await self.save()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def path(self, name: str) -> Path:
+        return self.directory / name
+
+    async def read(self, name: str) -> bytes | None:
+        """Contents of a cached file (None if not cached), marking it as recently used."""
+        if name not in self._entries:
+            return None
+        try:
+            data = await self.disk_io.read_bytes(self.path(name))
+        except OSError as e:
+            # Removed behind our back; forget it so it is downloaded again
+            _log.warning(f"Cached image {name} unreadable: {e}")
+            self._forget(name)
+            return None
+        entry = self._entries.get(name)
+        if entry is not None:
+            entry.last_access = time.time()
+            self._entries.move_to_end(name)
+            self._changed()
+        return data
+
+    async def store(self, name: str, data: bytes) -> None:
+        """Caches `data` as `name`, evicting the least recently used files if over the cap."""
+        if len(data) > self.max_bytes:
+            return
+        if not self._directory_ready:
+            await self.disk_io.mkdir(self.directory)
+            self._directory_ready = True
+        await self.disk_io.write_atomic(self.path(name), data)
+
+        self._forget(name)
+        self._entries[name] = CacheEntry(len(data), time.time())
+        self.total_bytes += len(data)
+        self._changed()
+        await self._evict()
+
+    def _forget(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+            self._changed()
+
+    async def _evict(self) -> None:
+        # The manifest is updated first, so lookups stop offering the files before they are deleted
+        victims = []
+        while self.total_bytes > self.max_bytes and self._entries:
+            name, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            victims.append(name)
+        if victims:
+            self._changed()
+        for name in victims:
+            try:
+                await self.disk_io.run("unlink", _unlink, self.path(name))
+            except OSError as e:
+                _log.warning(f"Failed to evict cached image {name}: {e}")
+        if victims:
+            _log.info(f"Evicted {len(victims)} cached images ({self.total_bytes / 2**20:.1f} MiB left)")
@@ -0,0 +1,38 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. Once it
+    finishes the key is free again, so later calls start fresh work.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # A cancelled caller (e.g. a timed out interaction) must not cancel the others' work
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every caller was cancelled meanwhile
+        if not task.cancelled():
+            task.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
@@ -0,0 +1,18 @@
+import unicodedata
+
+# Katakana ァ (U+30A1) .. ヶ (U+30F6) map onto hiragana ぁ (U+3041) .. ゖ (U+3096)
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form used for all text matching (card fields at load, queries at search time):
+
+    1. NFKC: fullwidth ASCII and symbols become halfwidth (e.g. "ＳＲ＋" -> "SR+"),
+       halfwidth katakana becomes fullwidth, compatibility characters are unified.
+    2. Case folding.
+    3. Kana folding: katakana becomes hiragana, so either script matches both.
+    4. All whitespace is removed, so spacing in names ("百生 吟子") never matters.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_KATAKANA_TO_HIRAGANA)
+    return "".join(text.split())
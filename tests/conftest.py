@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from src.utils.disk_io import DiskIO
+
+
+class FakeResponse:
+    def __init__(self, session, status, data):
+        self.session = session
+        self.status = status
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        session = self.session
+        session.active += 1
+        session.peak = max(session.peak, session.active)
+        await session.release.wait()
+        await asyncio.sleep(0.001)
+        session.active -= 1
+        return self._data
+
+
+class FakeSession:
+    """
+    Stands in for the bot's aiohttp session: records the requested URLs and the
+    peak number of concurrent reads. URLs in `failing` get a 404. With `hold`,
+    reads wait until `release` is set.
+    """
+
+    def __init__(self, status=200, data=b"\x89PNG", failing=(), hold=False):
+        self.status = status
+        self.data = data
+        self.failing = set(failing)
+        self.urls = []
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        if not hold:
+            self.release.set()
+
+    def get(self, url):
+        self.urls.append(url)
+        return FakeResponse(self, 404 if url in self.failing else self.status, self.data)
+
+
+@pytest.fixture
+def http_session():
+    """Factory of fake HTTP sessions (see FakeSession)."""
+    return FakeSession
+
+
+@pytest.fixture
+def disk_io():
+    disk_io = DiskIO(workers=2, max_pending=8)
+    yield disk_io
+    disk_io.shutdown()
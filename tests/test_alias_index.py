@@ -0,0 +1,52 @@
+from src.db.alias_index import AliasEntry, AliasIndex
+
+
+def _values(entries):
+    return [entry.value for entry in entries]
+
+
+def test_exact_then_prefix_then_substring():
+    index = AliasIndex(
+        [
+            ("rinrin", AliasEntry("prefix", "B")),
+            ("karin", AliasEntry("substring", "C")),
+            ("rin", AliasEntry("exact", "A")),
+        ]
+    )
+    assert _values(index.search("Rin")) == ["A", "B", "C"]
+
+
+def test_each_value_is_returned_once_at_best_rank():
+    index = AliasIndex(
+        [
+            ("hoshizora rin", AliasEntry("Char: Rin", "星空凛")),
+            ("rin", AliasEntry("Char: Rin", "星空凛")),
+            ("rina", AliasEntry("Char: Rina", "天王寺璃奈")),
+        ]
+    )
+    assert _values(index.search("rin")) == ["星空凛", "天王寺璃奈"]
+
+
+def test_mapped_aliases():
+    index = AliasIndex.build()
+    honoka = index.search("kousaka")[0]
+    assert honoka == AliasEntry("Char: Honoka (高坂穂乃果)", "高坂穂乃果")
+    # Japanese names match too
+    assert index.search("穂乃果") == [honoka]
+    assert index.search("printemps")[0] == AliasEntry("Unit: Printemps", "Printemps")
+    assert index.search("aqours")[0] == AliasEntry("Group: Aqours", "ラブライブ！サンシャイン!!")
+
+
+def test_units_and_groups_from_card_data():
+    index = AliasIndex.build(units=["Printemps", "New Unit"], groups=["ラブライブ！", "新グループ"])
+    assert index.search("new") == [AliasEntry("Unit: New Unit", "New Unit")]
+    assert index.search("新グ") == [AliasEntry("Group: 新グループ", "新グループ")]
+    # Values already covered by the mappings keep their mapped label
+    assert index.search("ラブライブ！")[0] == AliasEntry("Group: Muse", "ラブライブ！")
+    assert len(_values(index.search("printemps"))) == 1
+
+
+def test_limit():
+    index = AliasIndex.build()
+    assert len(index.search("")) == 25
+    assert len(index.search("a", limit=5)) == 5
@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+from src.cogs.autocomplete import ChoiceCache
+from src.db.autocomplete_index import AutocompleteIndex
+
+SERIES = ["PL!", "PL!N", "PL!S", "PL!SP", "PL!HS", "LL", "NJ", "SP"]
+
+
+def test_prefix_matches_rank_before_substring_matches():
+    index = AutocompleteIndex(SERIES)
+    assert index.search("s") == ["SP", "PL!HS", "PL!S", "PL!SP"]
+    assert index.search("pl!s") == ["PL!S", "PL!SP"]
+
+
+def test_search_is_case_insensitive():
+    index = AutocompleteIndex(["bp1", "BP2", "pb1"])
+    assert index.search("BP") == ["bp1", "BP2"]
+    assert index.search("B1") == ["pb1"]
+    assert index.search("B") == ["bp1", "BP2", "pb1"]
+
+
+def test_empty_query_returns_all_values_sorted():
+    index = AutocompleteIndex(SERIES)
+    assert index.search("") == sorted(SERIES, key=str.lower)
+
+
+def test_limit_applies_to_combined_results():
+    index = AutocompleteIndex(f"{i:03d}" for i in range(1, 200))
+    results = index.search("1")
+    assert len(results) == 25
+    assert results[:3] == ["100", "101", "102"]
+    assert index.search("1", limit=3) == ["100", "101", "102"]
+    assert index.search("99") == ["099", "199"]
+
+
+def test_no_matches():
+    assert AutocompleteIndex(SERIES).search("zz") == []
+    assert AutocompleteIndex().search("") == []
+
+
+def test_choice_cache_memoizes_per_generation():
+    repo = MagicMock()
+    repo.generation = 1
+    lookup = MagicMock(return_value=["SR", "SEC"])
+    cache = ChoiceCache(repo)
+
+    first = cache.get("rarity", "s", lookup)
+    second = cache.get("rarity", "s", lookup)
+    assert [choice.value for choice in first] == ["SR", "SEC"]
+    assert second == first
+    assert lookup.call_count == 1
+
+    repo.generation = 2
+    cache.get("rarity", "s", lookup)
+    assert lookup.call_count == 2
@@ -0,0 +1,20 @@
+from src.db.bitset import BitsetIndex, from_positions, iter_positions
+
+
+def test_from_positions_roundtrip():
+    mask = from_positions([0, 3, 9, 64], size=70)
+    assert mask == (1 << 0) | (1 << 3) | (1 << 9) | (1 << 64)
+    assert list(iter_positions(mask)) == [0, 3, 9, 64]
+
+
+def test_iter_positions_empty():
+    assert list(iter_positions(0)) == []
+
+
+def test_bitset_index_get_and_union():
+    index = BitsetIndex.build({"L+": [0, 1], "SR": [2], "C": [3]}, size=4)
+    assert index.get("L+") == 0b0011
+    assert index.get("missing") == 0
+    assert index.union(["SR", "C", "missing"]) == 0b1100
+    assert "SR" in index
+    assert len(index) == 3
@@ -0,0 +1,36 @@
+from src.db.bitset import iter_positions
+from src.db.card_record import CardRecord
+from src.db.columns import MISSING, CardColumns
+
+
+def _columns(cards):
+    return CardColumns.build([CardRecord(card) for card in cards])
+
+
+CARDS = [
+    {"name": "A", "cost": "2", "blades": "1", "hearts": {"heart01": "2"}},
+    {"name": "B", "cost": "4", "blades": "3", "hearts": {"heart02": "1"}},
+    {"name": "C", "cost": "x", "required_hearts": {"heart01": "3", "heart0": "2"}},
+    {"name": "D", "cost": "9"},
+]
+
+
+def test_columns_store_missing_values():
+    columns = _columns(CARDS)
+    assert list(columns.column("cost")) == [2, 4, MISSING, 9]
+    assert list(columns.column("score")) == [MISSING] * 4
+
+
+def test_range_mask_excludes_missing_values():
+    columns = _columns(CARDS)
+    assert list(iter_positions(columns.range_mask("cost", 2, 4))) == [0, 1]
+    assert list(iter_positions(columns.range_mask("cost", None, 100))) == [0, 1, 3]
+    assert list(iter_positions(columns.range_mask("blades", 2, None))) == [1]
+
+
+def test_heart_matrix_masks():
+    columns = _columns(CARDS)
+    assert list(columns.column("heart01")) == [2, 0, 3, 0]
+    assert list(iter_positions(columns.range_mask("heart01", 2, None))) == [0, 2]
+    assert list(iter_positions(columns.range_mask("heart0", None, 0))) == [0, 1, 3]
+    assert columns.range_mask("unknown", 0, None) == 0
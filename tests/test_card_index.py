@@ -0,0 +1,188 @@
+import copy
+import json
+
+import pytest
+
+from src.db.card_index import CardIndex
+from src.db.card_repository import CardRepository
+
+
+def _card(card_number, name, rarity="R", cost="4", unit="Printemps"):
+    return {
+        "card_number": card_number,
+        "name": name,
+        "rarity": rarity,
+        "unit": unit,
+        "group": ["muse"],
+        "card_type": "Member",
+        "cost": cost,
+        "info_text": [f"{name}の能力"],
+    }
+
+
+CARDS = [
+    _card("PL!-bp1-001-R", "Kousaka Honoka"),
+    _card("PL!-bp1-002-R", "Sonoda Umi", unit="lily white"),
+    _card("PL!-bp1-003-R", "Minami Kotori"),
+    _card("PL!-bp1-004-SR", "Hoshizora Rin", rarity="SR", cost="9", unit="lily white"),
+]
+
+
+def _names(index, filters):
+    return [card["name"] for card in index.planner.execute(index.planner.compile(filters))]
+
+
+def _assert_same_results(incremental, rebuilt):
+    for filters in (
+        {},
+        {"unit": "lily white"},
+        {"rarity": "R"},
+        {"cost_min": 5},
+        {"text_query": "の能力"},
+        {"keyword": "honoka"},
+    ):
+        assert sorted(_names(incremental, filters)) == sorted(_names(rebuilt, filters)), filters
+    assert incremental.id_map == rebuilt.id_map
+    assert incremental.id_tree == rebuilt.id_tree
+
+
+def test_updated_without_changes_returns_same_index():
+    index = CardIndex.build(CARDS)
+    new_index, diff = index.updated(copy.deepcopy(CARDS))
+    assert new_index is index
+    assert diff.is_empty
+
+
+def test_updated_adds_changes_and_removes_incrementally():
+    index = CardIndex.build(CARDS)
+    new_cards = copy.deepcopy(CARDS)
+    new_cards[0]["unit"] = "lily white"
+    new_cards.append(_card("PL!-bp1-005-R", "Nishikino Maki", cost="2"))
+
+    new_index, diff = index.updated(new_cards)
+
+    assert (diff.added, diff.changed, diff.removed, diff.full_rebuild) == (1, 1, 0, False)
+    assert new_index.positions["PL!-bp1-001-R"] == 0
+    assert new_index.positions["PL!-bp1-005-R"] == 4
+    _assert_same_results(new_index, CardIndex.build(new_cards))
+
+
+def test_removed_cards_become_tombstones():
+    cards = CARDS + [_card(f"PL!-bp2-{i:03d}-R", f"Extra {i}") for i in range(8)]
+    index = CardIndex.build(cards)
+    new_cards = [card for card in cards if card["card_number"] != "PL!-bp1-002-R"]
+
+    new_index, diff = index.updated(new_cards)
+
+    assert diff.removed == 1 and not diff.full_rebuild
+    assert len(new_index.cards) == len(cards)
+    assert len(new_index) == len(cards) - 1
+    assert not new_index.alive_mask & (1 << 1)
+    assert "PL!-bp1-002-R" not in new_index.id_map
+    _assert_same_results(new_index, CardIndex.build(new_cards))
+
+
+def test_readded_card_is_appended_after_tombstone():
+    cards = CARDS + [_card(f"PL!-bp2-{i:03d}-R", f"Extra {i}") for i in range(8)]
+    index = CardIndex.build(cards)
+    without, _ = index.updated(cards[1:])
+    again, diff = without.updated(cards)
+
+    assert diff.added == 1
+    assert again.positions["PL!-bp1-001-R"] == len(cards)
+    _assert_same_results(again, CardIndex.build(cards))
+
+
+def test_too_many_tombstones_trigger_full_rebuild():
+    index = CardIndex.build(CARDS)
+    new_index, diff = index.updated(CARDS[2:])
+
+    assert diff.full_rebuild
+    assert len(new_index.cards) == 2
+    assert new_index.alive_mask == 0b11
+
+
+def test_duplicate_card_numbers_fall_back_to_full_rebuild():
+    index = CardIndex.build(CARDS)
+    new_index, diff = index.updated(CARDS + [dict(CARDS[0], name="Duplicate")])
+
+    assert diff.full_rebuild
+    assert new_index.positions is None
+    assert len(new_index) == 5
+
+
+def test_old_index_is_untouched_by_update():
+    index = CardIndex.build(CARDS)
+    old_result = index.planner.execute(index.planner.compile({"unit": "lily white"}))
+    new_cards = copy.deepcopy(CARDS)
+    new_cards[1]["unit"] = "BiBi"
+
+    index.updated(new_cards)
+
+    assert [card["name"] for card in old_result] == ["Sonoda Umi", "Hoshizora Rin"]
+    assert _names(index, {"unit": "lily white"}) == ["Sonoda Umi", "Hoshizora Rin"]
+    assert index.cards[1]["unit"] == "lily white"
+
+
+def test_update_with_new_value_extends_a_copy_of_the_tables():
+    index = CardIndex.build(CARDS)
+    new_cards = copy.deepcopy(CARDS)
+    new_cards[1]["unit"] = "BiBi"
+
+    new_index, _ = index.updated(new_cards)
+
+    assert _names(new_index, {"unit": "bibi"}) == ["Sonoda Umi"]
+    assert new_index.tables["unit"].lookup("printemps") == index.tables["unit"].lookup("printemps")
+    assert index.tables["unit"].lookup("bibi") is None
+    assert _names(index, {"unit": "bibi"}) == []
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "card_data.json"
+    path.write_text(json.dumps({"PBN": CARDS}), encoding="utf-8")
+    return path
+
+
+def test_repository_reload_swaps_index(data_file):
+    repo = CardRepository(str(data_file))
+    repo.load_data()
+    generation = repo.generation
+    result = repo.search(filters={"unit": "Printemps"})
+
+    new_cards = copy.deepcopy(CARDS)
+    new_cards[2]["unit"] = "BiBi"
+    data_file.write_text(json.dumps({"PBN": new_cards}), encoding="utf-8")
+    repo._source_mtime_ns = -1  # Ensure the change is seen regardless of mtime granularity
+
+    assert repo.source_changed()
+    diff = repo.apply_reload(repo.prepare_reload())
+
+    assert diff.changed == 1
+    assert repo.generation == generation + 1
+    assert not repo.source_changed()
+    assert [card["name"] for card in repo.search(filters={"unit": "Printemps"})] == ["Kousaka Honoka"]
+    # Results handed out before the reload keep their snapshot
+    assert [card["name"] for card in result] == ["Kousaka Honoka", "Minami Kotori"]
+
+
+def test_repository_reload_without_changes_keeps_generation(data_file):
+    repo = CardRepository(str(data_file))
+    repo.load_data()
+    generation = repo.generation
+
+    diff = repo.apply_reload(repo.prepare_reload())
+
+    assert diff.is_empty
+    assert repo.generation == generation
+
+
+def test_completions_follow_id_tree():
+    index = CardIndex.build(CARDS)
+    assert index.completions(()).values == ["PL!"]
+    assert index.completions(("PL!", "bp1")).values == ["001", "002", "003", "004"]
+    assert index.completions((None, None, "004")).values == ["SR"]
+    assert index.completions(("PL!", "bp1")) is index.completions(("PL!", "bp1"))
+
+    assert index.completions(("unknown",)).values == []
+    assert ("unknown",) not in index._completions
@@ -14,7 +14,7 @@ def card_lookup():
     # Mock config to avoid file I/O
     with MagicMock() as _:
         # We need to simulate the config.get_config() behavior
-        return CardLookup(bot, card_repo)
+        return CardLookup(bot, card_repo, MagicMock())
 
 
 def test_apply_ability_emojis_bracketed(card_lookup):
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import config
+from src.cogs.card_lookup import CardLookup
+from src.db.card_repository import CardRepository
+
+CARD_NUMBERS = [
+    "PL!N-bp1-001-R",
+    "PL!N-bp1-001-P",
+    "PL!N-bp1-002-SR",
+    "PL!N-bp4-032-L+",
+    "PL!S-bp1-001-SEC",
+    "PL!S-pb1-010-R",
+    "PL!S-bp1-A01-R",
+]
+
+
+@pytest.fixture
+def card_lookup(monkeypatch):
+    monkeypatch.setattr(config, "get_config", lambda: {})
+    repo = CardRepository("dummy_path.json")
+    repo._cards = [{"card_number": card_number, "name": card_number} for card_number in CARD_NUMBERS]
+    repo._build_indices()
+    return CardLookup(MagicMock(), repo, MagicMock())
+
+
+def _interaction(series=None, product=None, number=None):
+    return SimpleNamespace(namespace=SimpleNamespace(series=series, product=product, number=number))
+
+
+def _values(choices):
+    return [choice.value for choice in choices]
+
+
+@pytest.mark.asyncio
+async def test_product_autocomplete_is_scoped_to_series(card_lookup):
+    assert _values(await card_lookup.product_autocomplete(_interaction(), "")) == ["bp1", "bp4", "pb1"]
+    assert _values(await card_lookup.product_autocomplete(_interaction("PL!N"), "")) == ["bp1", "bp4"]
+    assert _values(await card_lookup.product_autocomplete(_interaction("PL!S"), "b")) == ["bp1", "pb1"]
+    assert _values(await card_lookup.product_autocomplete(_interaction("XX"), "")) == []
+
+
+@pytest.mark.asyncio
+async def test_number_autocomplete_offers_numeric_numbers_as_ints(card_lookup):
+    choices = await card_lookup.number_autocomplete(_interaction("PL!N", "bp1"), "")
+    assert [(choice.name, choice.value) for choice in choices] == [("001", 1), ("002", 2)]
+    assert _values(await card_lookup.number_autocomplete(_interaction("PL!S"), "")) == [1, 10]
+    assert _values(await card_lookup.number_autocomplete(_interaction(), "3")) == [32]
+
+
+@pytest.mark.asyncio
+async def test_rarity_autocomplete_uses_all_filled_fields(card_lookup):
+    assert _values(await card_lookup.rarity_autocomplete(_interaction("PL!N", "bp1", 1), "")) == ["P", "R"]
+    assert _values(await card_lookup.rarity_autocomplete(_interaction("PL!N", "bp1"), "")) == ["P", "R", "SR"]
+    # Skipped fields match anything
+    assert _values(await card_lookup.rarity_autocomplete(_interaction(number=1), "")) == ["P", "R", "SEC"]
+    assert _values(await card_lookup.rarity_autocomplete(_interaction("PL!N", "bp1", 3), "")) == []
+
+
+@pytest.mark.asyncio
+async def test_context_is_part_of_choice_cache_key(card_lookup):
+    assert _values(await card_lookup.product_autocomplete(_interaction("PL!N"), "")) == ["bp1", "bp4"]
+    assert _values(await card_lookup.product_autocomplete(_interaction("PL!S"), "")) == ["bp1", "pb1"]
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from src import config
+from src.cogs.card_lookup import MAX_CARDS_PER_MESSAGE, CardLookup
+from src.db.card_repository import CardRepository
+
+CARD_NUMBERS = [f"PL!N-bp1-{i:03d}-R" for i in range(1, 13)]
+
+
+@pytest.fixture
+def card_lookup(monkeypatch):
+    monkeypatch.setattr(config, "get_config", lambda: {})
+    repo = CardRepository("dummy_path.json")
+    repo._cards = [
+        {"card_number": card_number, "name": card_number, "rarity": "R", "set": "PL!N", "card_type": "Member"}
+        for card_number in CARD_NUMBERS
+    ]
+    repo._build_indices()
+    bot = MagicMock()
+    bot.emojis = []
+    cog = CardLookup(bot, repo, MagicMock())
+    cog._get_card_image = AsyncMock(return_value=None)
+    return cog
+
+
+def _interaction():
+    interaction = MagicMock()
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    return interaction
+
+
+@pytest.mark.asyncio
+async def test_cards_sends_one_message_with_all_embeds(card_lookup):
+    interaction = _interaction()
+    await card_lookup.cards.callback(card_lookup, interaction, "PL!N-bp1-001-R, PL!N-bp1-2-R PL!N-bp1-001-R")
+
+    interaction.followup.send.assert_called_once()
+    kwargs = interaction.followup.send.call_args.kwargs
+    assert [embed.footer.text for embed in kwargs["embeds"]] == ["ID: PL!N-bp1-001-R", "ID: PL!N-bp1-002-R"]
+    assert card_lookup._get_card_image.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cards_dedupes_differently_written_ids(card_lookup):
+    interaction = _interaction()
+    ids = " ".join(["PL!N-bp1-001-R", "PL!N-bp1-1-R", "ＰＬ！Ｎ-bp1-001-R", *CARD_NUMBERS[1:10]])
+    await card_lookup.cards.callback(card_lookup, interaction, ids)
+
+    kwargs = interaction.followup.send.call_args.kwargs
+    assert [embed.footer.text for embed in kwargs["embeds"]] == [f"ID: {number}" for number in CARD_NUMBERS[:10]]
+    assert kwargs["content"] is discord.utils.MISSING
+
+
+@pytest.mark.asyncio
+async def test_cards_reports_missing_and_truncates(card_lookup):
+    interaction = _interaction()
+    await card_lookup.cards.callback(card_lookup, interaction, " ".join(["PL!N-bp9-001-R", *CARD_NUMBERS]))
+
+    kwargs = interaction.followup.send.call_args.kwargs
+    assert len(kwargs["embeds"]) == MAX_CARDS_PER_MESSAGE
+    assert "Showing the first 10 of 12 cards." in kwargs["content"]
+    assert "`PL!N-bp9-001-R`" in kwargs["content"]
+
+
+@pytest.mark.asyncio
+async def test_cards_with_nothing_found_is_ephemeral(card_lookup):
+    interaction = _interaction()
+    await card_lookup.cards.callback(card_lookup, interaction, "nope")
+
+    args, kwargs = interaction.followup.send.call_args
+    assert "`nope`" in args[0]
+    assert kwargs["ephemeral"] is True
@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cogs.card_images import CardImages
+from src.cogs.card_lookup import CardLookup
+from src.utils.image_cache import ImageCache
+
+
+@pytest.fixture
+def image_cache(tmp_path):
+    return tmp_path
+
+
+@pytest.fixture
+def lookup(disk_io, image_cache):
+    async def make(session):
+        cache = ImageCache(image_cache, disk_io, max_bytes=2**20)
+        await cache.load()
+        return CardLookup(MagicMock(), MagicMock(), CardImages(session, cache))
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_download_once(image_cache, lookup, disk_io, http_session):
+    session = http_session(hold=True)
+    cog = await lookup(session)
+
+    tasks = [
+        asyncio.create_task(cog._get_or_download_image("PL!N", "bp4", "032", "L+", "https://example.com/a b.png"))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    session.release.set()
+    files = await asyncio.gather(*tasks)
+
+    assert session.urls == ["https://example.com/a%20b.png"]
+    assert all(file is not None for file in files)
+    assert [path.name for path in image_cache.iterdir()] == ["PLSPN-bp4-032-Lplus.png"]
+    assert (image_cache / "PLSPN-bp4-032-Lplus.png").read_bytes() == b"\x89PNG"
+    assert all(file.fp.read() == b"\x89PNG" for file in files)
+    assert disk_io.metrics.operations["write"].count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_image_is_read_without_downloading(image_cache, lookup, disk_io, http_session):
+    (image_cache / "PLSPN-bp4-032-Lplus.png").write_bytes(b"cached")
+    session = http_session()
+    cog = await lookup(session)
+
+    file = await cog._get_or_download_image("PL!N", "bp4", "032", "L+", "https://example.com/a.png", "x.png")
+
+    assert file.filename == "x.png"
+    assert file.fp.read() == b"cached"
+    assert session.urls == []
+    assert disk_io.metrics.operations["read"].count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_download_leaves_no_file(image_cache, lookup, http_session):
+    session = http_session(status=404)
+    cog = await lookup(session)
+
+    assert await cog._get_or_download_image("PL!N", "bp4", "032", "L+", "https://example.com/a.png") is None
+    assert list(image_cache.iterdir()) == []
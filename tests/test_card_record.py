@@ -0,0 +1,52 @@
+from src.db.card_record import CardRecord
+from src.db.value_table import new_tables
+
+
+def test_record_precomputes_search_fields():
+    card = {
+        "card_number": "PL!N-bp4-001-L+",
+        "name": "百生 吟子",
+        "unit": "DOLLCHESTRA",
+        "group": ["蓮ノ空女学院スクールアイドルクラブ"],
+        "info_text": ["Line One", "ライブ開始時"],
+        "cost": "4",
+        "blades": "x",
+    }
+    record = CardRecord(card)  # type: ignore[arg-type]
+
+    assert record.card is card
+    assert record.name_norm == "百生吟子"
+    assert "dollchestra" in record.keyword_norm
+    assert record.card_number_norm == "pl!n-bp4-001-l+"
+    assert record.info_text_norm == "lineone\x00らいぶ開始時"
+    assert record.cost == 4
+    assert record.blades is None  # non-int values never match ranges
+    assert record.score is None
+
+
+def test_record_heart_totals_sum_member_and_live_hearts():
+    card = {
+        "name": "Live",
+        "hearts": {"heart01": "1"},
+        "required_hearts": {"heart01": "2", "heart0": "3"},
+    }
+    record = CardRecord(card)  # type: ignore[arg-type]
+
+    assert record.heart_totals == (3, 0, 0, 0, 0, 0, 3)
+
+
+def test_record_uses_slots():
+    record = CardRecord({"name": "A"})  # type: ignore[arg-type]
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_codes_share_the_tables():
+    tables = new_tables()
+    first = CardRecord({"rarity": "R", "group": ["A", "B"], "blade_hearts": {"b_heart01": "1"}}, tables)  # type: ignore[arg-type]
+    second = CardRecord({"rarity": "Ｒ", "unit": "U", "group": ["B"]}, tables)  # type: ignore[arg-type]
+
+    assert first.rarity_code == second.rarity_code == tables["rarity"].lookup("r")
+    assert second.group_codes == (first.group_codes[1],)
+    assert first.unit_code is None
+    assert first.card_type_code is None
+    assert first.blade_heart_codes == (tables["blade_hearts"].lookup("b_heart01"),)
@@ -375,3 +375,115 @@ def test_search_hearts_range(repo_real_names):
     # So Awesome Live matches >2.
     assert any(c["name"] == "Awesome Live" for c in results_strict)
     assert not any(c["name"] == "高坂穂乃果" for c in results_strict)
+
+
+def test_postings_cover_malformed_ids(repo_real_names):
+    # Cards like "001" are skipped by the ID map but must stay searchable
+    assert "001" not in repo_real_names._index.id_map
+    assert repo_real_names._index.alive_mask.bit_count() == len(repo_real_names._cards)
+    code = repo_real_names._index.tables["rarity"].lookup("l+")
+    assert repo_real_names._index.postings["rarity"].get(code).bit_count() == 1
+
+
+def test_search_unknown_exact_filter_returns_nothing(repo_real_names):
+    assert repo_real_names.search_cards(filters={"rarity": "UR"}) == []
+    assert repo_real_names.search_cards(filters={"blade_hearts": ["b_heart06"]}) == []
+
+
+def test_search_hearts_zero_minimum_keeps_colorless_cards(repo_real_names):
+    # A zero minimum must not restrict results to cards holding that color
+    results = repo_real_names.search_cards(filters={"hearts": {"heart06": "0"}})
+    assert len(results) == len(repo_real_names._cards)
+
+
+def test_search_preserves_file_order(repo_real_names):
+    results = repo_real_names.search_cards(filters={"card_type": "メンバー"})
+    numbers = [c["card_number"] for c in results]
+    expected = [c["card_number"] for c in repo_real_names._cards if c["card_type"] == "メンバー"]
+    assert numbers == expected
+
+
+def test_search_with_filter_state_dict(repo_real_names):
+    from src.cogs.views.state import FilterState
+
+    state = FilterState()
+    state.cost_min, state.cost_max = 2, 2
+    state.hearts = {"heart03": "1"}
+    results = repo_real_names.search_cards(filters=state.to_dict())
+    assert [c["card_number"] for c in results] == ["PL!-bp4-003-R"]
+
+
+def test_search_text_query_japanese(repo_real_names):
+    results = repo_real_names.search_cards(filters={"text_query": "メンバーカード"})
+    assert [c["card_number"] for c in results] == ["PL!SP-bp4-015-N"]
+
+    results = repo_real_names.search_cards(filters={"text_query": "控え室"})
+    assert len(results) == 2
+
+
+def test_search_text_query_matches_name(repo_real_names):
+    results = repo_real_names.search_cards(filters={"text_query": "awesome"})
+    assert [c["name"] for c in results] == ["Awesome Live"]
+
+
+def test_search_handle_reports_total_beyond_limit(repo_real_names):
+    result = repo_real_names.search(filters={"card_type": "メンバー"})
+    assert len(result) == 6
+    assert len(repo_real_names.search_cards(filters={"card_type": "メンバー"}, limit=2)) == 2
+    assert [c["name"] for c in result[1:3]] == ["園田海未", "高海千歌"]
+
+
+def test_mistyped_keyword_falls_back_to_fuzzy_match(repo_real_names):
+    results = repo_real_names.search_cards(filters={"keyword": "honka"})
+    assert [c["name"] for c in results] == ["高坂穂乃果"]
+    # An exact alias that is not in the card text resolves too
+    assert [c["name"] for c in repo_real_names.search_cards(filters={"keyword": "chika"})] == ["高海千歌"]
+    # Other filters still apply to the corrected keyword
+    assert repo_real_names.search_cards(filters={"keyword": "honka", "rarity": "HR"}) == []
+    assert repo_real_names.search(filters={"keyword": "honka"}).corrected_keyword == "高坂穂乃果"
+
+
+def test_matching_keyword_is_not_corrected_when_other_filters_exclude_everything(repo_real_names, monkeypatch):
+    corrections = []
+    monkeypatch.setattr(repo_real_names, "_corrected_keyword", corrections.append)
+
+    result = repo_real_names.search(filters={"keyword": "高坂穂乃果", "rarity": "HR"})
+
+    assert not result
+    assert result.corrected_keyword is None
+    assert corrections == []
+
+
+def test_unmatched_keyword_without_close_spelling(repo_real_names):
+    assert repo_real_names.search_cards(filters={"keyword": "zzzzzz"}) == []
+
+
+def test_keyword_autocomplete_suggests_close_spellings(repo_real_names):
+    assert repo_real_names.search_keyword_aliases("chisto")[0].value == "嵐千砂都"
+    assert repo_real_names.search_keyword_aliases("prntemps")[0].label == "Unit: Printemps"
+
+
+def test_search_ignores_width_kana_and_spacing(repo_real_names):
+    def names(**filters):
+        return [c["name"] for c in repo_real_names.search_cards(filters=filters)]
+
+    assert names(rarity="Ｌ＋") == ["高坂穂乃果"]
+    assert names(card_type="めんばー", unit="ＣＹａＲｏｎ！") == ["高海千歌"]
+    assert names(character="高坂 穂乃果") == ["高坂穂乃果"]
+    assert names(text_query="ｓｕｎｎｙ ｄａｙ") == ["高坂穂乃果"]
+    assert names(keyword="ﾗﾌﾞﾗｲﾌﾞ！ｻﾝｼｬｲﾝ") == ["高海千歌"]
+
+
+def test_get_card_accepts_fullwidth_input(repo_real_names):
+    assert repo_real_names.get_card("ＰＬ！", "bp4", "003", "R")["name"] == "南ことり"
+
+
+def test_get_cards_resolves_in_input_order(repo_real_names):
+    cards = repo_real_names.get_cards(["PL!SP-bp4-015-N", " ＰＬ！-bp4-3-R ", "PL!-bp4-999-R", "001", ""])
+    assert [card["card_number"] if card else None for card in cards] == [
+        "PL!SP-bp4-015-N",
+        "PL!-bp4-003-R",
+        None,
+        None,
+        None,
+    ]
@@ -3,6 +3,8 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from src.cogs.card_search import CardSearch
+from src.db.alias_index import AliasIndex
+from src.db.search_result import SearchResult
 
 
 @pytest.fixture
@@ -11,6 +13,9 @@ def search_cog():
     card_repo = MagicMock()
     # Mock search_rarity for autocomplete
     card_repo.search_rarity.return_value = ["L+", "SR"]
+    # Keyword autocomplete over the mapped aliases only
+    card_repo.search_keyword_aliases.side_effect = AliasIndex.build().search
+    card_repo.generation = 1
     return CardSearch(bot, card_repo)
 
 
@@ -53,7 +58,7 @@ async def test_search_command_flow(search_cog):
     interaction.edit_original_response = AsyncMock()
     interaction.response.is_done.return_value = True  # Simulate deferred
 
-    search_cog.card_repo.search_cards.return_value = []
+    search_cog.card_repo.search.return_value = []
 
     # Call search with some filters
     await search_cog.search.callback(
@@ -63,7 +68,7 @@ async def test_search_command_flow(search_cog):
     interaction.response.defer.assert_called_once()
 
     # Check repo call
-    args, kwargs = search_cog.card_repo.search_cards.call_args
+    args, kwargs = search_cog.card_repo.search.call_args
     filters = kwargs["filters"]
 
     assert filters["keyword"] == "Test"
@@ -83,3 +88,20 @@ async def test_search_invalid_cost(search_cog):
 
     with pytest.raises(InvalidLookupArgsError):
         await search_cog.search.callback(search_cog, interaction, cost="invalid")
+
+
+@pytest.mark.asyncio
+async def test_search_shows_corrected_keyword(search_cog):
+    interaction = MagicMock()
+    interaction.response.defer = AsyncMock()
+    interaction.edit_original_response = AsyncMock()
+    interaction.response.is_done.return_value = True
+
+    results = SearchResult([], 0)
+    results.corrected_keyword = "高坂穂乃果"
+    search_cog.card_repo.search.return_value = results
+
+    await search_cog.search.callback(search_cog, interaction, keyword="honka")
+
+    embed = interaction.edit_original_response.call_args.kwargs["embed"]
+    assert "Showing results for `高坂穂乃果`" in embed.description
@@ -0,0 +1,39 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cogs.data_reload import DataReload
+from src.db.card_index import ReloadDiff
+
+
+@pytest.fixture
+def card_repo():
+    repo = MagicMock()
+    repo.source_changed.return_value = True
+    repo.prepare_reload.return_value = "prepared"
+    repo.apply_reload.return_value = ReloadDiff(changed=1)
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_reload_if_changed_applies_prepared_index(card_repo):
+    cog = DataReload(MagicMock(), card_repo)
+    assert await cog.reload_if_changed()
+    card_repo.apply_reload.assert_called_once_with("prepared")
+
+
+@pytest.mark.asyncio
+async def test_reload_skipped_when_source_unchanged(card_repo):
+    card_repo.source_changed.return_value = False
+    cog = DataReload(MagicMock(), card_repo)
+    assert not await cog.reload_if_changed()
+    card_repo.prepare_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_current_data_on_partial_file(card_repo):
+    card_repo.prepare_reload.side_effect = json.JSONDecodeError("Expecting value", "", 0)
+    cog = DataReload(MagicMock(), card_repo)
+    assert not await cog.reload_if_changed()
+    card_repo.apply_reload.assert_not_called()
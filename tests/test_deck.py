@@ -0,0 +1,78 @@
+import pytest
+
+from src.db.card_repository import CardRepository
+from src.db.deck import build_deck, parse_deck_line
+
+CARD_NUMBERS = ["PL!N-bp4-032-L+", "PL!N-bp4-001-R", "PL!-bp1-010-SR", "LL-bp1-001-R+"]
+
+
+@pytest.fixture
+def repo():
+    repo = CardRepository("dummy_path.json")
+    repo._cards = [{"card_number": card_number, "name": card_number} for card_number in CARD_NUMBERS]
+    repo._build_indices()
+    return repo
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("PL!N-bp4-032-L+ x4", ("PL!N-bp4-032-L+", 4)),
+        ("PL!N-bp4-032-L+ ×2", ("PL!N-bp4-032-L+", 2)),
+        ("3x PL!N-bp4-032-L+", ("PL!N-bp4-032-L+", 3)),
+        ("4 PL!N-bp4-032-L+", ("PL!N-bp4-032-L+", 4)),
+        ("PL!N-bp4-032-L+", ("PL!N-bp4-032-L+", 1)),
+        ("ＰＬ！Ｎ-bp4-032-Ｌ＋ ｘ４", ("PL!N-bp4-032-L+", 4)),
+        ("PL!N-bp4-032-L+ x0", None),
+        ("PL!N-bp4-032-L+ x4 x2", None),
+        ("Honoka x4", None),
+        ("x4", None),
+    ],
+)
+def test_parse_deck_line(line, expected):
+    assert parse_deck_line(line) == expected
+
+
+def test_resolve_deck_aggregates_and_reports_problems(repo):
+    deck = repo.resolve_deck(
+        """
+        # Members
+        PL!N-bp4-001-R x4
+        PL!N-bp4-1-R x2
+        2 PL!-bp1-010-SR
+
+        // Lives
+        PL!N-bp4-032-L+
+        PL!N-bp9-001-R x3
+        some notes
+        """
+    )
+
+    assert [(entry.card["card_number"], entry.quantity) for entry in deck.entries] == [
+        ("PL!N-bp4-001-R", 6),
+        ("PL!-bp1-010-SR", 2),
+        ("PL!N-bp4-032-L+", 1),
+    ]
+    assert deck.total_cards == 9
+    assert deck.unknown == {"PL!N-bp9-001-R": 3}
+    assert deck.invalid == ["some notes"]
+    assert not deck.is_valid
+
+
+def test_build_deck_looks_up_cards_in_one_call():
+    calls = []
+
+    def get_cards(ids):
+        calls.append(list(ids))
+        return [None] * len(ids)
+
+    deck = build_deck(["A-b-001-R x4", "A-b-001-R", "A-b-002-R"], get_cards)
+    assert calls == [["A-b-001-R", "A-b-002-R"]]
+    assert deck.unknown == {"A-b-001-R": 5, "A-b-002-R": 1}
+
+
+def test_large_paste_aggregates_per_card(repo):
+    lines = [f"{CARD_NUMBERS[i % len(CARD_NUMBERS)]} x{i % 4 + 1}" for i in range(5000)]
+    deck = repo.resolve_deck("\n".join(lines))
+    assert len(deck.entries) == len(CARD_NUMBERS)
+    assert deck.total_cards == sum(i % 4 + 1 for i in range(5000))
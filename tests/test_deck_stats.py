@@ -0,0 +1,123 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.cogs.deck_tools import DeckTools
+from src.db.card_record import HEART_COLORS
+from src.db.card_repository import CardRepository
+
+CARDS = [
+    {
+        "card_number": "PL!N-bp1-001-R",
+        "name": "A",
+        "card_type": "メンバー",
+        "cost": "2",
+        "blades": "1",
+        "hearts": {"heart01": "2"},
+        "blade_hearts": {"ドロー": "1"},
+    },
+    {
+        "card_number": "PL!N-bp1-002-R",
+        "name": "B",
+        "card_type": "メンバー",
+        "cost": "4",
+        "blades": "3",
+        "hearts": {"heart01": "1", "heart02": "2"},
+        "blade_hearts": {"ALL1": "1"},
+    },
+    {
+        "card_number": "PL!N-bp1-003-R",
+        "name": "C",
+        "card_type": "メンバー",
+        "cost": "2",
+        "blades": "1",
+        "hearts": {"heart03": "1"},
+        "blade_hearts": {"b_heart03": "1"},
+    },
+    {
+        "card_number": "PL!N-bp1-004-L",
+        "name": "Live",
+        "card_type": "ライブ",
+        "score": "3",
+        "required_hearts": {"heart01": "2", "heart0": "3"},
+        "blade_hearts": {"スコア": "1"},
+    },
+]
+
+
+@pytest.fixture
+def repo():
+    repo = CardRepository("dummy_path.json")
+    repo._cards = CARDS
+    repo._build_indices()
+    return repo
+
+
+DECK = """
+PL!N-bp1-001-R x4
+PL!N-bp1-002-R x3
+PL!N-bp1-003-R x4
+PL!N-bp1-004-L x2
+"""
+
+
+def test_deck_stats_match_per_card_totals(repo):
+    stats = repo.deck_stats(repo.resolve_deck(DECK))
+
+    assert (stats.total_cards, stats.members, stats.lives) == (13, 11, 2)
+    assert stats.cost_curve == {2: 8, 4: 3}
+    assert stats.blade_curve == {1: 8, 3: 3}
+    assert stats.total_blades == 17
+    assert list(stats.hearts) == list(HEART_COLORS)
+    assert stats.hearts["heart01"] == 4 * 2 + 3 * 1
+    assert stats.hearts["heart02"] == 6
+    assert stats.hearts["heart03"] == 4
+    assert stats.hearts["heart0"] == 0
+    assert stats.required_hearts["heart01"] == 4
+    assert stats.required_hearts["heart0"] == 6
+    assert stats.triggers == {"Draw": 4, "Score": 2, "ALL": 3}
+
+
+def test_deck_stats_skip_cards_removed_by_reload(repo):
+    deck = repo.resolve_deck(DECK)
+    repo._swap_index(repo._index.updated(CARDS[1:])[0])
+
+    stats = repo.deck_stats(deck)
+    assert stats.total_cards == 9
+    assert stats.triggers["Draw"] == 0
+
+
+def test_deck_stats_without_unique_numbers(repo):
+    repo._cards = CARDS + [{"name": "No number"}]
+    repo._build_indices()
+    assert repo._index.positions is None
+
+    stats = repo.deck_stats(repo.resolve_deck(DECK))
+    assert stats.total_cards == 13
+
+
+@pytest.mark.asyncio
+async def test_deckstats_modal_submission_sends_embed(repo):
+    bot = MagicMock()
+    cog = DeckTools(bot, repo)
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    await cog._send_deck_stats(interaction, DECK + "PL!N-bp9-001-R x2\n")
+
+    embed = interaction.response.send_message.call_args.kwargs["embed"]
+    fields = {field.name: field.value for field in embed.fields}
+    assert "Cards**: 13" in embed.description
+    assert fields["Blade Heart Triggers"] == "Draw 4   Score 2   ALL 3"
+    assert "`PL!N-bp9-001-R` x2" in fields["Problems"]
+
+
+@pytest.mark.asyncio
+async def test_deckstats_without_known_cards_is_ephemeral(repo):
+    cog = DeckTools(MagicMock(), repo)
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    await cog._send_deck_stats(interaction, "hello")
+
+    assert interaction.response.send_message.call_args.kwargs["ephemeral"] is True
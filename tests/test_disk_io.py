@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.disk_io import DiskIO, write_atomic
+
+
+@pytest.fixture
+def disk_io():
+    disk_io = DiskIO(workers=1, max_pending=2)
+    yield disk_io
+    disk_io.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_calls_run_off_the_event_loop_thread(disk_io):
+    loop_thread = threading.get_ident()
+    assert await disk_io.run("probe", threading.get_ident) != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_file_helpers(disk_io, tmp_path):
+    path = tmp_path / "sub" / "a.png"
+    await disk_io.mkdir(path.parent)
+    await disk_io.write_atomic(path, b"data")
+    assert await disk_io.read_bytes(path) == b"data"
+    assert list(path.parent.iterdir()) == [path]
+
+
+@pytest.mark.asyncio
+async def test_metrics_track_operations_and_errors(disk_io, tmp_path):
+    await disk_io.run("stat", tmp_path.exists)
+    with pytest.raises(FileNotFoundError):
+        await disk_io.read_bytes(tmp_path / "missing")
+
+    metrics = disk_io.metrics
+    assert metrics.operations["stat"].count == 1
+    assert metrics.operations["read"].errors == 1
+    assert metrics.queued == metrics.running == 0
+    assert "read: n=1 errors=1" in str(metrics)
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded(disk_io):
+    release = threading.Event()
+    tasks = [asyncio.create_task(disk_io.run("block", release.wait)) for _ in range(4)]
+    await asyncio.sleep(0.05)
+
+    # One running, one queued; the other two wait for a slot
+    assert disk_io.metrics.running + disk_io.metrics.queued == 2
+    assert disk_io.metrics.throttled == 2
+    release.set()
+    await asyncio.gather(*tasks)
+    assert disk_io.metrics.peak_queued <= 2
+    assert disk_io.metrics.operations["block"].count == 4
+
+
+@pytest.mark.asyncio
+async def test_metrics_stay_consistent_when_callers_are_cancelled():
+    disk_io = DiskIO(workers=4, max_pending=256)
+    try:
+        tasks = [asyncio.create_task(disk_io.run("sleep", time.sleep, 0.001)) for _ in range(200)]
+        await asyncio.sleep(0)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Let the jobs that were already running finish
+        await asyncio.to_thread(disk_io.shutdown)
+
+        metrics = disk_io.metrics
+        assert (metrics.queued, metrics.running) == (0, 0)
+        assert metrics.operations["sleep"].count <= 200
+    finally:
+        disk_io.shutdown()
+
+
+def test_write_atomic_cleans_up_on_failure(tmp_path):
+    with pytest.raises(IsADirectoryError):
+        write_atomic(tmp_path, b"data")
+    assert list(tmp_path.parent.glob(f"{tmp_path.name}.*.tmp")) == []
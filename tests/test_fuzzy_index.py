@@ -0,0 +1,45 @@
+from src.db.fuzzy_index import FuzzyIndex, edit_distance
+
+TERMS = [
+    ("honoka", "高坂穂乃果"),
+    ("chisato", "嵐千砂都"),
+    ("chika", "高海千歌"),
+    ("rin", "星空凛"),
+    ("rina", "天王寺璃奈"),
+]
+
+
+def test_edit_distance():
+    assert edit_distance("honka", "honoka", 2) == 1
+    assert edit_distance("cihka", "chika", 2) == 1  # Adjacent transposition
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("abc", "abcdef", 2) == 3  # Capped at max_distance + 1
+
+
+def test_lookup_corrects_typos():
+    index = FuzzyIndex(TERMS)
+    assert index.lookup("honka") == [(1, "高坂穂乃果")]
+    assert index.lookup("Chisto") == [(1, "嵐千砂都")]
+    assert index.lookup("chisaot")[0] == (1, "嵐千砂都")
+
+
+def test_lookup_ranks_closest_first():
+    index = FuzzyIndex(TERMS)
+    assert index.lookup("rin") == [(0, "星空凛"), (1, "天王寺璃奈")]
+    assert index.lookup("rinn") == [(1, "星空凛"), (1, "天王寺璃奈")]
+
+
+def test_lookup_limits():
+    index = FuzzyIndex(TERMS)
+    # Short queries are not corrected; short words tolerate a single typo
+    assert index.lookup("ri") == []
+    assert index.lookup("hnka") == []
+    assert index.lookup("honoka", max_distance=0) == [(0, "高坂穂乃果")]
+    assert index.lookup("zzzzzz") == []
+
+
+def test_long_terms_match_beyond_indexed_prefix():
+    index = FuzzyIndex([("sakurakoji kinako", "桜小路きな子")])
+    assert index.lookup("sakurakoji kinak") == [(1, "桜小路きな子")]
+    assert index.lookup("sakurakoji kinakoo") == [(1, "桜小路きな子")]
+    assert index.lookup("sakurakoji kinoka") == [(2, "桜小路きな子")]
@@ -0,0 +1,26 @@
+import pytest
+
+from src.utils.http import USER_AGENT, create_http_session
+
+
+@pytest.mark.asyncio
+async def test_session_uses_configured_pool_and_timeouts():
+    session = create_http_session({"HTTP_MAX_CONNECTIONS_PER_HOST": 3, "HTTP_TIMEOUT": 12, "HTTP_CONNECT_TIMEOUT": 4})
+    try:
+        assert session.connector.limit_per_host == 3
+        assert session.timeout.total == 12
+        assert session.timeout.connect == 4
+        assert session.headers["User-Agent"] == USER_AGENT
+    finally:
+        await session.close()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_session_defaults():
+    session = create_http_session({})
+    try:
+        assert session.connector.limit_per_host == 8
+        assert session.timeout.total == 30
+    finally:
+        await session.close()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.utils.disk_io import DiskIO
+from src.utils.image_cache import MANIFEST_NAME, ImageCache
+
+
+@pytest.fixture
+def disk_io():
+    disk_io = DiskIO(workers=1, max_pending=8)
+    yield disk_io
+    disk_io.shutdown()
+
+
+async def _cache(directory, disk_io, max_bytes=100, save_delay=60):
+    cache = ImageCache(directory, disk_io, max_bytes, save_delay=save_delay)
+    await cache.load()
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_store_and_read_without_stat(tmp_path, disk_io):
+    cache = await _cache(tmp_path / "images", disk_io)
+    assert "a.png" not in cache
+    assert await cache.read("a.png") is None
+
+    await cache.store("a.png", b"1234")
+
+    assert "a.png" in cache
+    assert await cache.read("a.png") == b"1234"
+    assert cache.total_bytes == 4
+    assert "stat" not in disk_io.metrics.operations
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_files_are_evicted(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io, max_bytes=25)
+    await cache.store("a.png", b"a" * 10)
+    await cache.store("b.png", b"b" * 10)
+    await cache.read("a.png")  # b is now the least recently used
+
+    await cache.store("c.png", b"c" * 10)
+
+    assert "b.png" not in cache
+    assert not (tmp_path / "b.png").exists()
+    assert {"a.png", "c.png"} <= set(os.listdir(tmp_path))
+    assert cache.total_bytes == 20
+
+
+@pytest.mark.asyncio
+async def test_files_larger_than_the_cap_are_not_cached(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io, max_bytes=5)
+    await cache.store("big.png", b"x" * 6)
+    assert len(cache) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_manifest_round_trip_keeps_lru_order(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io)
+    for name in ("a.png", "b.png", "c.png"):
+        await cache.store(name, b"xx")
+    await cache.read("a.png")
+    await cache.save()
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert [entry[0] for entry in manifest["entries"]] == ["b.png", "c.png", "a.png"]
+
+    reloaded = await _cache(tmp_path, disk_io, max_bytes=4)
+    # The index keeps the access order over the file times; the lowered cap evicts the oldest entry
+    assert list(reloaded._entries) == ["c.png", "a.png"]
+    assert not (tmp_path / "b.png").exists()
+    # The index is kept on load; a crash before the next write falls back to it, not to a scan
+    assert (tmp_path / MANIFEST_NAME).exists()
+    await reloaded.close()
+    assert [entry[0] for entry in json.loads((tmp_path / MANIFEST_NAME).read_text())["entries"]] == [
+        "c.png",
+        "a.png",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_changes_are_saved_after_the_delay(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io, save_delay=0.01)
+    await asyncio.sleep(0.05)  # the scan on load is persisted too
+    writes = disk_io.metrics.operations["manifest_write"].count
+
+    # A burst of changes shares one write
+    for name in ("a.png", "b.png", "c.png"):
+        await cache.store(name, b"xx")
+    await asyncio.sleep(0.05)
+
+    assert disk_io.metrics.operations["manifest_write"].count == writes + 1
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert [entry[0] for entry in manifest["entries"]] == ["a.png", "b.png", "c.png"]
+
+
+@pytest.mark.asyncio
+async def test_close_saves_only_pending_changes(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io)
+    await cache.store("a.png", b"xx")
+    await cache.close()
+    assert "a.png" in (tmp_path / MANIFEST_NAME).read_text()
+
+    writes = disk_io.metrics.operations["manifest_write"].count
+    await cache.close()
+    assert disk_io.metrics.operations["manifest_write"].count == writes
+
+
+@pytest.mark.asyncio
+async def test_missing_index_is_rebuilt_by_scan(tmp_path, disk_io):
+    (tmp_path / "old.png").write_bytes(b"12345")
+    (tmp_path / "new.png").write_bytes(b"123")
+    os.utime(tmp_path / "old.png", (1, 1))
+    (tmp_path / "new.png.abc.tmp").write_bytes(b"partial")
+
+    cache = await _cache(tmp_path, disk_io)
+
+    assert list(cache._entries) == ["old.png", "new.png"]
+    assert cache.total_bytes == 8
+    assert not (tmp_path / "new.png.abc.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_index_is_reconciled_with_the_directory(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io)
+    await cache.store("kept.png", b"12")
+    await cache.store("gone.png", b"1234")
+    await cache.close()
+    (tmp_path / "gone.png").unlink()
+    # Written after the index was last saved
+    (tmp_path / "unlisted.png").write_bytes(b"123")
+
+    reloaded = await _cache(tmp_path, disk_io, max_bytes=4)
+
+    # The unlisted file is counted (and evicts the older one under the cap), the missing one dropped
+    assert list(reloaded._entries) == ["unlisted.png"]
+    assert reloaded.total_bytes == 3
+    assert not (tmp_path / "kept.png").exists()
+    await reloaded.close()
+    assert [entry[0] for entry in json.loads((tmp_path / MANIFEST_NAME).read_text())["entries"]] == ["unlisted.png"]
+
+
+@pytest.mark.asyncio
+async def test_malformed_index_falls_back_to_scan(tmp_path, disk_io):
+    (tmp_path / MANIFEST_NAME).write_text('{"version": 1, "entries": [["a.png"]]}')
+    (tmp_path / "a.png").write_bytes(b"12")
+
+    cache = await _cache(tmp_path, disk_io)
+    assert "a.png" in cache
+
+
+@pytest.mark.asyncio
+async def test_file_removed_behind_the_cache_is_forgotten(tmp_path, disk_io):
+    cache = await _cache(tmp_path, disk_io)
+    await cache.store("a.png", b"12")
+    (tmp_path / "a.png").unlink()
+
+    assert await cache.read("a.png") is None
+    assert "a.png" not in cache
+    assert cache.total_bytes == 0
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cogs.card_images import CardImages
+from src.cogs.image_prefetch import STATE_NAME, ImagePrefetch, RateLimiter, plan_prefetch, product_rank
+from src.utils.image_cache import ImageCache
+
+
+def _card(card_number, img_url="auto"):
+    return {
+        "card_number": card_number,
+        "img_url": f"https://example.com/{card_number}.png" if img_url == "auto" else img_url,
+    }
+
+
+CARDS = [
+    _card("PL!-sd1-001-SD"),
+    _card("PL!N-bp1-001-R"),
+    _card("PL!N-bp3-002-R"),
+    _card("PL!S-pb2-001-R"),
+    _card("PL!N-bp3-001-R"),
+    _card("PL!-PR-001-PR"),
+    _card("PL!N-bp2-001-R", img_url=None),
+    _card("broken"),
+]
+
+
+@pytest.fixture
+def prefetcher(tmp_path, disk_io):
+    async def make(session, cards=CARDS, max_bytes=2**20, **kwargs):
+        cache = ImageCache(tmp_path, disk_io, max_bytes=max_bytes)
+        await cache.load()
+        repo = MagicMock()
+        repo.cards = cards
+        kwargs.setdefault("rate", 0)
+        return ImagePrefetch(MagicMock(), repo, CardImages(session, cache), **kwargs)
+
+    return make
+
+
+def test_product_rank_puts_newest_boosters_first():
+    products = ["sd1", "bp1", "PR", "bp10", "pb2", "bp3"]
+    assert sorted(products, key=product_rank) == ["bp10", "bp3", "bp1", "pb2", "sd1", "PR"]
+
+
+def test_plan_orders_by_product_and_skips_cards_without_images():
+    assert [filename for filename, _ in plan_prefetch(CARDS)] == [
+        "PLSPN-bp3-002-R.png",
+        "PLSPN-bp3-001-R.png",
+        "PLSPN-bp1-001-R.png",
+        "PLSPS-pb2-001-R.png",
+        "PLSP-sd1-001-SD.png",
+        "PLSP-PR-001-PR.png",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_downloads_missing_images(tmp_path, prefetcher, http_session):
+    (tmp_path / "PLSPN-bp3-002-R.png").write_bytes(b"cached")
+    session = http_session(data=b"x" * 10, failing={"https://example.com/PL!-PR-001-PR.png"})
+    cog = await prefetcher(session, concurrency=3)
+
+    metrics = await cog.prefetch()
+
+    assert len(session.urls) == 5
+    assert session.peak == 3
+    assert session.urls[0] == "https://example.com/PL!N-bp3-001-R.png"
+    assert (metrics.total, metrics.cached, metrics.downloaded, metrics.failed) == (6, 1, 4, 1)
+    assert metrics.bytes == 40
+    assert metrics.remaining == 0
+    assert (tmp_path / "PLSPN-bp1-001-R.png").read_bytes() == b"x" * 10
+
+
+@pytest.mark.asyncio
+async def test_second_pass_resumes_and_skips_recent_failures(tmp_path, prefetcher, http_session):
+    session = http_session(data=b"x" * 10, failing={"https://example.com/PL!-PR-001-PR.png"})
+    await (await prefetcher(session)).prefetch()
+    assert json.loads((tmp_path / STATE_NAME).read_text())["failed"].keys() == {"PLSP-PR-001-PR.png"}
+
+    # A restart: new cache and cog over the same directory
+    session = http_session(data=b"x" * 10)
+    metrics = await (await prefetcher(session)).prefetch()
+
+    assert session.urls == []
+    assert (metrics.cached, metrics.skipped, metrics.downloaded) == (5, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stops_before_filling_the_cache(prefetcher, http_session):
+    session = http_session(data=b"x" * 10)
+    cog = await prefetcher(session, max_bytes=30, concurrency=1)
+
+    metrics = await cog.prefetch()
+
+    # 27 bytes (90% of the cap) is reached after three images
+    assert metrics.downloaded == 3
+    assert metrics.remaining == 3
+    assert cog.images.image_cache.total_bytes == 30
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(rate=100)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(limiter.wait() for _ in range(5)))
+    assert loop.time() - start >= 0.04 - 0.005
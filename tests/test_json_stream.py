@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from src.db.json_stream import CHUNK_SIZE, iter_root_list_items
+
+DOCUMENT = {
+    "PBN": [
+        {"card_number": "PL!-bp1-001-R", "name": "高坂 穂乃果", "cost": 12345, "hearts": {"heart01": "2"}},
+        {"card_number": "PL!-bp1-002-R", "name": 'Sonoda "Umi"', "info_text": ["a, b", "[c]"]},
+    ],
+    "version": 3,
+    "EMPTY": [],
+    "LIVE": [{"card_number": "PL!-bp1-003-L", "score": 1.5, "flag": True, "none": None}],
+}
+
+
+def _flatten(document):
+    return [item for value in document.values() if isinstance(value, list) for item in value]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_streams_same_items_as_json_load(chunk_size, indent):
+    text = json.dumps(DOCUMENT, ensure_ascii=False, indent=indent)
+    items = list(iter_root_list_items(io.StringIO(text), chunk_size=chunk_size))
+    assert items == _flatten(DOCUMENT)
+
+
+def test_number_split_across_chunks_is_not_truncated():
+    items = list(iter_root_list_items(io.StringIO('{"A": [123456, 7]}'), chunk_size=9))
+    assert items == [123456, 7]
+
+
+@pytest.mark.parametrize("text", ["{}", " { } ", '{"A": []}', '{"A": 1, "B": {"x": [1]}}'])
+def test_documents_without_list_items(text):
+    assert list(iter_root_list_items(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "[]", '{"A": [1, 2', '{"A": [1 2]}', '{"A": [1]} extra', '{"A" [1]}', "{1: []}"],
+)
+def test_malformed_documents_raise(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_root_list_items(io.StringIO(text), chunk_size=4))
+
+
+def test_repeated_keys_are_shared_between_items():
+    text = json.dumps({"PBN": [{"card_number": "a"}, {"card_number": "b"}]})
+    first, second = iter_root_list_items(io.StringIO(text), chunk_size=8)
+    assert next(iter(first)) is next(iter(second))
+
+
+@pytest.mark.parametrize("number", ["1.5", "-2500.0", "1.5e-3", "-2.5E+10", "7e2"])
+def test_number_split_at_every_position(number):
+    # Padding moves the chunk boundary across every character of the number
+    for padding in range(len(number) + 2):
+        text = f'{{"version": {number}, "A": [{" " * padding}{number}, 1]}}'
+        for chunk_size in (1, 2, 8 + padding):
+            items = list(iter_root_list_items(io.StringIO(text), chunk_size=chunk_size))
+            assert items == [json.loads(number), 1], (padding, chunk_size)
+
+
+def test_root_float_split_at_default_chunk_size():
+    tail = '"version": 1.5, "B": [2]}'
+    head = '{"A": [1], '
+    text = head + " " * (CHUNK_SIZE - 1 - len(head) - tail.index(".")) + tail
+    assert text[CHUNK_SIZE - 1] == "."
+    assert list(iter_root_list_items(io.StringIO(text))) == [1, 2]
@@ -0,0 +1,90 @@
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.cogs.deck_tools import DeckTools
+from src.db.card_index import CardIndex
+from src.db.card_record import HEART_COLORS
+from src.db.card_repository import CardRepository
+from src.db.live_matcher import WILDCARD_HEART, playable_lives
+
+
+def _live(number, required):
+    return {
+        "card_number": f"PL!-bp1-{number:03d}-L",
+        "name": f"Live {number}",
+        "score": "2",
+        "required_hearts": {color: str(count) for color, count in required.items()},
+    }
+
+
+def _member(number, hearts):
+    return {
+        "card_number": f"PL!-bp1-{number:03d}-R",
+        "name": f"Member {number}",
+        "cost": "2",
+        "hearts": {color: str(count) for color, count in hearts.items()},
+    }
+
+
+def _can_play(required, hearts):
+    # Reference check, one live at a time
+    colored = [color for color in HEART_COLORS if color != WILDCARD_HEART]
+    if any(required.get(color, 0) > hearts.get(color, 0) for color in colored):
+        return False
+    left = sum(hearts.values()) - sum(required.get(color, 0) for color in colored)
+    return required.get(WILDCARD_HEART, 0) <= left
+
+
+def test_gray_requirement_takes_any_leftover_hearts():
+    lives = [
+        _live(1, {"heart01": 2, "heart0": 1}),
+        _live(2, {"heart01": 2, "heart0": 2}),
+        _live(3, {"heart02": 1}),
+    ]
+    index = CardIndex.build([*lives, _member(10, {"heart01": 3})])
+
+    result = playable_lives(index, {"heart01": 3})
+    assert [card["name"] for card in result] == ["Live 1"]
+
+
+def test_matches_reference_on_random_lives():
+    rng = random.Random(7)
+    lives = [_live(i, {color: rng.randint(0, 3) for color in rng.sample(HEART_COLORS, 3)}) for i in range(1, 300)]
+    index = CardIndex.build(lives)
+    for _ in range(20):
+        hearts = {color: rng.randint(0, 4) for color in HEART_COLORS}
+        expected = [
+            card["name"]
+            for card in lives
+            if _can_play({color: int(count) for color, count in card["required_hearts"].items()}, hearts)
+        ]
+        assert [card["name"] for card in playable_lives(index, hearts)] == expected
+
+
+def test_members_are_never_matched():
+    index = CardIndex.build([_member(1, {})])
+    assert len(playable_lives(index, {"heart01": 5})) == 0
+
+
+@pytest.mark.asyncio
+async def test_lives_command_pages_playable_lives():
+    repo = CardRepository("dummy_path.json")
+    repo._cards = [
+        _live(1, {"heart01": 2, "heart0": 2}),
+        _live(2, {"heart02": 3}),
+        _member(10, {"heart01": 2, "heart03": 1}),
+    ]
+    repo._build_indices()
+    cog = DeckTools(MagicMock(), repo)
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    await cog._send_playable_lives(interaction, "PL!-bp1-010-R x2")
+
+    kwargs = interaction.response.send_message.call_args.kwargs
+    assert kwargs["embed"].title == "Playable Lives: 1 found"
+    assert "Live 1" in kwargs["embed"].description
+    assert "Pink 4" in kwargs["embed"].description
+    assert len(kwargs["view"].results) == 1
@@ -0,0 +1,25 @@
+import asyncio
+import signal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src import main
+
+
+def test_sigterm_before_start_exits():
+    with pytest.raises(SystemExit):
+        main._handle_sigterm(signal.SIGTERM, None)
+
+
+@pytest.mark.asyncio
+async def test_sigterm_closes_the_bot(monkeypatch):
+    close = AsyncMock()
+    monkeypatch.setattr(main.client, "loop", asyncio.get_running_loop())
+    monkeypatch.setattr(main.client, "close", close)
+
+    main._handle_sigterm(signal.SIGTERM, None)
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    close.assert_awaited_once()
@@ -0,0 +1,50 @@
+from src.db.bitset import iter_positions
+from src.db.card_record import FIELD_SEP
+from src.db.ngram_index import NgramIndex
+
+TEXTS = [
+    f"高坂穂乃果{FIELD_SEP}登場 カードを1枚引く。",
+    f"園田海未{FIELD_SEP}love arrow shoot",
+    f"awesome live{FIELD_SEP}ドロー",
+]
+
+
+def test_candidates_bigram_intersection():
+    index = NgramIndex.build(TEXTS)
+    assert list(iter_positions(index.candidates("登場"))) == [0]
+    assert list(iter_positions(index.candidates("arrow"))) == [1]
+    assert list(iter_positions(index.candidates("ドロー"))) == [2]
+
+
+def test_candidates_single_character():
+    index = NgramIndex.build(TEXTS)
+    assert list(iter_positions(index.candidates("海"))) == [1]
+
+
+def test_candidates_missing_gram_is_empty():
+    index = NgramIndex.build(TEXTS)
+    assert index.candidates("ライブ") == 0
+
+
+def test_grams_do_not_span_fields():
+    # "果" ends the name and "登" starts the ability text
+    index = NgramIndex.build(TEXTS)
+    assert index.candidates("果登") == 0
+
+
+def test_candidates_intersect_lists_of_very_different_lengths():
+    texts = ["共通ab"] * 100 + ["共通xy"]
+    index = NgramIndex.build(texts)
+    assert list(iter_positions(index.candidates("共通x"))) == [100]
+    assert list(iter_positions(index.candidates("通a"))) == list(range(100))
+
+
+def test_updated_replaces_entries_and_leaves_original():
+    index = NgramIndex.build(TEXTS)
+    updated = index.updated([(1, TEXTS[1])], [(1, "登場 ライブ"), (3, "ライブ")], size=4)
+
+    assert list(iter_positions(updated.candidates("登場"))) == [0, 1]
+    assert list(iter_positions(updated.candidates("ライブ"))) == [1, 3]
+    assert updated.candidates("arrow") == 0
+    assert list(iter_positions(index.candidates("arrow"))) == [1]
+    assert index.candidates("ライブ") == 0
@@ -71,3 +71,21 @@ async def test_back_callback(sample_results):
 
     await view.btn_back.callback(interaction)  # type: ignore
     cb.assert_called_once_with(interaction)
+
+
+@pytest.mark.asyncio
+async def test_pagination_with_search_result_handle():
+    from src.db.card_record import CardRecord
+    from src.db.search_result import SearchResult
+
+    cards = [{"name": f"Card {i}", "card_number": f"{i:03}", "rarity": "R"} for i in range(60)]
+    records = [CardRecord(card) for card in cards]  # type: ignore[arg-type]
+    result = SearchResult(records, (1 << 60) - 1)
+
+    view = PaginationView(result, "Title", "Filters", discord.Color.blue())
+    assert view.total_pages == 6
+    view.current_page = 5
+    embed = view.get_embed()
+    assert "Card 59" in embed.description
+    assert "Card 49" not in embed.description
+    assert embed.footer.text == "Showing items 51-60 of 60"
@@ -0,0 +1,65 @@
+import pytest
+
+from src.db.card_repository import CardRepository
+from src.db.query_planner import filter_signature
+
+
+@pytest.fixture
+def repo():
+    cards = []
+    for i in range(40):
+        cards.append(
+            {
+                "card_number": f"PL!-bp1-{i:03d}-{'SR' if i % 10 == 0 else 'N'}",
+                "name": f"Member {i}",
+                "rarity": "SR" if i % 10 == 0 else "N",
+                "unit": "Printemps" if i % 2 else "BiBi",
+                "group": ["ラブライブ！"],
+                "img_url": "",
+                "set": "TEST",
+                "card_type": "メンバー",
+                "cost": str(i % 5),
+                "hearts": {"heart01": str(i % 3)},
+                "info_text": ["登場 カードを1枚引く。"] if i % 4 == 0 else [],
+            }
+        )
+    repo = CardRepository("dummy_path")
+    repo._cards = cards
+    repo._build_indices()
+    return repo
+
+
+def test_filter_signature_is_order_insensitive():
+    a = {"rarity": "L＋", "blade_hearts": ["ドロー", "スコア"], "hearts": {"heart02": "1", "heart01": 2}}
+    b = {"hearts": {"heart01": 2, "heart02": "1"}, "blade_hearts": ["スコア", "ドロー"], "rarity": "L+"}
+    assert filter_signature(a) == filter_signature(b)
+
+
+def test_filter_signature_drops_empty_values():
+    assert filter_signature({"keyword": None, "card_type": None, "cost_min": 0}) == (("cost_min", 0),)
+
+
+def test_plan_orders_index_stages_by_selectivity(repo):
+    plan = repo._index.planner.compile({"unit": "BiBi", "rarity": "SR"})
+    # SR has 4 cards, BiBi has 20
+    assert [stage.name for stage in plan.index_stages] == ["rarity=sr", "unit=bibi"]
+
+
+def test_plan_is_cached_by_signature(repo):
+    plan = repo._index.planner.compile({"rarity": "SR", "keyword": "member"})
+    assert repo._index.planner.compile({"keyword": "member", "rarity": "SR"}) is plan
+
+
+def test_explain_reports_row_counts(repo):
+    explanation = repo.explain({"rarity": "SR", "text_query": "登場", "keyword": "member 2"})
+    rows = {stage.name: stage.rows for stage in explanation.stages}
+    assert rows["rarity=sr"] == 4
+    assert explanation.stages[-1].kind == "predicate"
+    assert explanation.total == 1  # Member 20
+    assert "=> 1 rows" in str(explanation)
+
+
+def test_planned_search_matches_expected(repo):
+    results = repo.search_cards(filters={"cost_min": 1, "cost_max": 2, "hearts": {"heart01": "2"}}, limit=100)
+    expected = [c for c in repo._cards if 1 <= int(c["cost"]) <= 2 and c["hearts"]["heart01"] == "2"]
+    assert results == expected
@@ -0,0 +1,67 @@
+from src.db.card_repository import CardRepository
+from src.db.search_cache import SearchCache
+
+CARDS = [
+    {"card_number": "PL!-bp1-001-L+", "name": "高坂穂乃果", "rarity": "L+", "card_type": "メンバー", "group": []},
+    {"card_number": "PL!-bp1-002-R", "name": "園田海未", "rarity": "R", "card_type": "メンバー", "group": []},
+]
+
+
+def _repo(cards, cache_size=8):
+    repo = CardRepository("dummy_path", search_cache_size=cache_size)
+    repo._cards = list(cards)
+    repo._build_indices()
+    return repo
+
+
+def test_cache_lru_eviction():
+    cache = SearchCache(max_size=2)
+    cache.put("a", 1, (1,))
+    cache.put("b", 1, (2,))
+    assert cache.get("a", 1) == (1,)  # "a" is now most recent
+    cache.put("c", 1, (3,))
+    assert cache.get("b", 1) is None
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_generation_invalidates():
+    cache = SearchCache(max_size=2)
+    cache.put("a", 1, (1,))
+    assert cache.get("a", 2) is None
+    assert cache.stats.invalidations == 1
+    assert len(cache) == 0
+
+
+def test_cache_disabled_with_zero_size():
+    cache = SearchCache(max_size=0)
+    cache.put("a", 1, (1,))
+    assert cache.get("a", 1) is None
+
+
+def test_repository_cache_canonicalizes_filters():
+    repo = _repo(CARDS)
+    first = repo.search_cards(filters={"rarity": "L＋", "card_type": "メンバー"})
+    second = repo.search_cards(filters={"card_type": "メンバー", "rarity": "L+"})
+    assert first == second
+    assert repo.search_cache.stats.misses == 1
+    assert repo.search_cache.stats.hits == 1
+
+
+def test_repository_cache_returns_copies():
+    repo = _repo(CARDS)
+    repo.search_cards(filters={"card_type": "メンバー"}).clear()
+    assert len(repo.search_cards(filters={"card_type": "メンバー"})) == 2
+
+
+def test_repository_reindex_bumps_generation():
+    repo = _repo(CARDS)
+    assert len(repo.search_cards(rarity="R")) == 1
+    generation = repo.generation
+
+    repo._cards = CARDS + [dict(CARDS[1], card_number="PL!-bp1-003-R")]
+    repo._build_indices()
+
+    assert repo.generation == generation + 1
+    assert len(repo.search_cards(rarity="R")) == 2
@@ -0,0 +1,52 @@
+import pytest
+
+from src.db.card_record import CardRecord
+from src.db.search_result import SearchResult
+
+CARDS = [{"card_number": f"{i:03d}", "name": f"Card {i}", "rarity": "R"} for i in range(30)]
+RECORDS = [CardRecord(card) for card in CARDS]  # type: ignore[arg-type]
+ALL = (1 << len(CARDS)) - 1
+
+
+def test_index_only_result_counts_without_predicates():
+    result = SearchResult(RECORDS, ALL & ~0b111)
+    assert len(result) == 27
+    assert result[0]["card_number"] == "003"
+
+
+def test_page_materializes_slice_in_order():
+    calls = []
+
+    def even(record):
+        calls.append(record)
+        return int(record.card["card_number"]) % 2 == 0
+
+    result = SearchResult(RECORDS, ALL, [even])
+    page = result[0:3]
+    assert [c["card_number"] for c in page] == ["000", "002", "004"]
+    # First page stops early instead of scanning the corpus
+    assert len(calls) == 5
+
+    assert len(result) == 15
+    assert [c["card_number"] for c in result[12:20]] == ["024", "026", "028"]
+    assert result[-1]["card_number"] == "028"
+
+
+def test_index_out_of_range():
+    result = SearchResult(RECORDS, 0)
+    assert len(result) == 0
+    assert result[0:10] == []
+    with pytest.raises(IndexError):
+        result[0]
+
+
+def test_bool_stops_at_first_match():
+    calls = []
+
+    def check(record):
+        calls.append(record)
+        return True
+
+    assert SearchResult(RECORDS, ALL, [check])
+    assert len(calls) == 1
+    assert not SearchResult(RECORDS, 0, [check])
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    waiters = [asyncio.create_task(flight.run("a", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert "a" in flight
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["done"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+
+    await flight.run("a", work)
+    await flight.run("a", work)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(flight.run("a", work), flight.run("a", work), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_work():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return 1
+
+    first = asyncio.create_task(flight.run("a", work))
+    second = asyncio.create_task(flight.run("a", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pytest
+
+from src.db import snapshot
+from src.db.card_repository import CardRepository
+
+CARDS = [
+    {
+        "card_number": "PL!-bp1-001-R",
+        "name": "Kousaka Honoka",
+        "rarity": "R",
+        "unit": "Printemps",
+        "group": ["muse"],
+        "card_type": "Member",
+        "cost": "4",
+        "info_text": ["ライブ開始時"],
+    },
+    {
+        "card_number": "PL!-bp1-002-SR",
+        "name": "Sonoda Umi",
+        "rarity": "SR",
+        "unit": "lily white",
+        "group": ["muse"],
+        "card_type": "Member",
+        "cost": "9",
+    },
+]
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "card_data.json"
+    path.write_text(json.dumps({"PBN": CARDS}), encoding="utf-8")
+    return path
+
+
+def _load(data_file, **kwargs):
+    repo = CardRepository(str(data_file), **kwargs)
+    repo.load_data()
+    return repo
+
+
+def test_first_boot_parses_json_and_writes_snapshot(data_file):
+    repo = _load(data_file)
+    assert repo.load_metrics.source == "json"
+    assert repo.load_metrics.cards == 2
+    assert os.path.exists(repo.snapshot_path)
+
+
+def test_second_boot_loads_snapshot(data_file):
+    _load(data_file)
+    repo = _load(data_file)
+
+    assert repo.load_metrics.source == "snapshot"
+    assert repo.get_card("PL!", "bp1", "001", "R")["name"] == "Kousaka Honoka"
+    assert [c["name"] for c in repo.search(filters={"text_query": "ライブ"})] == ["Kousaka Honoka"]
+    assert [c["name"] for c in repo.search(filters={"cost_min": 5})] == ["Sonoda Umi"]
+    assert repo.search_rarity("s") == ["SR"]
+    # Cards and index entries still share objects after unpickling
+    assert repo._index.id_map["PL!-bp1-002-SR"] is repo._cards[1]
+
+
+def test_changed_source_ignores_snapshot(data_file):
+    _load(data_file)
+    data_file.write_text(json.dumps({"PBN": CARDS[:1]}), encoding="utf-8")
+
+    repo = _load(data_file)
+
+    assert repo.load_metrics.source == "json"
+    assert len(repo._index) == 1
+    # The rewritten snapshot matches the new source
+    assert _load(data_file).load_metrics.source == "snapshot"
+
+
+@pytest.mark.parametrize("contents", [b"", b"garbage", b"LLTCGSNP" + b"\x00" * 106])
+def test_unreadable_snapshot_falls_back_to_json(data_file, contents):
+    repo = CardRepository(str(data_file))
+    with open(repo.snapshot_path, "wb") as f:
+        f.write(contents)
+
+    repo.load_data()
+
+    assert repo.load_metrics.source == "json"
+    assert len(repo._index) == 2
+
+
+def test_other_format_version_is_ignored(data_file, monkeypatch):
+    _load(data_file)
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+    assert _load(data_file).load_metrics.source == "json"
+
+
+def test_snapshot_from_other_index_code_is_ignored(data_file, monkeypatch):
+    _load(data_file)
+    # e.g. mappings.py or the text normalizer edited without a version bump
+    monkeypatch.setattr(snapshot, "code_fingerprint", lambda: b"\x01" * 32)
+    assert _load(data_file).load_metrics.source == "json"
+    assert _load(data_file).load_metrics.source == "snapshot"
+
+
+def test_code_fingerprint_covers_the_alias_mappings():
+    assert "src.db.mappings" in snapshot._DERIVING_MODULES
+    assert len(snapshot.code_fingerprint()) == 32
+
+
+def test_empty_snapshot_path_disables_snapshot(data_file, tmp_path):
+    repo = _load(data_file, snapshot_path="")
+    assert repo.load_metrics.source == "json"
+    assert os.listdir(tmp_path) == ["card_data.json"]
+
+
+def test_corrupted_payload_falls_back_to_json(data_file):
+    repo = _load(data_file)
+    with open(repo.snapshot_path, "rb") as f:
+        data = bytearray(f.read())
+    for pos in range(len(data) - 64, len(data), 7):
+        data[pos] ^= 0xFF
+    with open(repo.snapshot_path, "wb") as f:
+        f.write(data)
+
+    assert _load(data_file).load_metrics.source == "json"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        # Unpickling raises TypeError (calls the int 1)
+        b"\x80\x02K\x01K\x02\x85R.",
+        pickle.dumps(("cards", "index")),
+        pickle.dumps([]),
+    ],
+)
+def test_unexpected_payload_with_valid_checksum_falls_back_to_json(data_file, payload):
+    repo = CardRepository(str(data_file))
+    digest = snapshot.source_digest(str(data_file))
+    header = snapshot._HEADER.pack(
+        snapshot.SNAPSHOT_MAGIC,
+        snapshot.SNAPSHOT_VERSION,
+        digest,
+        snapshot.code_fingerprint(),
+        hashlib.sha256(payload).digest(),
+        len(payload),
+    )
+    with open(repo.snapshot_path, "wb") as f:
+        f.write(header + payload)
+
+    repo.load_data()
+
+    assert repo.load_metrics.source == "json"
+    assert len(repo._index) == 2
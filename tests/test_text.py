@@ -0,0 +1,26 @@
+import pytest
+
+from src.utils.text import normalize_text
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("ＳＲ＋", "sr+"),  # Fullwidth ASCII
+        ("ﾗｲﾌﾞ", "らいぶ"),  # Halfwidth katakana
+        ("ライブ開始時", "らいぶ開始時"),  # Katakana folds to hiragana
+        ("らいぶ", "らいぶ"),
+        ("百生　吟子", "百生吟子"),  # Ideographic space
+        (" Kousaka  Honoka\n", "kousakahonoka"),
+        ("CYaRon!", "cyaron!"),
+        ("A・ZU・NA", "a・zu・na"),
+        ("", ""),
+    ],
+)
+def test_normalize_text(raw, expected):
+    assert normalize_text(raw) == expected
+
+
+def test_normalize_text_is_idempotent():
+    text = "ＰＬ！Ｎ ﾗｲﾌﾞ スコア＋１"
+    assert normalize_text(normalize_text(text)) == normalize_text(text)
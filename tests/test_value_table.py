@@ -0,0 +1,47 @@
+from src.db.value_table import CODED_FIELDS, ValueTable, copy_tables, intern_card, new_tables, table_key
+
+
+def test_codes_are_assigned_in_first_seen_order():
+    table = ValueTable()
+    assert table.code("R") == 0
+    assert table.code("SR") == 1
+    assert table.code("R") == 0
+    assert len(table) == 2
+    assert table.value(1) == "SR"
+
+
+def test_lookup_does_not_assign():
+    table = ValueTable()
+    table.code("R")
+    assert table.lookup("R") == 0
+    assert table.lookup("UR") is None
+    assert len(table) == 1
+
+
+def test_copy_keeps_codes_and_is_independent():
+    tables = new_tables()
+    tables["rarity"].code("R")
+    copied = copy_tables(tables)
+    assert copied["rarity"].code("SR") == 1
+    assert copied["rarity"].lookup("R") == 0
+    assert tables["rarity"].lookup("SR") is None
+    assert set(copied) == set(CODED_FIELDS)
+
+
+def test_table_key_normalizes_text_fields_only():
+    assert table_key("rarity", "Ｌ＋") == "l+"
+    assert table_key("blade_hearts", "b_heart01") == "b_heart01"
+
+
+def test_intern_card_shares_repeated_values():
+    # Built at runtime so the strings are distinct objects
+    first = {"rarity": "".join(["S", "R"]), "group": ["".join(["a", "b"])], "hearts": {"heart01": str(2)}}
+    second = {"rarity": "".join(["S", "R"]), "group": ["".join(["a", "b"])], "hearts": {"heart01": str(2)}}
+    assert first["rarity"] is not second["rarity"]
+
+    intern_card(first)  # type: ignore[arg-type]
+    intern_card(second)  # type: ignore[arg-type]
+
+    assert first["rarity"] is second["rarity"]
+    assert first["group"][0] is second["group"][0]
+    assert first["hearts"]["heart01"] is second["hearts"]["heart01"]  # type: ignore[index]